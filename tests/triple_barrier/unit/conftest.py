@@ -3,6 +3,8 @@ import pandas as pd
 
 from tests.test_utils.dummy_strategy import calculate_test_features_long
 from tests.test_utils.dummy_strategy import calculate_test_features_short
+from triple_barrier.trading import TradingParameters
+from triple_barrier.types import TradeSide
 
 
 @pytest.fixture
@@ -23,3 +25,29 @@ def prepare_price_data() -> pd.DataFrame:
 @pytest.fixture
 def prepare_price_data_short() -> pd.DataFrame:
     return calculate_test_features_short()
+
+
+@pytest.fixture
+def trade_params():
+    """
+    Builds the TradingParameters of a price frame (open, high, low, close, entry and optional
+    exit columns), any field can be overridden
+    """
+
+    def build(df: pd.DataFrame, **overrides) -> TradingParameters:
+        fields: dict = {
+            "open_price": df.open,
+            "high_price": df.high,
+            "low_price": df.low,
+            "close_price": df.close,
+            "entry_mark": df.entry,
+            "stop_loss_width": 20,
+            "take_profit_width": 40,
+            "trade_side": TradeSide.BUY,
+            "pip_decimal_position": 4,
+            "time_barrier_periods": 10,
+            "dynamic_exit": df.get("exit"),
+        }
+        return TradingParameters(**{**fields, **overrides})
+
+    return build
@@ -1,5 +1,11 @@
+from datetime import datetime
+
+import numpy as np
 import pandas as pd
+import pytest
 
+from triple_barrier.batch_labeling import BatchLabeler
+from triple_barrier.range_index import RangeExtremeIndex
 from triple_barrier.trading import DataSetLabeler
 from triple_barrier.trade_labeling import TradeSide
 from triple_barrier.trading import TradingParameters
@@ -12,6 +18,20 @@ TAKE_PROFIT_WIDTH = 10
 STOP_LOSS_WIDTH = 5
 PIP_DECIMAL_POSITION = 4
 TIME_BARRIER_PERIODS = 10
+PRICE_FILE: str = f"{const.ROOT_FOLDER}/tests/data/EURUSD_1 Min_{{}}_2024.03.13_2024.03.13.csv"
+BID_ASK_BARRIERS: dict = dict(stop_loss_width=3, take_profit_width=3, time_barrier_periods=15)
+TRADE_COLUMNS: list[str] = [const.CLOSE_PRICE, const.CLOSE_DATETIME, const.CLOSE_TYPE, const.PROFIT, const.BARS_HELD]
+
+
+def fail_to_label(*args, **kwargs):
+    raise AssertionError("No trade should be labeled again")
+
+
+def correct_bars(df: pd.DataFrame, first: int, last: int) -> pd.DataFrame:
+    corrected = df.copy()
+    for column in ["open", "high", "low", "close"]:
+        corrected.iloc[first:last + 1, corrected.columns.get_loc(column)] += 0.001
+    return corrected
 
 
 class TestTripleBarrierApply:
@@ -170,3 +190,294 @@ class TestTripleBarrierApply:
             reference_image = None
 
         assert reference_image.size == produced_image.size
+
+
+class TestBothSides:
+
+    def test_same_trades_as_each_side(self, prepare_price_data, trade_params):
+        df = prepare_price_data
+        both_params = trade_params(
+            df,
+            trade_side=const.TRADE_SIDE_BOTH,
+            stop_loss_width=10,
+            take_profit_width=30,
+            sell_stop_loss_width=15,
+            sell_take_profit_width=5,
+        )
+
+        trades: pd.DataFrame = DataSetLabeler(both_params).compute(engine=const.ENGINE_VECTORIZED)
+
+        long_params = trade_params(df, stop_loss_width=10, take_profit_width=30)
+        short_params = trade_params(df, trade_side=TradeSide.SELL, stop_loss_width=15, take_profit_width=5)
+        long_trades = DataSetLabeler(long_params).compute()
+        short_trades = DataSetLabeler(short_params).compute()
+        for column in TRADE_COLUMNS:
+            pd.testing.assert_series_equal(trades[f"{column}-buy"], long_trades[column], check_names=False)
+            pd.testing.assert_series_equal(trades[f"{column}-sell"], short_trades[column], check_names=False)
+        assert const.CLOSE_PRICE not in trades.columns
+
+    def test_same_trades_on_every_engine(self, prepare_price_data, trade_params):
+        df = prepare_price_data
+        both_params = trade_params(df, trade_side=const.TRADE_SIDE_BOTH, take_profit_width=20)
+
+        expected: pd.DataFrame = DataSetLabeler(both_params).compute()
+
+        range_index = RangeExtremeIndex(df.high, df.low)
+        for dataset_labeler, kwargs in [
+            (DataSetLabeler(both_params), dict(engine=const.ENGINE_VECTORIZED)),
+            (DataSetLabeler(both_params, range_index=range_index), dict(engine=const.ENGINE_VECTORIZED)),
+            (DataSetLabeler(both_params), dict(engine=const.ENGINE_VECTORIZED, workers=2)),
+        ]:
+            pd.testing.assert_frame_equal(expected, dataset_labeler.compute(**kwargs))
+            assert set(dataset_labeler.results) == {TradeSide.BUY, TradeSide.SELL}
+
+    @pytest.mark.parametrize("trade_side", ["buy", "long", None])
+    def test_unknown_trade_side(self, prepare_price_data, trade_params, trade_side):
+        with pytest.raises(ValueError, match="Unknown trade side"):
+            DataSetLabeler(trade_params(prepare_price_data, trade_side=trade_side))
+
+    @pytest.mark.parametrize("sell_width", ["sell_stop_loss_width", "sell_take_profit_width"])
+    def test_sell_widths_with_one_side(self, prepare_price_data, trade_params, sell_width):
+        with pytest.raises(ValueError, match="both trade sides"):
+            DataSetLabeler(trade_params(prepare_price_data, trade_side=TradeSide.SELL, **{sell_width: 10}))
+
+    @pytest.mark.parametrize("sell_width", ["sell_stop_loss_width", "sell_take_profit_width"])
+    def test_invalid_sell_width(self, prepare_price_data, trade_params, sell_width):
+        with pytest.raises(ValueError, match=sell_width):
+            DataSetLabeler(trade_params(prepare_price_data, trade_side=const.TRADE_SIDE_BOTH, **{sell_width: 0}))
+
+
+class TestIncrementalLabeling:
+
+    @pytest.mark.parametrize("trade_side", [TradeSide.BUY, const.TRADE_SIDE_BOTH])
+    @pytest.mark.parametrize("engine", [const.ENGINE_APPLY, const.ENGINE_VECTORIZED])
+    def test_same_trades_as_full_relabeling(self, prepare_price_data, trade_params, trade_side, engine):
+        df = prepare_price_data
+        previous_bars = df.iloc[:-500]
+        previous_trades: pd.DataFrame = DataSetLabeler(trade_params(previous_bars, trade_side=trade_side)).compute(
+            engine=const.ENGINE_VECTORIZED
+        )
+
+        trading_setup = trade_params(df, trade_side=trade_side)
+        expected: pd.DataFrame = DataSetLabeler(trading_setup).compute(engine=engine)
+        trades: pd.DataFrame = DataSetLabeler(trading_setup).update(previous_trades, engine=engine)
+        with_previous_end: pd.DataFrame = DataSetLabeler(trading_setup).update(
+            previous_trades, engine=engine, previous_end=previous_bars.index[-1]
+        )
+
+        pd.testing.assert_frame_equal(expected, trades)
+        pd.testing.assert_frame_equal(expected, with_previous_end)
+
+    def test_only_unresolved_trades_are_labeled(self, prepare_price_data, trade_params):
+        df = prepare_price_data
+        previous_trades: pd.DataFrame = DataSetLabeler(trade_params(df.iloc[:-500], trade_side=TradeSide.BUY)).compute()
+        # a trade still open, and a trade changed to tell the kept ones apart
+        previous_trades[const.CLOSE_DATETIME] = previous_trades[const.CLOSE_DATETIME].astype(object)
+        previous_trades.iloc[0, previous_trades.columns.get_loc(const.CLOSE_DATETIME)] = const.INFINITE_DATE
+        previous_trades.iloc[1, previous_trades.columns.get_loc(const.PROFIT)] = 1234.0
+
+        dataset_labeler = DataSetLabeler(trade_params(df, trade_side=TradeSide.BUY))
+        trades: pd.DataFrame = dataset_labeler.update(previous_trades, previous_end=df.index[-501])
+
+        expected: pd.DataFrame = DataSetLabeler(trade_params(df, trade_side=TradeSide.BUY)).compute()
+        assert trades[const.CLOSE_DATETIME].iloc[0] == expected[const.CLOSE_DATETIME].iloc[0]
+        assert trades[const.PROFIT].iloc[1] == 1234.0
+        assert trades.index.equals(expected.index)
+        assert dataset_labeler.trades is trades
+
+    def test_dropped_entries(self, prepare_price_data, trade_params):
+        df = prepare_price_data
+        previous_trades: pd.DataFrame = DataSetLabeler(trade_params(df, trade_side=TradeSide.BUY)).compute()
+        first_entry: datetime = previous_trades.index[0]
+        df.loc[first_entry, "entry"] = 0
+
+        trades: pd.DataFrame = DataSetLabeler(trade_params(df, trade_side=TradeSide.BUY)).update(
+            previous_trades, previous_end=df.index[-1]
+        )
+
+        assert first_entry not in trades.index
+        pd.testing.assert_frame_equal(trades, previous_trades.iloc[1:])
+
+    def test_no_previous_trades(self, prepare_price_data, trade_params):
+        df = prepare_price_data
+        expected: pd.DataFrame = DataSetLabeler(trade_params(df)).compute()
+
+        trades: pd.DataFrame = DataSetLabeler(trade_params(df)).update(expected.iloc[:0])
+
+        pd.testing.assert_frame_equal(expected, trades)
+
+    @pytest.mark.parametrize(
+        "previous_side, trade_side",
+        [(TradeSide.BUY, const.TRADE_SIDE_BOTH), (const.TRADE_SIDE_BOTH, TradeSide.SELL)],
+    )
+    def test_trades_of_other_sides(self, prepare_price_data, trade_params, previous_side, trade_side):
+        df = prepare_price_data
+        previous_trades: pd.DataFrame = DataSetLabeler(trade_params(df, trade_side=previous_side)).compute(
+            engine=const.ENGINE_VECTORIZED
+        )
+
+        with pytest.raises(ValueError, match="labeled on other trade sides"):
+            DataSetLabeler(trade_params(df, trade_side=trade_side)).update(previous_trades)
+
+    def test_previous_end_after_the_dataset(self, prepare_price_data, trade_params):
+        df = prepare_price_data
+        previous_trades: pd.DataFrame = DataSetLabeler(trade_params(df)).compute(engine=const.ENGINE_VECTORIZED)
+
+        with pytest.raises(ValueError, match="after the last bar of the dataset"):
+            DataSetLabeler(trade_params(df.iloc[:-500])).update(previous_trades, previous_end=df.index[-1])
+
+
+class TestInvalidate:
+
+    @pytest.mark.parametrize("trade_side", [TradeSide.BUY, const.TRADE_SIDE_BOTH])
+    @pytest.mark.parametrize("engine", [const.ENGINE_APPLY, const.ENGINE_VECTORIZED])
+    def test_same_trades_as_full_relabeling(self, prepare_price_data, trade_params, trade_side, engine):
+        df = prepare_price_data
+        trades: pd.DataFrame = DataSetLabeler(trade_params(df, trade_side=trade_side)).compute(engine=engine)
+        corrected = correct_bars(df, 5000, 5020)
+
+        expected: pd.DataFrame = DataSetLabeler(trade_params(corrected, trade_side=trade_side)).compute(engine=engine)
+        patched: pd.DataFrame = DataSetLabeler(trade_params(corrected, trade_side=trade_side)).invalidate(
+            trades, (corrected.index[5000], corrected.index[5020]), engine=engine
+        )
+
+        assert patched is trades
+        pd.testing.assert_frame_equal(expected, patched)
+
+    def test_only_affected_trades_are_labeled(self, prepare_price_data, trade_params):
+        df = prepare_price_data
+        trades: pd.DataFrame = DataSetLabeler(trade_params(df, trade_side=TradeSide.BUY)).compute()
+        # a trade changed to tell the relabeled ones apart
+        trades.iloc[0, trades.columns.get_loc(const.PROFIT)] = 1234.0
+        corrected = correct_bars(df, 5000, 5020)
+
+        DataSetLabeler(trade_params(corrected, trade_side=TradeSide.BUY)).invalidate(
+            trades, (corrected.index[5000], corrected.index[5020])
+        )
+
+        assert trades[const.PROFIT].iloc[0] == 1234.0
+
+    def test_range_out_of_the_dataset(self, prepare_price_data, trade_params):
+        df = prepare_price_data
+        trades: pd.DataFrame = DataSetLabeler(trade_params(df)).compute(engine=const.ENGINE_VECTORIZED)
+        expected: pd.DataFrame = trades.copy()
+        dataset_labeler = DataSetLabeler(trade_params(df))
+        dataset_labeler._shard_setup = fail_to_label
+
+        after_the_dataset = (df.index[-1] + pd.Timedelta(days=1), df.index[-1] + pd.Timedelta(days=2))
+        reversed_range = (df.index[5020], df.index[5000])
+        for bar_range in [after_the_dataset, reversed_range]:
+            pd.testing.assert_frame_equal(expected, dataset_labeler.invalidate(trades, bar_range))
+
+    def test_changed_entries(self, prepare_price_data, trade_params):
+        df = prepare_price_data
+        trades: pd.DataFrame = DataSetLabeler(trade_params(df)).compute(engine=const.ENGINE_VECTORIZED)
+        corrected = correct_bars(df, 5000, 5020)
+        corrected.loc[trades.index[trades.index >= corrected.index[5000]][0], "entry"] = 0
+
+        with pytest.raises(ValueError, match="entries of the trades are not the entries of the dataset"):
+            DataSetLabeler(trade_params(corrected)).invalidate(trades, (corrected.index[5000], corrected.index[5020]))
+
+    def test_trades_of_other_sides(self, prepare_price_data, trade_params):
+        df = prepare_price_data
+        trades: pd.DataFrame = DataSetLabeler(trade_params(df)).compute(engine=const.ENGINE_VECTORIZED)
+
+        with pytest.raises(ValueError, match="labeled on other trade sides"):
+            DataSetLabeler(trade_params(df, trade_side=const.TRADE_SIDE_BOTH)).invalidate(
+                trades, (df.index[5000], df.index[5020])
+            )
+
+
+def read_prices(quote: str) -> pd.DataFrame:
+    return pd.read_csv(
+        PRICE_FILE.format(quote),
+        names=["date-time", "open", "high", "low", "close", "volume"],
+        header=0,
+        index_col="date-time",
+        parse_dates=True,
+        date_format="%Y.%m.%d %H:%M:%S",
+    )
+
+
+@pytest.fixture
+def bid_ask_prices() -> tuple[pd.DataFrame, pd.DataFrame]:
+    bid = read_prices("Bid")
+    ask = read_prices("Ask")
+    index = bid.index.intersection(ask.index)
+    return bid.loc[index], ask.loc[index]
+
+
+def mid_prices(bid: pd.DataFrame, ask: pd.DataFrame) -> pd.DataFrame:
+    mid = (bid + ask) / 2
+    mid["entry"] = 1.0
+    return mid
+
+
+class TestBidAsk:
+
+    def test_long_trades_open_on_ask_and_close_on_bid(self, bid_ask_prices, trade_params):
+        bid, ask = bid_ask_prices
+        dataset_labeler = DataSetLabeler(
+            trade_params(mid_prices(bid, ask), bid_price=bid, ask_price=ask, **BID_ASK_BARRIERS)
+        )
+
+        trades: pd.DataFrame = dataset_labeler.compute(engine=const.ENGINE_VECTORIZED)
+
+        entry_positions = np.arange(len(bid.index))
+        results = BatchLabeler(
+            open_price=bid.open, high_price=bid.high, low_price=bid.low, close_price=bid.close
+        ).compute(
+            entry_positions=entry_positions,
+            take_profit=ask.open.to_numpy() + 0.0003,
+            stop_loss=ask.open.to_numpy() - 0.0003,
+            time_limit_positions=np.minimum(entry_positions + 15, len(bid.index) - 1),
+            trade_side=TradeSide.BUY,
+        )
+        np.testing.assert_array_equal(trades[const.OPEN_PRICE].to_numpy(), ask.open.to_numpy())
+        np.testing.assert_array_equal(trades[const.CLOSE_PRICE].to_numpy(), results.exit_level)
+        # the spread is paid on the trades closed on the time barrier
+        assert (trades[const.PROFIT] < 0).sum() > (trades[const.PROFIT] > 0).sum()
+
+    @pytest.mark.parametrize("trade_side", [TradeSide.BUY, TradeSide.SELL, const.TRADE_SIDE_BOTH])
+    def test_same_trades_on_every_engine(self, bid_ask_prices, trade_params, trade_side):
+        bid, ask = bid_ask_prices
+        trading_setup = trade_params(
+            mid_prices(bid, ask), trade_side=trade_side, bid_price=bid, ask_price=ask, **BID_ASK_BARRIERS
+        )
+
+        expected: pd.DataFrame = DataSetLabeler(trading_setup).compute()
+        trades: pd.DataFrame = DataSetLabeler(trading_setup).compute(engine=const.ENGINE_VECTORIZED)
+        sharded: pd.DataFrame = DataSetLabeler(trading_setup).compute(
+            engine=const.ENGINE_VECTORIZED, workers=2
+        )
+
+        pd.testing.assert_frame_equal(expected, trades)
+        pd.testing.assert_frame_equal(expected, sharded)
+
+    @pytest.mark.parametrize("quote", ["bid_price", "ask_price"])
+    def test_one_quote_only(self, bid_ask_prices, trade_params, quote):
+        bid, ask = bid_ask_prices
+        trading_setup = trade_params(
+            mid_prices(bid, ask), **{quote: bid if quote == "bid_price" else ask}, **BID_ASK_BARRIERS
+        )
+
+        with pytest.raises(ValueError, match="Both the bid and the ask prices are needed"):
+            DataSetLabeler(trading_setup)
+
+    def test_prices_on_another_index(self, bid_ask_prices, trade_params):
+        bid, ask = bid_ask_prices
+        trading_setup = trade_params(
+            mid_prices(bid, ask), bid_price=bid, ask_price=ask.iloc[1:], **BID_ASK_BARRIERS
+        )
+
+        with pytest.raises(ValueError, match="ask prices must be on the dataset index"):
+            DataSetLabeler(trading_setup)
+
+    def test_missing_price_column(self, bid_ask_prices, trade_params):
+        bid, ask = bid_ask_prices
+        trading_setup = trade_params(
+            mid_prices(bid, ask), bid_price=bid.drop(columns=const.LOW), ask_price=ask, **BID_ASK_BARRIERS
+        )
+
+        with pytest.raises(ValueError, match="bid prices have no low column"):
+            DataSetLabeler(trading_setup)
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+from triple_barrier.batch_labeling import BatchLabeler
+from triple_barrier.trading import DataSetLabeler
+from triple_barrier.trading import TradingParameters
+from triple_barrier.types import TradeSide
+from triple_barrier import constants as const
+
+
+class TestBatchLabeler:
+
+    def test_first_hit_priority(self):
+        """
+        Bar 2 touches take profit and stop loss, take profit wins as in Labeler.
+        Second trade does not hit any level and closes on the time barrier.
+        """
+        open_price = np.array([1.0, 1.0, 1.0, 1.0, 1.0, 1.0])
+        high_price = np.array([1.0, 1.01, 1.05, 1.0, 1.0, 1.0])
+        low_price = np.array([1.0, 0.99, 0.95, 1.0, 1.0, 1.0])
+
+        batch_labeler = BatchLabeler(open_price=open_price,
+                                     high_price=high_price,
+                                     low_price=low_price,
+                                     close_price=open_price)
+
+        results = batch_labeler.compute(entry_positions=np.array([0, 3]),
+                                        take_profit=np.array([1.04, 1.04]),
+                                        stop_loss=np.array([0.96, 0.96]),
+                                        time_limit_positions=np.array([4, 5]),
+                                        trade_side=TradeSide.BUY)
+
+        assert list(results.exit_position) == [2, 5]
+        assert list(results.exit_level) == [1.04, 1.0]
+        assert list(results.exit_type_values()) == ["take-profit", "time-expiration"]
+        assert results.stop_loss_position[1] == const.NO_HIT
+
+    def test_dynamic_exit_closes_next_open(self):
+        open_price = np.array([1.0, 1.0, 1.0, 1.002, 1.0])
+        dynamic_exit = np.array([np.nan, np.nan, 1, np.nan, np.nan])
+
+        batch_labeler = BatchLabeler(open_price=open_price,
+                                     high_price=open_price,
+                                     low_price=open_price,
+                                     close_price=open_price,
+                                     dynamic_exit=dynamic_exit)
+
+        results = batch_labeler.compute(entry_positions=np.array([0]),
+                                        take_profit=np.array([0.9]),
+                                        stop_loss=np.array([1.1]),
+                                        time_limit_positions=np.array([4]),
+                                        trade_side=TradeSide.SELL)
+
+        assert results.exit_position[0] == 2
+        assert results.exit_level[0] == 1.002
+        assert results.exit_type_values()[0] == "dynamic"
+
+
+class TestVectorizedEngine:
+
+    def test_same_trades_as_apply_long(self, prepare_price_data):
+        df = prepare_price_data
+
+        trade_params = TradingParameters(
+            open_price=df.open,
+            high_price=df.high,
+            low_price=df.low,
+            close_price=df.close,
+            entry_mark=df.entry,
+            stop_loss_width=20,
+            take_profit_width=40,
+            trade_side=TradeSide.BUY,
+            pip_decimal_position=4,
+            time_barrier_periods=10,
+            dynamic_exit=df.exit,
+        )
+
+        expected: pd.DataFrame = DataSetLabeler(trade_params).compute()
+        trades: pd.DataFrame = DataSetLabeler(trade_params).compute(engine=const.ENGINE_VECTORIZED)
+
+        pd.testing.assert_frame_equal(expected, trades)
+
+    def test_same_trades_as_apply_short(self, prepare_price_data_short):
+        df = prepare_price_data_short
+
+        trade_params = TradingParameters(
+            open_price=df.open,
+            high_price=df.high,
+            low_price=df.low,
+            close_price=df.close,
+            entry_mark=df.entry,
+            stop_loss_width=5,
+            take_profit_width=10,
+            trade_side=TradeSide.SELL,
+            pip_decimal_position=4,
+            time_barrier_periods=20,
+            dynamic_exit=None,
+        )
+
+        expected: pd.DataFrame = DataSetLabeler(trade_params).compute()
+        trades: pd.DataFrame = DataSetLabeler(trade_params).compute(engine=const.ENGINE_VECTORIZED)
+
+        pd.testing.assert_frame_equal(expected, trades)
@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+from triple_barrier import constants as const
+from triple_barrier.chunked_labeling import ChunkedLabeler
+from triple_barrier.chunked_labeling import ParquetSink
+from triple_barrier.trading import DataSetLabeler
+from triple_barrier.trading import TradingParameters
+from triple_barrier.types import TradeSide
+
+COLUMNS: list[str] = ["open", "high", "low", "close", "entry", "exit"]
+
+
+def label_in_memory(df: pd.DataFrame, engine: str, periods: int) -> pd.DataFrame:
+    trade_params = TradingParameters(
+        open_price=df.open,
+        high_price=df.high,
+        low_price=df.low,
+        close_price=df.close,
+        entry_mark=df.entry,
+        stop_loss_width=20,
+        take_profit_width=40,
+        trade_side=TradeSide.BUY,
+        pip_decimal_position=4,
+        time_barrier_periods=periods,
+        dynamic_exit=df.exit,
+    )
+    return DataSetLabeler(trade_params).compute(engine=engine)
+
+
+class TestChunkedLabeler:
+
+    @pytest.mark.parametrize("engine, periods", [(const.ENGINE_VECTORIZED, 10),
+                                                 (const.ENGINE_VECTORIZED, 3000),
+                                                 (const.ENGINE_APPLY, 10)])
+    def test_same_trades_as_in_memory(self, prepare_price_data, engine, periods):
+        df = prepare_price_data[COLUMNS]
+        partitions = [month for _, month in df.groupby(df.index.to_period("M"))]
+
+        chunked_labeler = ChunkedLabeler(stop_loss_width=20,
+                                         take_profit_width=40,
+                                         trade_side=TradeSide.BUY,
+                                         pip_decimal_position=4,
+                                         time_barrier_periods=periods,
+                                         dynamic_exit=True,
+                                         engine=engine)
+        chunks: list[pd.DataFrame] = []
+        labeled = chunked_labeler.compute(partitions, sink=chunks.append)
+
+        expected = label_in_memory(df, engine, periods)
+        assert labeled == len(expected.index)
+        pd.testing.assert_frame_equal(pd.concat(chunks), expected, check_freq=False)
+
+    def test_parquet_partitions(self, tmp_path, prepare_price_data):
+        df = prepare_price_data[COLUMNS]
+        partitions: list[str] = []
+        for number, (_, month) in enumerate(df.groupby(df.index.to_period("M"))):
+            month.to_parquet(tmp_path / f"prices-{number:02d}.parquet")
+            partitions.append(str(tmp_path / f"prices-{number:02d}.parquet"))
+
+        chunked_labeler = ChunkedLabeler(stop_loss_width=20,
+                                         take_profit_width=40,
+                                         trade_side=TradeSide.BUY,
+                                         pip_decimal_position=4,
+                                         time_barrier_periods=10,
+                                         dynamic_exit=True)
+        sink = ParquetSink(str(tmp_path / "trades"))
+        chunked_labeler.compute(partitions, sink=sink)
+
+        trades = pd.concat(
+            [pd.read_parquet(tmp_path / "trades" / f"part-{part:05d}.parquet") for part in range(sink.parts)]
+        )
+        expected = label_in_memory(df, const.ENGINE_VECTORIZED, 10)
+        pd.testing.assert_frame_equal(trades, expected, check_freq=False)
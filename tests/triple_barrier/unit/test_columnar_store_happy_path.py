@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from triple_barrier import constants as const
+from triple_barrier.columnar_store import ColumnarPrices
+from triple_barrier.columnar_store import convert_price_file
+from triple_barrier.trading import DataSetLabeler
+from triple_barrier.trading import TradingParameters
+from triple_barrier.types import TradeSide
+
+PRICE_FILE: str = f"{const.ROOT_FOLDER}/tests/data/EURUSD_5 Mins_Ask_2023.01.02_2024.02.02.csv"
+
+
+class TestColumnarPrices:
+
+    def test_convert_csv(self, tmp_path):
+        columns = ["date-time", "open", "high", "low", "close", "volume"]
+        expected = pd.read_csv(PRICE_FILE, names=columns, parse_dates=True, index_col="date-time", header=0)
+
+        prices = convert_price_file(PRICE_FILE, str(tmp_path / "eurusd"),
+                                    names=columns, parse_dates=True, index_col="date-time", header=0)
+
+        assert prices.columns == ["open", "high", "low", "close", "volume"]
+        pd.testing.assert_frame_equal(prices.to_frame(), expected, check_freq=False)
+        assert isinstance(prices["close"].to_numpy().base, np.memmap)
+
+        reloaded = ColumnarPrices(str(tmp_path / "eurusd"))
+        pd.testing.assert_series_equal(reloaded.open, expected.open, check_freq=False)
+
+    def test_convert_parquet(self, tmp_path, prepare_price_data):
+        df = prepare_price_data[["open", "high", "low", "close", "entry", "exit"]]
+        df.to_parquet(tmp_path / "prices.parquet")
+
+        prices = convert_price_file(str(tmp_path / "prices.parquet"), str(tmp_path / "columnar"))
+
+        pd.testing.assert_frame_equal(prices.to_frame(), df, check_freq=False)
+
+    def test_labeling_same_as_in_memory(self, tmp_path, prepare_price_data):
+        df = prepare_price_data
+        prices = ColumnarPrices.from_frame(df[["open", "high", "low", "close", "entry", "exit"]], str(tmp_path))
+
+        def trade_params(price_data) -> TradingParameters:
+            return TradingParameters(
+                open_price=price_data.open,
+                high_price=price_data.high,
+                low_price=price_data.low,
+                close_price=price_data.close,
+                entry_mark=price_data.entry,
+                stop_loss_width=20,
+                take_profit_width=40,
+                trade_side=TradeSide.BUY,
+                pip_decimal_position=4,
+                time_barrier_periods=10,
+                dynamic_exit=price_data.exit,
+            )
+
+        expected = DataSetLabeler(trade_params(df)).compute(engine=const.ENGINE_VECTORIZED)
+        trades = DataSetLabeler(trade_params(prices)).compute(engine=const.ENGINE_VECTORIZED)
+
+        pd.testing.assert_frame_equal(expected, trades, check_freq=False)
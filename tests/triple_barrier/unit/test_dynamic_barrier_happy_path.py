@@ -1,5 +1,9 @@
 from datetime import datetime
 from dateutil import parser
+
+import pandas as pd
+
+from triple_barrier import constants
 from triple_barrier.trade_labeling import (
     DynamicOrder,
 )
@@ -18,3 +22,22 @@ class TestDynamicBarrier:
 
         assert dynamic_barrier.barrier.level == 1.05681
         assert dynamic_barrier.barrier.hit_datetime == parser.parse("2023-01-04 00:25:00")
+
+    def test_dynamic_barrier_hit_after_time_limit(self):
+        index = pd.date_range("2023-01-02 00:00:00", periods=6, freq="5min")
+        open_price = pd.Series([1.1, 1.101, 1.102, 1.103, 1.104, 1.105], index=index)
+        # the only exit signal is two bars after the time limit
+        exit_signals = pd.Series([0, 0, 0, 0, 1, 0], index=index)
+
+        def dynamic_barrier(time_limit: datetime | None) -> DynamicOrder:
+            barrier = DynamicOrder(
+                open_price=open_price,
+                exit_signals=exit_signals,
+                open_datetime=index[0],
+                time_limit=time_limit)
+            barrier.compute()
+            return barrier
+
+        assert dynamic_barrier(None).barrier.hit_datetime == index[4]
+        assert dynamic_barrier(None).barrier.level == 1.105
+        assert dynamic_barrier(index[2]).barrier.hit_datetime == constants.INFINITE_DATE
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from triple_barrier import constants as const
+from triple_barrier.trading import DataSetLabeler
+from triple_barrier.types import OrderType
+
+
+class TestEntryWidths:
+
+    def test_volatility_scaled_widths(self, prepare_price_data, trade_params):
+        df = prepare_price_data
+        # one and two standard deviations of the last 20 closes, in pips
+        volatility = (df.close.rolling(20).std() * 10**4).round(1).bfill()
+        entry_positions = np.flatnonzero(df.entry.to_numpy() == 1)
+        periods = 5 + entry_positions % 20
+
+        trading_setup = trade_params(
+            df, stop_loss_width=volatility, take_profit_width=2 * volatility, time_barrier_periods=periods
+        )
+
+        trades = DataSetLabeler(trading_setup).compute(engine=const.ENGINE_VECTORIZED)
+
+        for row in range(0, len(entry_positions), 9):
+            position = entry_positions[row]
+            entry_only = df.copy()
+            entry_only["entry"] = 0
+            entry_only.iloc[position, entry_only.columns.get_loc("entry")] = 1
+
+            expected = DataSetLabeler(
+                trade_params(
+                    entry_only,
+                    stop_loss_width=volatility.iloc[position],
+                    take_profit_width=2 * volatility.iloc[position],
+                    time_barrier_periods=periods[row],
+                )
+            ).compute()
+
+            assert trades[const.CLOSE_TYPE].iloc[row] == expected[const.CLOSE_TYPE].iloc[0]
+            assert trades[const.CLOSE_PRICE].iloc[row] == expected[const.CLOSE_PRICE].iloc[0]
+            assert trades[const.CLOSE_DATETIME].iloc[row] == expected[const.CLOSE_DATETIME].iloc[0]
+
+    def test_same_trades_on_every_engine(self, prepare_price_data, trade_params):
+        df = prepare_price_data
+        entry_positions = np.flatnonzero(df.entry.to_numpy() == 1)
+        rng = np.random.default_rng(3)
+        stop_loss_width = rng.integers(5, 30, len(entry_positions))
+        take_profit_width = pd.Series(rng.integers(5, 60, len(df.index)), index=df.index)
+
+        trading_setup = trade_params(df, stop_loss_width=stop_loss_width, take_profit_width=take_profit_width)
+
+        expected = DataSetLabeler(trading_setup).compute()
+        for kwargs in [dict(engine=const.ENGINE_VECTORIZED), dict(workers=2)]:
+            trades = DataSetLabeler(trading_setup).compute(**kwargs)
+            pd.testing.assert_frame_equal(expected, trades)
+
+    @pytest.mark.parametrize("engine", [const.ENGINE_APPLY, const.ENGINE_VECTORIZED])
+    def test_missing_width_on_entry(self, prepare_price_data, trade_params, engine):
+        df = prepare_price_data
+        # not defined before 20 closes, an entry in the warm-up has no width
+        volatility = df.close.rolling(20).std() * 10**4
+        df.loc[df.index[5], "entry"] = 1
+
+        with pytest.raises(ValueError, match=str(df.index[5])):
+            DataSetLabeler(
+                trade_params(df, stop_loss_width=volatility, take_profit_width=2 * volatility)
+            ).compute(engine=engine)
+
+    @pytest.mark.parametrize("engine", [const.ENGINE_APPLY, const.ENGINE_VECTORIZED])
+    @pytest.mark.parametrize("invalid_periods", [np.nan, -1, 2.5])
+    def test_invalid_periods_on_entry(self, prepare_price_data, trade_params, engine, invalid_periods):
+        df = prepare_price_data
+        entry_positions = np.flatnonzero(df.entry.to_numpy() == 1)
+        periods = np.full(len(entry_positions), 10.0)
+        periods[3] = invalid_periods
+
+        with pytest.raises(ValueError, match=str(df.index[entry_positions[3]])):
+            DataSetLabeler(trade_params(df, time_barrier_periods=periods)).compute(engine=engine)
+
+    @pytest.mark.parametrize("invalid_width", [0, -5, np.nan, -np.inf])
+    def test_invalid_width(self, prepare_price_data, trade_params, invalid_width):
+        df = prepare_price_data
+
+        with pytest.raises(ValueError, match="take_profit_width"):
+            DataSetLabeler(trade_params(df, take_profit_width=invalid_width))
+
+    def test_widths_of_another_length(self, prepare_price_data, trade_params):
+        df = prepare_price_data
+        entries: int = int((df.entry == 1).sum())
+
+        with pytest.raises(ValueError, match="Expected one value per bar .* or per entry"):
+            DataSetLabeler(trade_params(df, stop_loss_width=np.full(entries + 1, 20.0)))
+
+    @pytest.mark.parametrize("engine", [const.ENGINE_APPLY, const.ENGINE_VECTORIZED])
+    def test_infinite_width_disables_barrier(self, prepare_price_data, trade_params, engine):
+        df = prepare_price_data
+        entry_positions = np.flatnonzero(df.entry.to_numpy() == 1)
+        take_profit_width = np.full(len(entry_positions), 10.0)
+        take_profit_width[::2] = np.inf
+
+        scalar_trades = DataSetLabeler(trade_params(df, take_profit_width=np.inf)).compute(engine=engine)
+        entry_trades = DataSetLabeler(trade_params(df, take_profit_width=take_profit_width)).compute(engine=engine)
+
+        assert (scalar_trades[const.CLOSE_TYPE] != OrderType.TAKE_PROFIT.value).all()
+        assert (entry_trades[const.CLOSE_TYPE].iloc[::2] != OrderType.TAKE_PROFIT.value).all()
+        assert (entry_trades[const.CLOSE_TYPE].iloc[1::2] == OrderType.TAKE_PROFIT.value).any()
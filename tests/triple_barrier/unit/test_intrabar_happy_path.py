@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from triple_barrier import constants as const
+from triple_barrier.intrabar import IntrabarResolver
+from triple_barrier.trading import DataSetLabeler
+from triple_barrier.types import OrderType
+from triple_barrier.types import TradeSide
+
+FINE_PRICE_FILE: str = f"{const.ROOT_FOLDER}/tests/data/EURUSD_1 Min_Ask_2024.03.13_2024.03.13.csv"
+BARRIERS: dict = dict(stop_loss_width=2, take_profit_width=2)
+
+
+@pytest.fixture
+def fine_prices() -> pd.DataFrame:
+    return pd.read_csv(
+        FINE_PRICE_FILE,
+        names=["date-time", "open", "high", "low", "close", "volume"],
+        header=0,
+        index_col="date-time",
+        parse_dates=True,
+        date_format="%Y.%m.%d %H:%M:%S",
+    )
+
+
+def coarse_prices(fine_prices: pd.DataFrame) -> pd.DataFrame:
+    coarse = fine_prices.resample("5min").agg({"open": "first", "high": "max", "low": "min", "close": "last"})
+    coarse = coarse.dropna()
+    coarse["entry"] = 1.0
+    return coarse
+
+
+class TestIntrabarResolver:
+
+    def test_fine_bars_of_every_coarse_bar(self, fine_prices):
+        coarse = coarse_prices(fine_prices)
+
+        resolver = IntrabarResolver(fine_prices.high, fine_prices.low, coarse.index)
+
+        for position in [0, 10, len(coarse.index) - 1]:
+            fine_bars = fine_prices.index[resolver.fine_start[position]:resolver.fine_start[position + 1]]
+            assert (fine_bars.floor("5min") == coarse.index[position]).all()
+            assert len(fine_bars) == (fine_prices.index.floor("5min") == coarse.index[position]).sum()
+
+    @pytest.mark.parametrize("trade_side", [TradeSide.BUY, TradeSide.SELL])
+    def test_ambiguous_bars_resolved_by_fine_prices(self, fine_prices, trade_params, trade_side):
+        coarse = coarse_prices(fine_prices)
+        dataset_labeler = DataSetLabeler(
+            trade_params(coarse, trade_side=trade_side, lower_timeframe=fine_prices, **BARRIERS)
+        )
+
+        trades: pd.DataFrame = dataset_labeler.compute(engine=const.ENGINE_VECTORIZED)
+
+        results = dataset_labeler.results
+        ambiguous = np.flatnonzero(
+            (results.take_profit_position == results.stop_loss_position)
+            & (results.take_profit_position != const.NO_HIT)
+        )
+        assert len(ambiguous) != 0
+        for row in ambiguous:
+            bar_start = coarse.index[results.take_profit_position[row]]
+            fine_bars = fine_prices.loc[bar_start:bar_start + pd.Timedelta(minutes=4)]
+            if trade_side == TradeSide.BUY:
+                take_profit_touch = fine_bars.high >= results.take_profit_level[row]
+                stop_loss_touch = fine_bars.low <= results.stop_loss_level[row]
+            else:
+                take_profit_touch = fine_bars.low <= results.take_profit_level[row]
+                stop_loss_touch = fine_bars.high >= results.stop_loss_level[row]
+            first_touch = (take_profit_touch | stop_loss_touch).to_numpy().argmax()
+            stop_loss_first = stop_loss_touch.iloc[first_touch] and not take_profit_touch.iloc[first_touch]
+            expected = OrderType.STOP_LOSS if stop_loss_first else OrderType.TAKE_PROFIT
+            assert trades[const.CLOSE_TYPE].iloc[row] == expected.value
+
+    @pytest.mark.parametrize("trade_side", [TradeSide.BUY, TradeSide.SELL])
+    def test_same_trades_on_every_engine(self, fine_prices, trade_params, trade_side):
+        coarse = coarse_prices(fine_prices)
+        trading_setup = trade_params(coarse, trade_side=trade_side, lower_timeframe=fine_prices, **BARRIERS)
+
+        expected: pd.DataFrame = DataSetLabeler(trading_setup).compute()
+        trades: pd.DataFrame = DataSetLabeler(trading_setup).compute(engine=const.ENGINE_VECTORIZED)
+        without_fine_prices: pd.DataFrame = DataSetLabeler(
+            trade_params(coarse, trade_side=trade_side, **BARRIERS)
+        ).compute()
+
+        pd.testing.assert_frame_equal(expected, trades)
+        assert (
+            (trades[const.CLOSE_TYPE] == OrderType.STOP_LOSS.value).sum()
+            > (without_fine_prices[const.CLOSE_TYPE] == OrderType.STOP_LOSS.value).sum()
+        )
+
+    def test_fine_bars_out_of_the_dataset_ignored(self, fine_prices):
+        coarse = coarse_prices(fine_prices).iloc[10:20]
+
+        resolver = IntrabarResolver(fine_prices.high, fine_prices.low, coarse.index)
+
+        fine_bars = fine_prices.index[resolver.fine_start[0]:resolver.fine_start[-1]]
+        assert fine_bars[0] == coarse.index[0]
+        assert fine_bars[-1] < coarse.index[-1] + pd.Timedelta(minutes=5)
+
+    def test_tie_kept_without_fine_bars(self, fine_prices):
+        coarse_index = pd.date_range("2030-01-01", periods=3, freq="5min")
+        resolver = IntrabarResolver(fine_prices.high, fine_prices.low, coarse_index)
+
+        stop_loss_first = resolver.stop_loss_first(
+            np.array([0, 1]), np.array([2.0, 2.0]), np.array([0.5, 0.5]), TradeSide.BUY
+        )
+
+        np.testing.assert_array_equal(stop_loss_first, [False, False])
+
+    def test_unsorted_fine_prices(self, fine_prices):
+        coarse = coarse_prices(fine_prices)
+        fine_prices = fine_prices.iloc[::-1]
+
+        with pytest.raises(ValueError, match="sorted DatetimeIndex"):
+            IntrabarResolver(fine_prices.high, fine_prices.low, coarse.index)
+
+    @pytest.mark.parametrize("column", [const.HIGH, const.LOW])
+    def test_missing_price_column(self, fine_prices, trade_params, column):
+        coarse = coarse_prices(fine_prices)
+
+        with pytest.raises(ValueError, match=f"no {column} column"):
+            DataSetLabeler(trade_params(coarse, lower_timeframe=fine_prices.drop(columns=column), **BARRIERS))
@@ -0,0 +1,49 @@
+import numpy as np
+from dateutil import parser
+
+from triple_barrier import constants as const
+from triple_barrier.market_data import MarketData
+
+
+class TestMarketData:
+
+    def test_positions(self, prepare_price_data):
+        df = prepare_price_data
+        market_data = MarketData(open_price=df.open,
+                                 high_price=df.high,
+                                 low_price=df.low,
+                                 close_price=df.close)
+
+        position = market_data.position("2023-01-02 20:45:00")
+
+        assert market_data.datetime(position) == parser.parse("2023-01-02 20:45:00")
+        assert market_data.open[position] == df.loc["2023-01-02 20:45:00"]["open"]
+        assert market_data.last_position("2023-01-02 20:45:00") == position
+        assert market_data.last_position(None) == len(df.index) - 1
+
+    def test_time_limit_position(self, prepare_price_data):
+        df = prepare_price_data
+        market_data = MarketData(open_price=df.open)
+
+        position = market_data.position("2023-01-02 20:45:00")
+
+        assert market_data.datetime(market_data.time_limit_position(position, 10)) == df["2023-01-02 20:45:00":].index[10]
+        assert market_data.time_limit_position(len(df.index) - 3, 10) == len(df.index) - 1
+
+    def test_between_bars(self, prepare_price_data):
+        df = prepare_price_data
+        market_data = MarketData(open_price=df.open)
+
+        assert market_data.position("2023-01-02 20:47:00") == market_data.position("2023-01-02 20:50:00")
+        assert market_data.last_position("2023-01-02 20:47:00") == market_data.position("2023-01-02 20:45:00")
+
+    def test_next_exit(self, prepare_price_data):
+        df = prepare_price_data
+        market_data = MarketData(open_price=df.open, dynamic_exit=df.exit)
+
+        exit_positions = np.flatnonzero(df.exit.to_numpy() == 1)
+
+        for position in range(0, len(df.index), 97):
+            next_positions = exit_positions[exit_positions >= position]
+            expected = next_positions[0] if len(next_positions) else const.NO_HIT
+            assert market_data.next_exit[position] == expected
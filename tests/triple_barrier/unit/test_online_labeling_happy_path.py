@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from triple_barrier.online_labeling import ClosedTrade
+from triple_barrier.online_labeling import OnlineLabeler
+from triple_barrier.orders import Orders
+from triple_barrier.trading import DataSetLabeler
+from triple_barrier.trading import TradingParameters
+from triple_barrier.types import OrderType
+from triple_barrier.types import TradeSide
+
+
+def stream(df: pd.DataFrame, online_labeler: OnlineLabeler, trade_side: TradeSide, periods: int) -> dict:
+    closed: dict = {}
+    entry_times: dict = {}
+    for position, (timestamp, bar) in enumerate(df.iterrows()):
+        if bar.entry == 1:
+            orders = Orders()
+            orders.open_time = timestamp
+            orders.open_price = bar.open
+            orders.take_profit_width = 40
+            orders.stop_loss_width = 20
+            orders.time_limit = df.index[min(position + periods, len(df.index) - 1)]
+            orders.trade_side = trade_side
+            orders.pip_decimal_position = 4
+            entry_times[online_labeler.open_trade(orders)] = timestamp
+
+        for closed_trade in online_labeler.on_bar(timestamp, bar.open, bar.high, bar.low, bar.close, bar.exit):
+            closed[entry_times[closed_trade.trade_id]] = closed_trade
+    return closed
+
+
+def buy_orders(open_time: str) -> Orders:
+    orders = Orders()
+    orders.open_time = open_time
+    orders.take_profit_width = 10
+    orders.stop_loss_width = 10
+    orders.time_limit = "2024-01-01 01:00"
+    orders.trade_side = TradeSide.BUY
+    orders.pip_decimal_position = 4
+    return orders
+
+
+class TestOnlineLabeler:
+
+    @pytest.mark.parametrize("trade_side", [TradeSide.BUY, TradeSide.SELL])
+    def test_same_trades_as_labeler(self, prepare_price_data, trade_side):
+        df = prepare_price_data.iloc[:3000]
+        trade_params = TradingParameters(
+            open_price=df.open,
+            high_price=df.high,
+            low_price=df.low,
+            close_price=df.close,
+            entry_mark=df.entry,
+            stop_loss_width=20,
+            take_profit_width=40,
+            trade_side=trade_side,
+            pip_decimal_position=4,
+            time_barrier_periods=10,
+            dynamic_exit=df.exit,
+        )
+        expected: pd.DataFrame = DataSetLabeler(trade_params).compute()
+
+        closed: dict = stream(df, OnlineLabeler(), trade_side, periods=10)
+
+        # a dynamic exit on the last bar closes on a bar not received yet
+        expected = expected[np.isfinite(expected["close-price"])]
+        assert len(closed) == len(expected.index)
+        for open_time, trade in expected.iterrows():
+            first_hit = closed[open_time].orders_hit.first_hit
+            assert first_hit.order_type.value == trade["close-type"]
+            assert first_hit.level == trade["close-price"]
+            assert first_hit.hit_datetime == trade["close-datetime"]
+
+    def test_dynamic_exit_on_next_open(self):
+        closed_trades: list[ClosedTrade] = []
+        online_labeler = OnlineLabeler(on_close=closed_trades.append)
+
+        orders = Orders()
+        orders.open_time = "2024-01-01 00:00"
+        orders.take_profit_width = 10
+        orders.stop_loss_width = 10
+        orders.time_limit = "2024-01-01 00:10"
+        orders.trade_side = TradeSide.BUY
+        orders.pip_decimal_position = 4
+        online_labeler.open_trade(orders)
+
+        assert online_labeler.on_bar("2024-01-01 00:00", 1.0, 1.0005, 0.9995, 1.0, exit_signal=1) == []
+        assert online_labeler.open_trades == 1
+
+        online_labeler.on_bar("2024-01-01 00:05", 1.0002, 1.0003, 1.0001, 1.0002)
+
+        assert online_labeler.open_trades == 0
+        assert closed_trades[0].orders_box.open_price == 1.0
+        assert closed_trades[0].orders_hit.first_hit.order_type == OrderType.DYNAMIC
+        assert closed_trades[0].orders_hit.first_hit.level == 1.0002
+        assert closed_trades[0].orders_hit.first_hit.hit_datetime == pd.Timestamp("2024-01-01 00:00")
+
+    def test_trade_opens_on_the_next_bar(self):
+        online_labeler = OnlineLabeler()
+        online_labeler.on_bar("2024-01-01 00:00", 1.0, 1.0005, 0.9995, 1.0)
+        orders = buy_orders("2024-01-01 00:02")
+
+        online_labeler.open_trade(orders)
+        # opened on the open price of the next bar, not hit by its range
+        assert online_labeler.on_bar("2024-01-01 00:05", 1.0010, 1.0012, 1.0008, 1.0010) == []
+
+        assert online_labeler.open_trades == 1
+        closed: list[ClosedTrade] = online_labeler.on_bar("2024-01-01 00:10", 1.0010, 1.0025, 1.0009, 1.0020)
+        assert closed[0].orders_box.open_price == 1.0010
+        assert closed[0].orders_hit.first_hit.order_type == OrderType.TAKE_PROFIT
+
+    @pytest.mark.parametrize("open_time", ["2024-01-01 00:05", "2024-01-01 00:00"])
+    def test_trade_opened_in_the_past(self, open_time):
+        online_labeler = OnlineLabeler()
+        online_labeler.on_bar("2024-01-01 00:05", 1.0, 1.0005, 0.9995, 1.0)
+
+        with pytest.raises(ValueError, match="before the last bar received"):
+            online_labeler.open_trade(buy_orders(open_time))
+
+    @pytest.mark.parametrize("timestamp", ["2024-01-01 00:05", "2024-01-01 00:00"])
+    def test_bar_out_of_order(self, timestamp):
+        online_labeler = OnlineLabeler()
+        online_labeler.open_trade(buy_orders("2024-01-01 00:00"))
+        online_labeler.on_bar("2024-01-01 00:05", 1.0, 1.0005, 0.9995, 1.0)
+
+        with pytest.raises(ValueError, match="received after a later bar"):
+            online_labeler.on_bar(timestamp, 1.0, 1.0100, 0.9900, 1.0)
+
+        # the rejected bar does not close the trade
+        assert online_labeler.open_trades == 1
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from triple_barrier import constants as const
+from triple_barrier.trading import DataSetLabeler
+from triple_barrier.types import TradeSide
+
+
+class TestParallelLabeling:
+
+    def test_apply_same_as_serial(self, prepare_price_data, trade_params):
+        trading_setup = trade_params(prepare_price_data, trade_side=TradeSide.BUY)
+
+        expected: pd.DataFrame = DataSetLabeler(trading_setup).compute()
+        trades: pd.DataFrame = DataSetLabeler(trading_setup).compute(workers=3)
+
+        pd.testing.assert_frame_equal(expected, trades)
+
+    def test_vectorized_same_as_serial(self, prepare_price_data_short, trade_params):
+        trading_setup = trade_params(prepare_price_data_short, trade_side=TradeSide.SELL)
+
+        serial_labeler = DataSetLabeler(trading_setup)
+        expected: pd.DataFrame = serial_labeler.compute(engine=const.ENGINE_VECTORIZED)
+        parallel_labeler = DataSetLabeler(trading_setup)
+        trades: pd.DataFrame = parallel_labeler.compute(engine=const.ENGINE_VECTORIZED, workers=4)
+
+        pd.testing.assert_frame_equal(expected, trades)
+        for column, values in serial_labeler.results.to_frame().items():
+            assert np.array_equal(values.to_numpy(), parallel_labeler.results.to_frame()[column].to_numpy())
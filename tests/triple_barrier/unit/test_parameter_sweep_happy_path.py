@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from triple_barrier import constants as const
+from triple_barrier.trading import DataSetLabeler
+from triple_barrier.types import TradeSide
+
+
+class TestParameterSweep:
+
+    @pytest.mark.parametrize("trade_side", [TradeSide.BUY, TradeSide.SELL])
+    def test_same_trades_as_vectorized(self, prepare_price_data, trade_params, trade_side):
+        df = prepare_price_data
+        stop_loss_widths = [5, 20]
+        take_profit_widths = [5, 10, 40]
+        time_barrier_periods = [3, 10, 60]
+
+        sweep_results = DataSetLabeler(trade_params(df, trade_side=trade_side)).sweep(
+            stop_loss_widths, take_profit_widths, time_barrier_periods
+        )
+
+        assert sweep_results.profit.shape == (len(sweep_results.entry_position), 2, 3, 3)
+        for i, stop_loss_width in enumerate(stop_loss_widths):
+            for j, take_profit_width in enumerate(take_profit_widths):
+                for k, periods in enumerate(time_barrier_periods):
+                    trades: pd.DataFrame = DataSetLabeler(
+                        trade_params(
+                            df,
+                            stop_loss_width=stop_loss_width,
+                            take_profit_width=take_profit_width,
+                            trade_side=trade_side,
+                            time_barrier_periods=periods,
+                        )
+                    ).compute(engine=const.ENGINE_VECTORIZED)
+
+                    assert list(sweep_results.exit_type_values()[:, i, j, k]) == list(trades[const.CLOSE_TYPE])
+                    assert np.array_equal(sweep_results.exit_level[:, i, j, k], trades[const.CLOSE_PRICE])
+                    assert np.array_equal(sweep_results.profit[:, i, j, k], trades[const.PROFIT])
+                    assert np.array_equal(sweep_results.bars_held[:, i, j, k], trades[const.BARS_HELD])
+
+    def test_summary(self, prepare_price_data, trade_params):
+        df = prepare_price_data
+        summary = DataSetLabeler(trade_params(df, dynamic_exit=None)).sweep([10, 20], [10, 20, 30], [10]).summary()
+
+        assert len(summary.index) == 6
+        assert (summary[["take-profit", "stop-loss", "time-expiration", "dynamic"]].sum(axis=1)
+                == summary["trades"]).all()
+        assert summary.loc[(10, 10, 10), "dynamic"] == 0
+
+    @pytest.mark.parametrize("field, value", [
+        ("trade_side", lambda df: const.TRADE_SIDE_BOTH),
+        ("trailing_stop_width", lambda df: 10),
+        ("stop_loss_width", lambda df: np.full(int((df.entry == 1).sum()), 10.0)),
+        ("time_barrier_periods", lambda df: pd.Series(10, index=df.index)),
+        ("lower_timeframe", lambda df: df[["high", "low"]]),
+    ])
+    def test_unsupported_options(self, prepare_price_data, trade_params, field, value):
+        df = prepare_price_data
+        with pytest.raises(ValueError):
+            DataSetLabeler(trade_params(df, **{field: value(df)})).sweep([10], [10], [10])
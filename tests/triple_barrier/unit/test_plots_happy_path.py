@@ -1,6 +1,12 @@
 from datetime import datetime
+
+import numpy as np
+import pytest
+
 from triple_barrier import constants
 from triple_barrier.plots import PlotTripleBarrier
+from triple_barrier.trading import DataSetLabeler
+from triple_barrier.types import TradeSide
 
 
 class TestPlots:
@@ -55,3 +61,31 @@ class TestPlots:
         )
 
         # How to covert a string to a datetime object
+
+
+class TestDataSetLabelerPlot:
+
+    def test_plot_one_side_of_both(self, prepare_price_data, trade_params, tmp_path):
+        df = prepare_price_data
+        dataset_labeler = DataSetLabeler(trade_params(df, trade_side=constants.TRADE_SIDE_BOTH))
+        trades = dataset_labeler.compute()
+
+        dataset_labeler.plot(
+            trades.index[0], save_plot=True, plot_folder=f"{tmp_path}/", trade_side=TradeSide.SELL
+        )
+
+        assert len(list(tmp_path.glob("triple_barrier_*.png"))) == 1
+        with pytest.raises(ValueError):
+            dataset_labeler.plot(trades.index[0], save_plot=True, plot_folder=f"{tmp_path}/")
+
+    @pytest.mark.parametrize("options", [
+        {"trailing_stop_width": 10},
+        {"bid_price": "prices", "ask_price": "prices"},
+    ])
+    def test_options_not_drawn(self, prepare_price_data, trade_params, options):
+        df = prepare_price_data
+        options = {name: df if value == "prices" else value for name, value in options.items()}
+        dataset_labeler = DataSetLabeler(trade_params(df, **options))
+
+        with pytest.raises(ValueError):
+            dataset_labeler.plot(df.index[np.flatnonzero(df.entry.to_numpy() == 1)[0]])
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from triple_barrier import constants as const
+from triple_barrier.orders import Orders
+from triple_barrier.range_index import RangeExtremeIndex
+from triple_barrier.trade_labeling import Labeler
+from triple_barrier.trading import DataSetLabeler
+from triple_barrier.trading import TradingParameters
+from triple_barrier.types import TradeSide
+
+
+class TestRangeExtremeIndex:
+
+    def test_first_hit_same_as_scan(self, prepare_price_data):
+        df = prepare_price_data
+        high = df.high.to_numpy()
+        low = df.low.to_numpy()
+        range_index = RangeExtremeIndex(df.high, df.low)
+
+        rng = np.random.default_rng(10)
+        start = rng.integers(0, len(df.index) - 1, 200)
+        stop = np.minimum(start + rng.integers(0, 500, 200), len(df.index) - 1)
+        level = df.open.to_numpy()[start] + rng.normal(0, 0.002, 200)
+
+        take_profit_hits = range_index.first_high_at_or_above(start, level, stop)
+        stop_loss_hits = range_index.first_low_at_or_below(start, level, stop)
+
+        for i in range(200):
+            expected_high = np.flatnonzero(high[start[i]:stop[i] + 1] >= level[i])
+            expected_low = np.flatnonzero(low[start[i]:stop[i] + 1] <= level[i])
+            assert take_profit_hits[i] == (start[i] + expected_high[0] if len(expected_high) else const.NO_HIT)
+            assert stop_loss_hits[i] == (start[i] + expected_low[0] if len(expected_low) else const.NO_HIT)
+            assert range_index.max_high(start[i], stop[i]) == high[start[i]:stop[i] + 1].max()
+            assert range_index.min_low(start[i], stop[i]) == low[start[i]:stop[i] + 1].min()
+
+    def test_no_hit_outside_window(self):
+        range_index = RangeExtremeIndex(np.array([1.0, 1.0, 2.0]), np.array([1.0, 1.0, 0.5]))
+
+        assert range_index.first_high_at_or_above(0, 1.5) == 2
+        assert range_index.first_high_at_or_above(0, 1.5, stop=1) == const.NO_HIT
+        assert range_index.first_low_at_or_below(0, 0.9, stop=1) == const.NO_HIT
+
+    def test_labeler_with_range_index(self, prepare_price_data):
+        df = prepare_price_data
+        range_index = RangeExtremeIndex(df.high, df.low)
+
+        box_setup = Orders()
+        box_setup.open_time = "2023-01-02 20:45:00"
+        box_setup.open_price = df.loc[box_setup.open_time]["open"]
+        box_setup.take_profit_width = 5
+        box_setup.stop_loss_width = 5
+        box_setup.time_limit = df[box_setup.open_time:].index[10]
+        box_setup.trade_side = TradeSide.BUY
+        box_setup.pip_decimal_position = 4
+
+        expected = Labeler(open_price=df.open,
+                           high_price=df.high,
+                           low_price=df.low,
+                           close_price=df.close,
+                           box_setup=box_setup).compute()
+        orders_hit = Labeler(open_price=df.open,
+                             high_price=df.high,
+                             low_price=df.low,
+                             close_price=df.close,
+                             box_setup=box_setup,
+                             range_index=range_index).compute()
+
+        assert orders_hit.first_hit.order_type == expected.first_hit.order_type
+        assert orders_hit.first_hit.level == expected.first_hit.level
+        assert orders_hit.first_hit.hit_datetime == expected.first_hit.hit_datetime
+
+    def test_shared_across_parameter_sets(self, prepare_price_data):
+        df = prepare_price_data
+        range_index = RangeExtremeIndex(df.high, df.low)
+
+        for take_profit_width, stop_loss_width in [(10, 5), (40, 20)]:
+            trade_params = TradingParameters(
+                open_price=df.open,
+                high_price=df.high,
+                low_price=df.low,
+                close_price=df.close,
+                entry_mark=df.entry,
+                stop_loss_width=stop_loss_width,
+                take_profit_width=take_profit_width,
+                trade_side=TradeSide.BUY,
+                pip_decimal_position=4,
+                time_barrier_periods=10,
+                dynamic_exit=df.exit,
+            )
+
+            expected: pd.DataFrame = DataSetLabeler(trade_params).compute(engine=const.ENGINE_VECTORIZED)
+            trades: pd.DataFrame = DataSetLabeler(trade_params, range_index=range_index).compute(
+                engine=const.ENGINE_VECTORIZED
+            )
+
+            pd.testing.assert_frame_equal(expected, trades)
@@ -0,0 +1,138 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from triple_barrier import constants as const
+from triple_barrier.result_cache import ResultCache
+from triple_barrier.trading import DataSetLabeler
+from triple_barrier.types import TradeSide
+
+
+def fail_to_label():
+    raise AssertionError("The trades should be read from the cache")
+
+
+class TestResultCache:
+
+    def test_repeated_computation_read_from_cache(self, prepare_price_data, trade_params, tmp_path):
+        df = prepare_price_data
+        cache = ResultCache(str(tmp_path))
+        first_labeler = DataSetLabeler(trade_params(df), cache=cache)
+        expected: pd.DataFrame = first_labeler.compute(engine=const.ENGINE_VECTORIZED)
+
+        # same values in new objects
+        dataset_labeler = DataSetLabeler(trade_params(df.copy()), cache=cache)
+        dataset_labeler._compute_vectorized = fail_to_label
+        trades: pd.DataFrame = dataset_labeler.compute(engine=const.ENGINE_VECTORIZED)
+
+        pd.testing.assert_frame_equal(expected, trades)
+        np.testing.assert_array_equal(dataset_labeler.results.exit_position, first_labeler.results.exit_position)
+        assert len(cache) == 1
+
+    @pytest.mark.parametrize("trade_side", [TradeSide.BUY, const.TRADE_SIDE_BOTH])
+    def test_dataset_index_not_stored(self, prepare_price_data, trade_params, tmp_path, trade_side):
+        df = prepare_price_data
+        cache = ResultCache(str(tmp_path))
+        trading_setup = trade_params(df, trade_side=trade_side)
+        DataSetLabeler(trading_setup, cache=cache).compute(engine=const.ENGINE_VECTORIZED)
+
+        _, stored_results = cache.get(cache.key(trading_setup, const.ENGINE_VECTORIZED))
+        dataset_labeler = DataSetLabeler(trading_setup, cache=cache)
+        dataset_labeler.compute(engine=const.ENGINE_VECTORIZED)
+
+        if trade_side == TradeSide.BUY:
+            stored_results, results = {trade_side: stored_results}, {trade_side: dataset_labeler.results}
+        else:
+            results = dataset_labeler.results
+        for side, side_results in results.items():
+            assert stored_results[side].index is None
+            assert side_results.index.equals(df.index)
+            assert side_results.order_box_hits(0).first_hit.hit_datetime is not None
+
+    def test_changed_inputs_are_labeled(self, prepare_price_data, trade_params, tmp_path):
+        df = prepare_price_data
+        cache = ResultCache(str(tmp_path))
+        trading_setup = trade_params(df)
+
+        changed_high = df.copy()
+        changed_high.iloc[100, changed_high.columns.get_loc("high")] += 0.0001
+        keys = {
+            cache.key(trading_setup, const.ENGINE_VECTORIZED),
+            cache.key(trading_setup, const.ENGINE_APPLY),
+            cache.key(trade_params(df, stop_loss_width=21), const.ENGINE_VECTORIZED),
+            cache.key(trade_params(df, stop_loss_width=np.full(len(df.index), 20.0)), const.ENGINE_VECTORIZED),
+            cache.key(trade_params(changed_high), const.ENGINE_VECTORIZED),
+        }
+
+        assert len(keys) == 5
+        assert cache.key(trading_setup, const.ENGINE_VECTORIZED) == cache.key(
+            trade_params(df.copy()), const.ENGINE_VECTORIZED
+        )
+
+    def test_least_recently_used_entries_evicted(self, prepare_price_data, trade_params, tmp_path):
+        df = prepare_price_data
+        trades: pd.DataFrame = DataSetLabeler(trade_params(df)).compute(engine=const.ENGINE_VECTORIZED)
+        cache = ResultCache(str(tmp_path))
+        cache.put("first", trades, None)
+        entry_size: int = cache.size
+        cache = ResultCache(str(tmp_path), max_bytes=int(entry_size * 2.5))
+        cache.put("second", trades, None)
+        os.utime(os.path.join(str(tmp_path), "first.pkl"), ns=(1, 1))
+        os.utime(os.path.join(str(tmp_path), "second.pkl"), ns=(2, 2))
+
+        cache.get("first")
+        cache.put("third", trades, None)
+
+        assert "first" in cache and "third" in cache
+        assert "second" not in cache
+        assert cache.size <= cache.max_bytes
+
+    def test_entry_over_the_size_limit_not_kept(self, prepare_price_data, trade_params, tmp_path):
+        trades: pd.DataFrame = DataSetLabeler(trade_params(prepare_price_data)).compute(engine=const.ENGINE_VECTORIZED)
+        cache = ResultCache(str(tmp_path), max_bytes=16)
+
+        cache.put("first", trades, None)
+
+        assert "first" not in cache
+        assert cache.get("first") is None
+        assert len(cache) == 0
+
+    @pytest.mark.parametrize("content", [b"not a pickle", b""])
+    def test_unreadable_entry_removed(self, prepare_price_data, trade_params, tmp_path, content):
+        df = prepare_price_data
+        cache = ResultCache(str(tmp_path))
+        trading_setup = trade_params(df)
+        expected: pd.DataFrame = DataSetLabeler(trading_setup, cache=cache).compute(engine=const.ENGINE_VECTORIZED)
+        key: str = cache.key(trading_setup, const.ENGINE_VECTORIZED)
+        with open(os.path.join(str(tmp_path), f"{key}.pkl"), "wb") as entry_file:
+            entry_file.write(content)
+
+        assert cache.get(key) is None
+        assert key not in cache
+
+        # the trades are labeled again and stored back
+        trades: pd.DataFrame = DataSetLabeler(trading_setup, cache=cache).compute(engine=const.ENGINE_VECTORIZED)
+        pd.testing.assert_frame_equal(expected, trades)
+        assert key in cache
+
+    def test_clear(self, prepare_price_data, trade_params, tmp_path):
+        trades: pd.DataFrame = DataSetLabeler(trade_params(prepare_price_data)).compute(engine=const.ENGINE_VECTORIZED)
+        cache = ResultCache(str(tmp_path))
+        cache.put("first", trades, None)
+        cache.put("second", trades, None)
+        other_file = tmp_path / "notes.txt"
+        other_file.write_text("not an entry")
+
+        assert len(cache) == 2
+        cache.clear()
+
+        assert len(cache) == 0 and cache.size == 0
+        assert cache.get("first") is None
+        assert other_file.exists()
+
+    @pytest.mark.parametrize("max_bytes", [0, -1])
+    def test_invalid_size(self, tmp_path, max_bytes):
+        with pytest.raises(ValueError, match="cache size must be positive"):
+            ResultCache(str(tmp_path), max_bytes=max_bytes)
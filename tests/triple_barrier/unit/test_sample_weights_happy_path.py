@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from triple_barrier import constants as const
+from triple_barrier.sample_weights import SampleWeights
+from triple_barrier.trading import DataSetLabeler
+
+
+class TestSampleWeights:
+
+    def test_small_spans(self):
+        close_price = np.array([1.0, 1.1, 1.05, 1.2, 1.25, 1.3])
+
+        sample_weights = SampleWeights.from_spans(
+            start=np.array([0, 1, 4]), end=np.array([2, 3, 4]), close_price=close_price
+        )
+
+        np.testing.assert_array_equal(sample_weights.concurrency, [1, 2, 2, 1, 1, 0])
+        np.testing.assert_allclose(sample_weights.uniqueness, [2 / 3, 2 / 3, 1.0])
+        log_return = np.log(close_price[1:] / close_price[:-1])
+        attribution = np.abs([
+            log_return[0] / 2 + log_return[1] / 2,
+            log_return[0] / 2 + log_return[1] / 2 + log_return[2],
+            log_return[3],
+        ])
+        np.testing.assert_allclose(sample_weights.return_attribution, attribution * 3 / attribution.sum())
+
+    def test_same_weights_as_bar_loop(self, prepare_price_data, trade_params):
+        df = prepare_price_data.iloc[:5000]
+        dataset_labeler = DataSetLabeler(trade_params(df, time_barrier_periods=30))
+        trades = dataset_labeler.compute(engine=const.ENGINE_VECTORIZED)
+
+        sample_weights = dataset_labeler.sample_weights()
+
+        start = np.flatnonzero(df.entry.to_numpy() == 1)
+        end = start + trades[const.BARS_HELD].to_numpy()
+        concurrency = np.zeros(len(df.index))
+        for span_start, span_end in zip(start, end):
+            concurrency[span_start:span_end + 1] += 1
+        uniqueness = [np.mean(1 / concurrency[s:e + 1]) for s, e in zip(start, end)]
+        np.testing.assert_array_equal(sample_weights.concurrency, concurrency)
+        np.testing.assert_allclose(sample_weights.uniqueness, uniqueness)
+        assert np.isclose(sample_weights.return_attribution.sum(), len(start))
+
+    @pytest.mark.parametrize("start, end, message", [
+        ([0, 3], [2], "one end per span"),
+        ([0, 3], [2, 1], "end at or after its start"),
+        ([0, 3], [2, 6], "inside"),
+        ([-1, 3], [2, 4], "inside"),
+    ])
+    def test_invalid_spans(self, start, end, message):
+        with pytest.raises(ValueError, match=message):
+            SampleWeights.from_spans(start=np.array(start), end=np.array(end), close_price=np.ones(6))
+
+    def test_no_labels(self):
+        sample_weights = SampleWeights.from_spans(
+            start=np.zeros(0, dtype=np.int64), end=np.zeros(0, dtype=np.int64), close_price=np.ones(6)
+        )
+
+        np.testing.assert_array_equal(sample_weights.concurrency, np.zeros(6))
+        assert len(sample_weights.uniqueness) == 0
+        assert np.isnan(sample_weights.average_uniqueness())
+
+    def test_weights_before_compute(self, prepare_price_data, trade_params):
+        with pytest.raises(ValueError, match="computed"):
+            DataSetLabeler(trade_params(prepare_price_data)).sample_weights()
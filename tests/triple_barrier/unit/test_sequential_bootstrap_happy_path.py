@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from triple_barrier import constants as const
+from triple_barrier.sequential_bootstrap import SequentialBootstrap
+from triple_barrier.trading import DataSetLabeler
+
+
+def dense_probabilities(start: np.ndarray, end: np.ndarray, drawn: np.ndarray) -> np.ndarray:
+    indicator = np.zeros((end.max() + 1, len(start)))
+    for label, (span_start, span_end) in enumerate(zip(start, end)):
+        indicator[span_start:span_end + 1, label] = 1
+    count = indicator[:, drawn].sum(axis=1)
+    uniqueness = np.array([
+        (indicator[:, label] / (count + 1)).sum() / indicator[:, label].sum() for label in range(len(start))
+    ])
+    return uniqueness / uniqueness.sum()
+
+
+class TestSequentialBootstrap:
+
+    def test_same_probabilities_as_dense_matrix(self):
+        rng = np.random.default_rng(7)
+        start = np.sort(rng.integers(0, 200, 60))
+        end = start + rng.integers(0, 15, 60)
+        sequential_bootstrap = SequentialBootstrap(start, end)
+
+        drawn = sequential_bootstrap.sample(40, random_state=1)
+
+        np.testing.assert_allclose(
+            sequential_bootstrap.draw_probabilities(), dense_probabilities(start, end, drawn)
+        )
+
+    def test_drawn_label_is_less_likely_without_overlap(self):
+        sequential_bootstrap = SequentialBootstrap(np.array([0, 3, 6]), np.array([2, 5, 8]))
+
+        drawn = sequential_bootstrap.sample(1, random_state=0)
+
+        uniqueness = np.ones(3)
+        uniqueness[drawn[0]] = 0.5
+        np.testing.assert_allclose(sequential_bootstrap.draw_probabilities(), uniqueness / uniqueness.sum())
+
+    def test_sample_size(self):
+        sequential_bootstrap = SequentialBootstrap(np.array([0, 3, 6]), np.array([2, 5, 8]))
+
+        assert len(sequential_bootstrap.sample(random_state=0)) == 3
+        assert len(sequential_bootstrap.sample(7, random_state=0)) == 7
+        assert len(sequential_bootstrap.sample(0, random_state=0)) == 0
+
+    def test_no_labels(self):
+        sequential_bootstrap = SequentialBootstrap(np.array([], dtype=int), np.array([], dtype=int))
+
+        assert len(sequential_bootstrap) == 0
+        assert len(sequential_bootstrap.sample(5, random_state=0)) == 0
+
+    @pytest.mark.parametrize(
+        "start, end, match",
+        [
+            ([0, 3, 6], [2, 1, 8], "end at or after its start"),
+            ([0, 3, 6], [2, 5], "Expected one end per span start"),
+        ],
+    )
+    def test_invalid_spans(self, start, end, match):
+        with pytest.raises(ValueError, match=match):
+            SequentialBootstrap(np.array(start), np.array(end))
+
+    def test_negative_sample_size(self):
+        sequential_bootstrap = SequentialBootstrap(np.array([0, 3, 6]), np.array([2, 5, 8]))
+
+        with pytest.raises(ValueError, match="sample size can not be negative"):
+            sequential_bootstrap.sample(-1)
+
+    def test_reproducible_sample_of_trades(self, prepare_price_data, trade_params):
+        dataset_labeler = DataSetLabeler(trade_params(prepare_price_data, time_barrier_periods=30))
+        trades = dataset_labeler.compute(engine=const.ENGINE_VECTORIZED)
+
+        sample = dataset_labeler.sequential_bootstrap(random_state=42)
+
+        assert len(sample) == len(trades.index)
+        assert sample.min() >= 0 and sample.max() < len(trades.index)
+        np.testing.assert_array_equal(sample, dataset_labeler.sequential_bootstrap(random_state=42))
+
+    def test_sample_before_compute(self, prepare_price_data, trade_params):
+        dataset_labeler = DataSetLabeler(trade_params(prepare_price_data))
+
+        with pytest.raises(ValueError, match="compute"):
+            dataset_labeler.sequential_bootstrap()
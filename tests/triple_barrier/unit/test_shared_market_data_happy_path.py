@@ -0,0 +1,146 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from triple_barrier import constants as const
+from triple_barrier.batch_labeling import BatchLabeler
+from triple_barrier.shared_market_data import SharedMarketData
+from triple_barrier.shared_market_data import SharedMarketDataHandle
+from triple_barrier.trading import DataSetLabeler
+from triple_barrier.trading import TradingParameters
+from triple_barrier.types import TradeSide
+
+
+def label_exit_positions(handle: SharedMarketDataHandle, entry_positions: np.ndarray) -> np.ndarray:
+    shared_market_data = SharedMarketData.attach(handle)
+    market_data = shared_market_data.market_data()
+    open_price = market_data.open[entry_positions]
+
+    results = BatchLabeler(
+        open_price=market_data.open,
+        high_price=market_data.high,
+        low_price=market_data.low,
+        close_price=market_data.close,
+        dynamic_exit=market_data.dynamic_exit,
+    ).compute(
+        entry_positions=entry_positions,
+        take_profit=open_price + 40 * 10**-4,
+        stop_loss=open_price - 20 * 10**-4,
+        time_limit_positions=market_data.time_limit_position(entry_positions, 10),
+        trade_side=TradeSide.BUY,
+    )
+    return results.exit_position
+
+
+class TestSharedMarketData:
+
+    def test_attach_read_only_views(self, prepare_price_data):
+        df = prepare_price_data
+
+        with SharedMarketData.create(df.open, df.high, df.low, df.close, df.entry, df.exit) as shared:
+            attached = SharedMarketData.attach(shared.handle)
+
+            assert attached.index.equals(df.index)
+            assert np.array_equal(attached.array(const.CLOSE), df.close.to_numpy())
+            assert np.array_equal(attached.entry_positions(), np.flatnonzero(df.entry.to_numpy() == 1))
+            with pytest.raises(ValueError):
+                attached.array(const.OPEN)[0] = 0
+
+            market_data = attached.market_data()
+            assert np.shares_memory(market_data.open, attached.array(const.OPEN))
+
+            del market_data
+            attached.close()
+
+    def test_workers_same_as_vectorized(self, prepare_price_data):
+        df = prepare_price_data
+        trade_params = TradingParameters(
+            open_price=df.open,
+            high_price=df.high,
+            low_price=df.low,
+            close_price=df.close,
+            entry_mark=df.entry,
+            stop_loss_width=20,
+            take_profit_width=40,
+            trade_side=TradeSide.BUY,
+            pip_decimal_position=4,
+            time_barrier_periods=10,
+            dynamic_exit=df.exit,
+        )
+        dataset_labeler = DataSetLabeler(trade_params)
+        dataset_labeler.compute(engine=const.ENGINE_VECTORIZED)
+
+        with SharedMarketData.create(df.open, df.high, df.low, df.close, df.entry, df.exit) as shared:
+            shards = np.array_split(shared.entry_positions(), 2)
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                exit_positions = list(executor.map(label_exit_positions, [shared.handle] * 2, shards))
+
+        assert np.array_equal(np.concatenate(exit_positions), dataset_labeler.results.exit_position)
+
+    def test_blocks_outlive_an_attached_process(self, prepare_price_data):
+        df = prepare_price_data
+        # a process not started by the owner, with its own resource tracker
+        attach_code = (
+            "import pickle, sys\n"
+            "from triple_barrier.shared_market_data import SharedMarketData\n"
+            "attached = SharedMarketData.attach(pickle.loads(sys.stdin.buffer.read()))\n"
+            "print(attached.array('close')[10])\n"
+            "attached.close()\n"
+        )
+
+        with SharedMarketData.create(df.open, df.high, df.low, df.close, df.entry, df.exit) as shared:
+            child = subprocess.run(
+                [sys.executable, "-c", attach_code],
+                input=pickle.dumps(shared.handle),
+                capture_output=True,
+                env={**os.environ, "PYTHONPATH": const.ROOT_FOLDER},
+                check=True,
+            )
+
+            assert float(child.stdout) == df.close.iloc[10]
+            assert b"resource_tracker" not in child.stderr
+            attached = SharedMarketData.attach(shared.handle)
+            assert np.array_equal(attached.array(const.CLOSE), df.close.to_numpy())
+            attached.close()
+
+    @pytest.mark.parametrize("start_method", multiprocessing.get_all_start_methods())
+    def test_blocks_tracked_once_with_pool_workers(self, tmp_path, start_method):
+        # the workers share the owner resource tracker, the owner unlink must find its registrations
+        script = tmp_path / "pool_workers.py"
+        script.write_text(
+            "from concurrent.futures import ProcessPoolExecutor\n"
+            "from multiprocessing import get_context\n"
+            "import numpy as np\n"
+            "import pandas as pd\n"
+            "from triple_barrier.shared_market_data import SharedMarketData\n"
+            "\n"
+            "def close_sum(handle):\n"
+            "    attached = SharedMarketData.attach(handle)\n"
+            "    total = float(attached.array('close').sum())\n"
+            "    attached.close()\n"
+            "    return total\n"
+            "\n"
+            "if __name__ == '__main__':\n"
+            "    prices = pd.Series(np.arange(100.0), index=pd.date_range('2024-01-01', periods=100, freq='min'))\n"
+            "    with SharedMarketData.create(prices, prices, prices, prices, prices) as shared:\n"
+            f"        context = get_context('{start_method}')\n"
+            "        with ProcessPoolExecutor(max_workers=2, mp_context=context) as executor:\n"
+            "            print(sum(executor.map(close_sum, [shared.handle] * 4)))\n"
+        )
+
+        child = subprocess.run(
+            [sys.executable, str(script)],
+            capture_output=True,
+            env={**os.environ, "PYTHONPATH": const.ROOT_FOLDER},
+            check=True,
+        )
+
+        assert float(child.stdout) == 4 * np.arange(100.0).sum()
+        assert b"KeyError" not in child.stderr
+        assert b"resource_tracker" not in child.stderr
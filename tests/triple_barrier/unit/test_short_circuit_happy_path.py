@@ -0,0 +1,71 @@
+import pytest
+
+from triple_barrier.orders import Orders
+from triple_barrier.trade_labeling import Labeler
+from triple_barrier.types import OrderType
+from triple_barrier.types import TradeSide
+
+
+class TestShortCircuit:
+
+    @pytest.mark.parametrize("trade_side", [TradeSide.BUY, TradeSide.SELL])
+    def test_same_first_hit_as_full_evaluation(self, prepare_price_data, trade_side):
+        df = prepare_price_data
+
+        for open_datetime in df[df.entry == 1].index[:50]:
+            box_setup = Orders()
+            box_setup.open_time = open_datetime
+            box_setup.open_price = df.loc[open_datetime]["open"]
+            box_setup.take_profit_width = 10
+            box_setup.stop_loss_width = 5
+            box_setup.time_limit = df[open_datetime:].index[min(20, len(df[open_datetime:].index) - 1)]
+            box_setup.trade_side = trade_side
+            box_setup.pip_decimal_position = 4
+
+            expected = Labeler(open_price=df.open,
+                               high_price=df.high,
+                               low_price=df.low,
+                               close_price=df.close,
+                               dynamic_exit=df.exit,
+                               box_setup=box_setup).compute()
+
+            orders_hit = Labeler(open_price=df.open,
+                                 high_price=df.high,
+                                 low_price=df.low,
+                                 close_price=df.close,
+                                 dynamic_exit=df.exit,
+                                 box_setup=box_setup,
+                                 short_circuit=True).compute()
+
+            assert orders_hit.first_hit.order_type == expected.first_hit.order_type
+            assert orders_hit.first_hit.level == expected.first_hit.level
+            assert orders_hit.first_hit.hit_datetime == expected.first_hit.hit_datetime
+
+    def test_skips_barriers_that_can_not_be_first(self, prepare_price_data):
+        """
+        Take profit at zero pips is hit on the opening bar, so stop loss and
+        dynamic barriers are not evaluated.
+        """
+        df = prepare_price_data
+        open_datetime = df.index[100]
+
+        box_setup = Orders()
+        box_setup.open_time = open_datetime
+        box_setup.open_price = df.loc[open_datetime]["open"]
+        box_setup.take_profit_width = 0
+        box_setup.stop_loss_width = 0
+        box_setup.time_limit = df.index[110]
+        box_setup.trade_side = TradeSide.BUY
+        box_setup.pip_decimal_position = 4
+
+        orders_hit = Labeler(open_price=df.open,
+                             high_price=df.high,
+                             low_price=df.low,
+                             close_price=df.close,
+                             dynamic_exit=df.exit,
+                             box_setup=box_setup,
+                             short_circuit=True).compute()
+
+        assert orders_hit.first_hit.order_type == OrderType.TAKE_PROFIT
+        evaluated = [barrier.order_type for barrier in orders_hit.barriers]
+        assert evaluated == [OrderType.TAKE_PROFIT, OrderType.TIME_EXPIRATION]
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from triple_barrier.span_index import SpanIndex
+
+
+class TestSpanIndex:
+
+    def test_same_spans_as_brute_force(self):
+        rng = np.random.default_rng(11)
+        start = rng.integers(0, 500, 200)
+        end = start + rng.integers(0, 50, 200)
+        span_index = SpanIndex(start, end)
+
+        for first in range(0, 560, 7):
+            last = first + 5
+            np.testing.assert_array_equal(
+                span_index.overlapping(first, last), np.flatnonzero((start <= last) & (end >= first))
+            )
+
+    def test_nested_spans(self):
+        span_index = SpanIndex(np.array([0, 2, 4]), np.array([20, 3, 5]))
+
+        np.testing.assert_array_equal(span_index.overlapping(10, 12), [0])
+        np.testing.assert_array_equal(span_index.overlapping(3, 4), [0, 1, 2])
+
+    def test_range_out_of_the_spans(self):
+        span_index = SpanIndex(np.array([10, 15]), np.array([12, 20]))
+
+        assert len(span_index.overlapping(0, 9)) == 0
+        assert len(span_index.overlapping(21, 30)) == 0
+        assert len(span_index.overlapping(13, 14)) == 0
+        # a reversed range has no bars
+        assert len(span_index.overlapping(12, 10)) == 0
+
+    def test_no_spans(self):
+        span_index = SpanIndex(np.array([], dtype=int), np.array([], dtype=int))
+
+        assert len(span_index) == 0
+        assert len(span_index.overlapping(0, 100)) == 0
+
+    def test_mismatched_spans(self):
+        with pytest.raises(ValueError, match="Expected one end per span start"):
+            SpanIndex(np.array([0, 1, 2]), np.array([3, 4]))
@@ -1,4 +1,9 @@
+from datetime import datetime
 from dateutil import parser
+
+import pandas as pd
+
+from triple_barrier import constants
 from triple_barrier.trade_labeling import StopLoss
 from triple_barrier.types import TradeSide
 
@@ -42,3 +47,26 @@ class TestStopLoss:
 
         assert stop_loss_barrier.barrier.level == 1.05535
         assert stop_loss_barrier.barrier.hit_datetime == parser.parse("2023-01-03 15:25:00")
+
+    def test_static_sl_hit_after_time_limit(self):
+        index = pd.date_range("2023-01-02 00:00:00", periods=6, freq="5min")
+        df = pd.DataFrame({"open": 1.1, "high": 1.101, "low": 1.099, "close": 1.1}, index=index)
+        # the only bar reaching the stop loss is two bars after the time limit
+        df.loc[index[4], "low"] = 1.095
+
+        def stop_loss_barrier(time_limit: datetime | None) -> StopLoss:
+            barrier = StopLoss(open_price=df.open,
+                               high_price=df.high,
+                               low_price=df.low,
+                               close_price=df.close,
+                               open_datetime=index[0],
+                               trade_side=TradeSide.BUY,
+                               pip_decimal_position=4,
+                               stop_loss=1.098,
+                               time_limit=time_limit
+                               )
+            barrier.compute()
+            return barrier
+
+        assert stop_loss_barrier(None).barrier.hit_datetime == index[4]
+        assert stop_loss_barrier(index[2]).barrier.hit_datetime == constants.INFINITE_DATE
@@ -3,6 +3,8 @@ from dateutil import parser
 
 import pandas as pd
 
+from triple_barrier import constants
+
 from triple_barrier.trade_labeling import TakeProfit
 from triple_barrier.types import TradeSide
 
@@ -48,3 +50,26 @@ class TestTakeProfit:
 
         assert take_profit_barrier.barrier.level == 1.06609
         assert take_profit_barrier.barrier.hit_datetime == parser.parse("2023-01-02 22:05:00")
+
+    def test_static_tp_hit_after_time_limit(self):
+        index = pd.date_range("2023-01-02 00:00:00", periods=6, freq="5min")
+        df = pd.DataFrame({"open": 1.1, "high": 1.101, "low": 1.099, "close": 1.1}, index=index)
+        # the only bar reaching the take profit is two bars after the time limit
+        df.loc[index[4], "high"] = 1.105
+
+        def take_profit_barrier(time_limit: datetime | None) -> TakeProfit:
+            barrier = TakeProfit(open_price=df.open,
+                                 high_price=df.high,
+                                 low_price=df.low,
+                                 close_price=df.close,
+                                 open_datetime=index[0],
+                                 trade_side=TradeSide.BUY,
+                                 pip_decimal_position=4,
+                                 take_profit=1.102,
+                                 time_limit=time_limit
+                                 )
+            barrier.compute()
+            return barrier
+
+        assert take_profit_barrier(None).barrier.hit_datetime == index[4]
+        assert take_profit_barrier(index[2]).barrier.hit_datetime == constants.INFINITE_DATE
@@ -0,0 +1,108 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from triple_barrier import constants as const
+from triple_barrier.orders import Orders
+from triple_barrier.trade_labeling import Labeler
+from triple_barrier.trading import DataSetLabeler
+from triple_barrier.trading import TradingParameters
+from triple_barrier.types import OrderHit
+from triple_barrier.types import TradeResults
+from triple_barrier.types import TradeSide
+
+
+class TestTradeResults:
+
+    def _label(self, df) -> DataSetLabeler:
+        trade_params = TradingParameters(
+            open_price=df.open,
+            high_price=df.high,
+            low_price=df.low,
+            close_price=df.close,
+            entry_mark=df.entry,
+            stop_loss_width=10,
+            take_profit_width=20,
+            trade_side=TradeSide.BUY,
+            pip_decimal_position=4,
+            time_barrier_periods=10,
+            dynamic_exit=df.exit,
+        )
+        dataset_labeler = DataSetLabeler(trade_params)
+        dataset_labeler.compute(engine=const.ENGINE_VECTORIZED)
+        return dataset_labeler
+
+    def test_to_frame_zero_copy(self, prepare_price_data):
+        results: TradeResults = self._label(prepare_price_data).results
+
+        frame = results.to_frame()
+
+        assert len(frame.index) == len(results)
+        assert np.shares_memory(frame["exit-position"].to_numpy(), results.exit_position)
+        assert np.shares_memory(frame["exit-level"].to_numpy(), results.exit_level)
+        assert np.shares_memory(frame["dynamic-position"].to_numpy(), results.dynamic_position)
+
+    def test_order_box_hits_same_as_labeler(self, prepare_price_data):
+        df = prepare_price_data
+        dataset_labeler = self._label(df)
+        results: TradeResults = dataset_labeler.results
+
+        for row in range(0, len(results), 7):
+            open_datetime = dataset_labeler.trades.index[row]
+
+            box_setup = Orders()
+            box_setup.open_time = open_datetime
+            box_setup.open_price = df.loc[open_datetime]["open"]
+            box_setup.take_profit_width = 20
+            box_setup.stop_loss_width = 10
+            box_setup.time_limit = df.index[results.time_limit_position[row]]
+            box_setup.trade_side = TradeSide.BUY
+            box_setup.pip_decimal_position = 4
+
+            expected = Labeler(open_price=df.open,
+                               high_price=df.high,
+                               low_price=df.low,
+                               close_price=df.close,
+                               dynamic_exit=df.exit,
+                               box_setup=box_setup).compute()
+
+            orders_hit = results.order_box_hits(row)
+
+            assert orders_hit.first_hit.order_type == expected.first_hit.order_type
+            assert orders_hit.first_hit.level == expected.first_hit.level
+            assert orders_hit.first_hit.hit_datetime == expected.first_hit.hit_datetime
+            assert [barrier.order_type for barrier in orders_hit.barriers] == [
+                barrier.order_type for barrier in expected.barriers
+            ]
+
+    def test_bars_held(self, prepare_price_data):
+        dataset_labeler = self._label(prepare_price_data)
+        results: TradeResults = dataset_labeler.results
+        trades = dataset_labeler.trades
+
+        bars_held = trades[const.BARS_HELD].to_numpy()
+
+        assert np.array_equal(bars_held, results.exit_position - results.entry_position)
+        assert (bars_held >= 0).all()
+        assert np.array_equal(
+            prepare_price_data.index[results.entry_position + bars_held], trades[const.CLOSE_DATETIME]
+        )
+
+
+class TestOrderHit:
+
+    def test_hit_time_nanoseconds(self):
+        order_hit = OrderHit(hit_datetime=datetime(2023, 1, 2, 20, 55))
+
+        assert order_hit.hit_time == pd.Timestamp("2023-01-02 20:55:00").value
+        assert order_hit.hit_datetime == datetime(2023, 1, 2, 20, 55)
+
+    def test_no_hit_sentinel(self):
+        order_hit = OrderHit(hit_time=const.NO_HIT)
+
+        assert order_hit.hit_datetime == const.INFINITE_DATE
+
+        order_hit.hit_datetime = const.INFINITE_DATE
+
+        assert order_hit.hit_time == const.NO_HIT
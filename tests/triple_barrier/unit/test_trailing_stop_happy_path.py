@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from triple_barrier import constants as const
+from triple_barrier.online_labeling import OnlineLabeler
+from triple_barrier.orders import Orders
+from triple_barrier.trade_labeling import Labeler
+from triple_barrier.trading import DataSetLabeler
+from triple_barrier.types import OrderType
+from triple_barrier.types import TradeSide
+
+# stop loss wider than the trailing stop, so the trailing stop closes some trades
+BARRIERS: dict = dict(stop_loss_width=30, take_profit_width=60, trailing_stop_width=25)
+
+
+class TestTrailingStop:
+
+    def test_level_follows_the_high(self):
+        index = pd.date_range("2024-01-01", periods=5, freq="5min")
+        open_price = pd.Series([1.0000, 1.0010, 1.0030, 1.0025, 1.0010], index=index)
+        high_price = pd.Series([1.0012, 1.0035, 1.0032, 1.0026, 1.0015], index=index)
+        low_price = pd.Series([0.9995, 1.0008, 1.0020, 1.0014, 1.0005], index=index)
+
+        orders = Orders()
+        orders.open_time = index[0]
+        orders.open_price = 1.0
+        orders.take_profit_width = 100
+        orders.stop_loss_width = 50
+        orders.trailing_stop_width = 20
+        orders.time_limit = index[-1]
+        orders.trade_side = TradeSide.BUY
+        orders.pip_decimal_position = 4
+
+        labeler = Labeler(open_price, high_price, low_price, open_price, box_setup=orders)
+        labeler.compute()
+
+        # the stop trails the 1.0035 high of the second bar and is hit on the fourth one
+        first_hit = labeler.orders_hit.first_hit
+        assert first_hit.order_type == OrderType.TRAILING_STOP
+        assert first_hit.hit_datetime == index[3]
+        assert first_hit.level == pytest.approx(1.0015)
+
+    @pytest.mark.parametrize("trade_side", [TradeSide.BUY, TradeSide.SELL])
+    def test_same_trades_on_every_engine(self, prepare_price_data, trade_params, trade_side):
+        df = prepare_price_data
+
+        trading_setup = trade_params(df, trade_side=trade_side, **BARRIERS)
+
+        expected: pd.DataFrame = DataSetLabeler(trading_setup).compute()
+        trades: pd.DataFrame = DataSetLabeler(trading_setup).compute(engine=const.ENGINE_VECTORIZED)
+
+        pd.testing.assert_frame_equal(expected, trades)
+        assert (trades[const.CLOSE_TYPE] == OrderType.TRAILING_STOP.value).any()
+
+    def test_both_sides(self, prepare_price_data, trade_params):
+        df = prepare_price_data
+
+        both_params = trade_params(df, trade_side=const.TRADE_SIDE_BOTH, **BARRIERS)
+        short_params = trade_params(df, trade_side=TradeSide.SELL, **BARRIERS)
+
+        trades: pd.DataFrame = DataSetLabeler(both_params).compute(engine=const.ENGINE_VECTORIZED)
+        short_trades: pd.DataFrame = DataSetLabeler(short_params).compute()
+
+        np.testing.assert_array_equal(
+            trades[f"{const.CLOSE_TYPE}-sell"].to_numpy(), short_trades[const.CLOSE_TYPE].to_numpy()
+        )
+
+    @pytest.mark.parametrize("engine", [const.ENGINE_APPLY, const.ENGINE_VECTORIZED])
+    def test_infinite_width_disables_trailing_stop(self, prepare_price_data, trade_params, engine):
+        df = prepare_price_data
+        barriers: dict = dict(BARRIERS, trailing_stop_width=np.inf)
+        no_trailing_stop: dict = dict(BARRIERS, trailing_stop_width=None)
+
+        expected: pd.DataFrame = DataSetLabeler(trade_params(df, **no_trailing_stop)).compute(engine=engine)
+        trades: pd.DataFrame = DataSetLabeler(trade_params(df, **barriers)).compute(engine=engine)
+
+        pd.testing.assert_frame_equal(expected, trades)
+
+    @pytest.mark.parametrize("trailing_stop_width", [0, -10, np.nan])
+    def test_invalid_width(self, prepare_price_data, trade_params, trailing_stop_width):
+        trading_setup = trade_params(prepare_price_data, **dict(BARRIERS, trailing_stop_width=trailing_stop_width))
+
+        with pytest.raises(ValueError, match="trailing_stop_width must be positive"):
+            DataSetLabeler(trading_setup)
+
+    def test_online_labeler_rejects_trailing_stop(self):
+        orders = Orders()
+        orders.open_time = "2024-01-01 00:00"
+        orders.trailing_stop_width = 20
+
+        with pytest.raises(ValueError, match="Trailing stops are not supported"):
+            OnlineLabeler().open_trade(orders)
@@ -0,0 +1,108 @@
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from triple_barrier import constants as const
+from triple_barrier.trading import DataSetLabeler
+from triple_barrier.training_labels import TrainingLabels
+from triple_barrier.types import TradeSide
+
+
+class TestTrainingLabels:
+
+    @pytest.mark.parametrize("trade_side", [TradeSide.BUY, TradeSide.SELL])
+    def test_labels_match_trades(self, prepare_price_data, trade_params, trade_side):
+        dataset_labeler = DataSetLabeler(trade_params(prepare_price_data, trade_side=trade_side))
+        trades: pd.DataFrame = dataset_labeler.compute()
+
+        labels = dataset_labeler.labels()
+
+        assert labels.t0.dtype == np.dtype("datetime64[ns]")
+        np.testing.assert_array_equal(labels.t0, trades.index.to_numpy())
+        np.testing.assert_array_equal(labels.t1, pd.DatetimeIndex(trades[const.CLOSE_DATETIME]).to_numpy())
+        np.testing.assert_array_equal(labels.holding_bars, trades[const.BARS_HELD].to_numpy())
+        np.testing.assert_array_equal(labels.barrier_values(), trades[const.CLOSE_TYPE].to_numpy())
+        profit_sign = np.sign(trades[const.PROFIT].to_numpy())
+        resolved = np.isfinite(labels.ret)
+        np.testing.assert_array_equal(labels.bin[resolved], profit_sign[resolved])
+        assert (labels.bin[~resolved] == 0).all()
+
+    def test_same_labels_on_every_engine(self, prepare_price_data, trade_params):
+        dataset_labeler = DataSetLabeler(trade_params(prepare_price_data, trade_side=TradeSide.BUY))
+        dataset_labeler.compute()
+        expected = dataset_labeler.labels(min_return=0.001).to_frame()
+
+        dataset_labeler.compute(engine=const.ENGINE_VECTORIZED)
+        labels = dataset_labeler.labels(min_return=0.001).to_frame()
+
+        pd.testing.assert_frame_equal(expected, labels)
+
+    def test_min_return(self, prepare_price_data, trade_params):
+        dataset_labeler = DataSetLabeler(trade_params(prepare_price_data, trade_side=TradeSide.BUY))
+        dataset_labeler.compute(engine=const.ENGINE_VECTORIZED)
+
+        labels = dataset_labeler.labels(min_return=0.001)
+
+        assert (labels.bin[np.abs(labels.ret) <= 0.001] == 0).all()
+        assert (labels.bin[labels.ret > 0.001] == 1).all()
+        assert (labels.bin[labels.ret < -0.001] == -1).all()
+
+    def test_both_sides(self, prepare_price_data, trade_params):
+        df = prepare_price_data
+        both_labeler = DataSetLabeler(trade_params(df, trade_side=const.TRADE_SIDE_BOTH))
+        both_labeler.compute()
+        short_labeler = DataSetLabeler(trade_params(df, trade_side=TradeSide.SELL))
+        short_labeler.compute(engine=const.ENGINE_VECTORIZED)
+
+        labels = both_labeler.labels(trade_side=TradeSide.SELL).to_frame()
+
+        pd.testing.assert_frame_equal(labels, short_labeler.labels().to_frame())
+        assert isinstance(labels[const.CLOSE_TYPE].dtype, pd.CategoricalDtype)
+
+    def test_labels_before_compute(self, prepare_price_data, trade_params):
+        with pytest.raises(ValueError, match="computed"):
+            DataSetLabeler(trade_params(prepare_price_data)).labels()
+
+    def test_both_sides_without_trade_side(self, prepare_price_data, trade_params):
+        dataset_labeler = DataSetLabeler(trade_params(prepare_price_data, trade_side=const.TRADE_SIDE_BOTH))
+        dataset_labeler.compute(engine=const.ENGINE_VECTORIZED)
+
+        with pytest.raises(ValueError, match="trade side"):
+            dataset_labeler.labels()
+
+    def test_results_without_index(self, prepare_price_data, trade_params):
+        dataset_labeler = DataSetLabeler(trade_params(prepare_price_data))
+        dataset_labeler.compute(engine=const.ENGINE_VECTORIZED)
+        results = replace(dataset_labeler.results, index=None)
+
+        with pytest.raises(ValueError, match="index"):
+            TrainingLabels.from_results(results, np.ones(len(results)), TradeSide.BUY)
+
+    @pytest.mark.parametrize("min_return", [-0.001, np.array([0.001, 0.002])])
+    def test_invalid_min_return(self, prepare_price_data, trade_params, min_return):
+        dataset_labeler = DataSetLabeler(trade_params(prepare_price_data))
+        dataset_labeler.compute()
+
+        with pytest.raises(ValueError, match="minimum return"):
+            dataset_labeler.labels(min_return=min_return)
+
+    def test_missing_close_price_labeled_zero(self):
+        index = pd.date_range("2023-01-02 00:00:00", periods=2, freq="5min")
+        trades = pd.DataFrame(
+            {
+                const.OPEN: [1.1, 1.1],
+                # closed on a missing price
+                const.CLOSE_PRICE: [1.2, np.nan],
+                const.CLOSE_DATETIME: [index[1], index[1]],
+                const.CLOSE_TYPE: ["take-profit", "time-expiration"],
+                const.BARS_HELD: [1, 1],
+            },
+            index=index,
+        )
+
+        labels = TrainingLabels.from_trades(trades, TradeSide.BUY)
+
+        assert list(labels.bin) == [1, 0]
+        assert np.isnan(labels.ret[1])
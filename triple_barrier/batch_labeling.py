@@ -0,0 +1,463 @@
+"""
+Class that calculates the result of a batch of trades in bulk, working directly
+on the OHLC NumPy arrays instead of building one Labeler per trade.
+
+Every trade in the batch is described by positions (integer offsets) in the price
+arrays:
+
+- entry position: bar where the trade is opened
+- take profit and stop loss levels
+- optional trailing stop distance
+- time limit position: last bar the trade can be open
+
+The barriers are searched only inside the window [entry position, time limit position],
+one bar offset at a time for all the trades still open, so the cost depends on the
+number of trades and the trade horizon, not on the dataset length.
+
+The first hit follows the same rules as Labeler: the earliest barrier wins and ties
+are resolved in the order take profit, stop loss, trailing stop, time barrier, dynamic
+barrier. With an IntrabarResolver, the bars hitting both the take profit and the stop
+loss are looked up in the lower timeframe. The results are returned in a columnar
+TradeResults store.
+
+"""
+
+import numpy as np
+
+from triple_barrier import constants
+from triple_barrier.intrabar import IntrabarResolver
+from triple_barrier.market_data import next_signal_positions
+from triple_barrier.range_index import RangeExtremeIndex
+from triple_barrier.types import ORDER_TYPE_PRIORITY
+from triple_barrier.types import OrderType
+from triple_barrier.types import TradeResults
+from triple_barrier.types import TradeSide
+
+# cells of the window matrix of a block of trailing stop searches
+TRAILING_STOP_BLOCK_CELLS: int = 1 << 20
+
+
+class BatchLabeler:
+
+    def __init__(
+        self,
+        open_price: np.ndarray,
+        high_price: np.ndarray,
+        low_price: np.ndarray,
+        close_price: np.ndarray,
+        dynamic_exit: np.ndarray | None = None,
+        range_index: RangeExtremeIndex | None = None,
+        intrabar: IntrabarResolver | None = None,
+    ) -> None:
+        """
+        :param intrabar: lower timeframe prices to resolve the bars hitting both take profit and stop loss
+        """
+
+        self.open: np.ndarray = np.asarray(open_price, dtype=np.float64)
+        self.high: np.ndarray = np.asarray(high_price, dtype=np.float64)
+        self.low: np.ndarray = np.asarray(low_price, dtype=np.float64)
+        self.close: np.ndarray = np.asarray(close_price, dtype=np.float64)
+        self.dynamic_exit: np.ndarray | None = (
+            None if dynamic_exit is None else np.asarray(dynamic_exit, dtype=np.float64)
+        )
+        self.next_exit: np.ndarray | None = (
+            None if dynamic_exit is None else next_signal_positions(self.dynamic_exit)
+        )
+        self.range_index: RangeExtremeIndex | None = range_index
+        self.intrabar: IntrabarResolver | None = intrabar
+
+    def compute(
+        self,
+        entry_positions: np.ndarray,
+        take_profit: np.ndarray,
+        stop_loss: np.ndarray,
+        time_limit_positions: np.ndarray,
+        trade_side: TradeSide,
+        trailing_stop: np.ndarray | None = None,
+        entry_price: np.ndarray | None = None,
+    ) -> TradeResults:
+        """
+        Calculates the first barrier hit for every trade in the batch.
+
+        :param entry_positions: position of the opening bar of each trade
+        :param take_profit: take profit level of each trade
+        :param stop_loss: stop loss level of each trade
+        :param time_limit_positions: position of the time barrier of each trade
+        :param trade_side: side of the trades in the batch
+        :param trailing_stop: distance of the trailing stop of each trade to the running extreme,
+            in price units, None for no trailing stop
+        :param entry_price: price each trade was opened at, where its trailing stop starts. The open
+            price of the entry bar when None (it differs when trades open on the ask and close on the bid)
+        :return: TradeResults with every barrier hit and the first one to occur
+        """
+
+        entry_positions = np.asarray(entry_positions, dtype=np.int64)
+        take_profit = np.asarray(take_profit, dtype=np.float64)
+        stop_loss = np.asarray(stop_loss, dtype=np.float64)
+        time_limit_positions = np.asarray(time_limit_positions, dtype=np.int64)
+
+        if self.range_index is not None:
+            take_profit_position, stop_loss_position = self._range_index_crossings(
+                entry_positions, take_profit, stop_loss, time_limit_positions, trade_side
+            )
+        elif trade_side == TradeSide.BUY:
+            take_profit_position = _first_crossing(self.high, entry_positions, time_limit_positions, take_profit, above=True)
+            stop_loss_position = _first_crossing(self.low, entry_positions, time_limit_positions, stop_loss, above=False)
+        else:
+            take_profit_position = _first_crossing(self.low, entry_positions, time_limit_positions, take_profit, above=False)
+            stop_loss_position = _first_crossing(self.high, entry_positions, time_limit_positions, stop_loss, above=True)
+
+        return self._first_hit(
+            entry_positions, take_profit, stop_loss, take_profit_position, stop_loss_position, time_limit_positions,
+            trade_side,
+            self._trailing_stop_hits(entry_positions, time_limit_positions, trailing_stop, trade_side, entry_price),
+        )
+
+    def compute_both(
+        self,
+        entry_positions: np.ndarray,
+        buy_take_profit: np.ndarray,
+        buy_stop_loss: np.ndarray,
+        sell_take_profit: np.ndarray,
+        sell_stop_loss: np.ndarray,
+        time_limit_positions: np.ndarray,
+        trailing_stop: np.ndarray | None = None,
+        sell_labeler: "BatchLabeler | None" = None,
+        buy_entry_price: np.ndarray | None = None,
+        sell_entry_price: np.ndarray | None = None,
+    ) -> tuple[TradeResults, TradeResults]:
+        """
+        Calculates the first barrier hit of a long and a short trade on every entry, in one
+        traversal of every window: the high is scanned once for the long take profit and the
+        short stop loss, and the low for the long stop loss and the short take profit.
+        The trailing stop, if any, has the same distance on both sides.
+
+        :param sell_labeler: labeler with the prices the short trades are closed at, when they are not
+            the prices of this one (the long trades close on the bid and the short ones on the ask)
+        :param buy_entry_price: price the long trades were opened at, see compute
+        :param sell_entry_price: price the short trades were opened at, see compute
+        :return: TradeResults of the long trades and of the short trades
+        """
+
+        entry_positions = np.asarray(entry_positions, dtype=np.int64)
+        buy_take_profit = np.asarray(buy_take_profit, dtype=np.float64)
+        buy_stop_loss = np.asarray(buy_stop_loss, dtype=np.float64)
+        sell_take_profit = np.asarray(sell_take_profit, dtype=np.float64)
+        sell_stop_loss = np.asarray(sell_stop_loss, dtype=np.float64)
+        time_limit_positions = np.asarray(time_limit_positions, dtype=np.int64)
+        sell_labeler = self if sell_labeler is None else sell_labeler
+
+        if self.range_index is not None:
+            buy_take_profit_position, buy_stop_loss_position = self._range_index_crossings(
+                entry_positions, buy_take_profit, buy_stop_loss, time_limit_positions, TradeSide.BUY
+            )
+            sell_take_profit_position, sell_stop_loss_position = sell_labeler._range_index_crossings(
+                entry_positions, sell_take_profit, sell_stop_loss, time_limit_positions, TradeSide.SELL
+            )
+        else:
+            # with separate short prices, every level is read from its own price array in the same traversal
+            high_values = self.high if sell_labeler is self else [self.high, sell_labeler.high]
+            low_values = self.low if sell_labeler is self else [self.low, sell_labeler.low]
+            high_hits: np.ndarray = _first_crossings(
+                high_values, entry_positions, time_limit_positions,
+                np.column_stack([buy_take_profit, sell_stop_loss]), above=True,
+            )
+            low_hits: np.ndarray = _first_crossings(
+                low_values, entry_positions, time_limit_positions,
+                np.column_stack([buy_stop_loss, sell_take_profit]), above=False,
+            )
+            buy_take_profit_position, sell_stop_loss_position = high_hits[:, 0], high_hits[:, 1]
+            buy_stop_loss_position, sell_take_profit_position = low_hits[:, 0], low_hits[:, 1]
+
+        return (
+            self._first_hit(
+                entry_positions, buy_take_profit, buy_stop_loss,
+                buy_take_profit_position, buy_stop_loss_position, time_limit_positions, TradeSide.BUY,
+                self._trailing_stop_hits(
+                    entry_positions, time_limit_positions, trailing_stop, TradeSide.BUY, buy_entry_price
+                ),
+            ),
+            sell_labeler._first_hit(
+                entry_positions, sell_take_profit, sell_stop_loss,
+                sell_take_profit_position, sell_stop_loss_position, time_limit_positions, TradeSide.SELL,
+                sell_labeler._trailing_stop_hits(
+                    entry_positions, time_limit_positions, trailing_stop, TradeSide.SELL, sell_entry_price
+                ),
+            ),
+        )
+
+    def _first_hit(
+        self,
+        entry_positions: np.ndarray,
+        take_profit: np.ndarray,
+        stop_loss: np.ndarray,
+        take_profit_position: np.ndarray,
+        stop_loss_position: np.ndarray,
+        time_limit_positions: np.ndarray,
+        trade_side: TradeSide,
+        trailing_stop_hits: tuple[np.ndarray, np.ndarray] | None = None,
+    ) -> TradeResults:
+        """
+        Adds the time and dynamic barriers to the take profit, stop loss (and trailing stop) hits
+        and selects the first hit
+
+        :param trailing_stop_hits: hit positions and levels of the trailing stops, None for no trailing stop
+        """
+
+        dynamic_position: np.ndarray = np.full(len(entry_positions), constants.NO_HIT, dtype=np.int64)
+        if self.next_exit is not None:
+            dynamic_position = self.next_exit[entry_positions]
+            dynamic_position[dynamic_position > time_limit_positions] = constants.NO_HIT
+        # dynamic barrier closes on the open of the bar after the exit signal
+        dynamic_level: np.ndarray = np.where(
+            dynamic_position < len(self.open) - 1,
+            np.take(self.open, dynamic_position + 1, mode="clip"),
+            np.inf,
+        )
+        time_limit_level: np.ndarray = self.open[time_limit_positions]
+
+        trailing_stop_position: np.ndarray = np.full(len(entry_positions), constants.NO_HIT, dtype=np.int64)
+        trailing_stop_level: np.ndarray = np.full(len(entry_positions), np.nan)
+        if trailing_stop_hits is not None:
+            trailing_stop_position, trailing_stop_level = trailing_stop_hits
+
+        # rows in ORDER_TYPE_PRIORITY order
+        hit_positions: np.ndarray = np.vstack(
+            [take_profit_position, stop_loss_position, trailing_stop_position, time_limit_positions, dynamic_position]
+        )
+        # argmin returns the first minimum, so ties go to the barrier with the highest priority
+        exit_type: np.ndarray = np.argmin(hit_positions, axis=0).astype(np.int8)
+        if self.intrabar is not None:
+            self._resolve_intrabar(exit_type, take_profit, stop_loss, take_profit_position, stop_loss_position, trade_side)
+        exit_position: np.ndarray = hit_positions[exit_type, np.arange(len(entry_positions))]
+        exit_level: np.ndarray = np.choose(
+            exit_type, [take_profit, stop_loss, trailing_stop_level, time_limit_level, dynamic_level]
+        )
+
+        return TradeResults(
+            entry_position=entry_positions,
+            exit_position=exit_position,
+            exit_level=exit_level,
+            exit_type=exit_type,
+            take_profit_position=take_profit_position,
+            stop_loss_position=stop_loss_position,
+            time_limit_position=time_limit_positions,
+            take_profit_level=take_profit,
+            stop_loss_level=stop_loss,
+            time_limit_level=time_limit_level,
+            dynamic_position=dynamic_position if self.next_exit is not None else None,
+            dynamic_level=dynamic_level if self.next_exit is not None else None,
+            trailing_stop_position=trailing_stop_position if trailing_stop_hits is not None else None,
+            trailing_stop_level=trailing_stop_level if trailing_stop_hits is not None else None,
+        )
+
+    def _resolve_intrabar(
+        self,
+        exit_type: np.ndarray,
+        take_profit: np.ndarray,
+        stop_loss: np.ndarray,
+        take_profit_position: np.ndarray,
+        stop_loss_position: np.ndarray,
+        trade_side: TradeSide,
+    ) -> None:
+        """
+        Gives the first hit to the stop loss, in place, when the take profit won the tie only by
+        priority and the lower timeframe touches the stop loss first
+        """
+        take_profit_code: int = ORDER_TYPE_PRIORITY.index(OrderType.TAKE_PROFIT)
+        ambiguous: np.ndarray = np.flatnonzero(
+            (exit_type == take_profit_code) & (stop_loss_position == take_profit_position)
+        )
+        stop_loss_first: np.ndarray = self.intrabar.stop_loss_first(
+            take_profit_position[ambiguous], take_profit[ambiguous], stop_loss[ambiguous], trade_side
+        )
+        exit_type[ambiguous[stop_loss_first]] = ORDER_TYPE_PRIORITY.index(OrderType.STOP_LOSS)
+
+    def _trailing_stop_hits(
+        self,
+        entry_positions: np.ndarray,
+        time_limit_positions: np.ndarray,
+        trailing_stop: np.ndarray | None,
+        trade_side: TradeSide,
+        entry_price: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray] | None:
+        """
+        Trailing stop hit positions and levels, None when there is no trailing stop
+        """
+        if trailing_stop is None:
+            return None
+        return _first_trailing_stop_hits(
+            self.high,
+            self.low,
+            entry_positions,
+            time_limit_positions,
+            self.open[entry_positions] if entry_price is None else np.asarray(entry_price, dtype=np.float64),
+            np.asarray(trailing_stop, dtype=np.float64),
+            trade_side,
+        )
+
+    def _range_index_crossings(
+        self,
+        entry_positions: np.ndarray,
+        take_profit: np.ndarray,
+        stop_loss: np.ndarray,
+        time_limit_positions: np.ndarray,
+        trade_side: TradeSide,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Take profit and stop loss hit positions searched in the range index instead of bar by bar
+        """
+        if trade_side == TradeSide.BUY:
+            take_profit_position = self.range_index.first_high_at_or_above(entry_positions, take_profit, time_limit_positions)
+            stop_loss_position = self.range_index.first_low_at_or_below(entry_positions, stop_loss, time_limit_positions)
+        else:
+            take_profit_position = self.range_index.first_low_at_or_below(entry_positions, take_profit, time_limit_positions)
+            stop_loss_position = self.range_index.first_high_at_or_above(entry_positions, stop_loss, time_limit_positions)
+        return np.asarray(take_profit_position, dtype=np.int64), np.asarray(stop_loss_position, dtype=np.int64)
+
+
+def _first_crossing(
+    values: np.ndarray,
+    start: np.ndarray,
+    stop: np.ndarray,
+    level: np.ndarray,
+    above: bool,
+) -> np.ndarray:
+    """
+    Finds, for every window [start, stop], the first position where values crosses level.
+
+    :param values: price (or signal) array
+    :param start: first position of each window
+    :param stop: last position of each window (inclusive)
+    :param level: level to cross for each window
+    :param above: True to look for values >= level, False for values <= level
+    :return: array with the first crossing position, constants.NO_HIT if there is none
+    """
+    return _first_crossings(values, start, stop, level[:, None], above)[:, 0]
+
+
+def _first_crossings(
+    values: np.ndarray | list[np.ndarray],
+    start: np.ndarray,
+    stop: np.ndarray,
+    levels: np.ndarray,
+    above: bool,
+) -> np.ndarray:
+    """
+    Finds, for every window [start, stop] and every level of the window, the first position
+    where values crosses the level.
+
+    The search walks the windows one bar offset at a time, only for the windows
+    that have a level not crossed yet, so every bar is read once for all the levels.
+
+    :param values: price (or signal) array, or one array per level
+    :param start: first position of each window
+    :param stop: last position of each window (inclusive)
+    :param levels: levels to cross, one row per window
+    :param above: True to look for values >= level, False for values <= level
+    :return: first crossing position for each window and level, constants.NO_HIT if there is none
+    """
+
+    # one row per level, so every level is a contiguous array
+    hit: np.ndarray = np.full(levels.shape[::-1], constants.NO_HIT, dtype=np.int64)
+    # a crossed level (or a level out of its window) is replaced by a level that can not be crossed
+    done: float = np.inf if above else -np.inf
+
+    # state of the windows with a level not crossed yet
+    rows: np.ndarray = np.arange(len(start))
+    position: np.ndarray = np.array(start, dtype=np.int64)
+    stop = np.asarray(stop, dtype=np.int64)
+    pending: np.ndarray = np.array(levels.T, dtype=np.float64)
+    shared_values: bool = not isinstance(values, list)
+    while rows.size != 0:
+        in_window: np.ndarray = position <= stop
+        bar: np.ndarray = np.minimum(position, stop)
+        # the bar is read once for all the levels sharing the values, missing bars never cross
+        if shared_values:
+            price: np.ndarray = np.where(in_window, values[bar], np.nan)
+        for level in range(len(pending)):
+            if not shared_values:
+                price = np.where(in_window, values[level][bar], np.nan)
+            crossed: np.ndarray = price >= pending[level] if above else price <= pending[level]
+            if crossed.any():
+                hit[level, rows[crossed]] = position[crossed]
+                pending[level, crossed] = done
+        if not in_window.all():
+            pending[:, ~in_window] = done
+
+        active: np.ndarray = pending[0] != done
+        for level in range(1, len(pending)):
+            active |= pending[level] != done
+        # compacting copies the state, so it is only worth it when enough windows are finished
+        if np.count_nonzero(active) < 0.8 * len(rows):
+            rows, position, stop, pending = rows[active], position[active], stop[active], pending[:, active]
+        position = position + 1
+
+    return hit.T
+
+
+def _first_trailing_stop_hits(
+    high: np.ndarray,
+    low: np.ndarray,
+    start: np.ndarray,
+    stop: np.ndarray,
+    entry_price: np.ndarray,
+    trailing_stop: np.ndarray,
+    trade_side: TradeSide,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Finds, for every window [start, stop], the first position where the trailing stop is hit.
+
+    Same algorithm as the trade labeler: the stop level of a bar is the running extreme of the
+    previous bars (starting at the entry price, missing prices skipped) minus the trailing stop
+    for long trades, plus it for short ones. The windows are laid out as rows of a matrix, padded
+    to the longest window, and the running extremes are accumulated along the rows. The rows are
+    processed in blocks of at most TRAILING_STOP_BLOCK_CELLS cells to bound the memory used.
+
+    :param entry_price: price every trade was opened at
+    :param trailing_stop: distance of the stop to the running extreme, in price units
+    :return: first hit position for each window (constants.NO_HIT if there is none) and the
+        stop level at that position (NaN if there is none)
+    """
+
+    hit: np.ndarray = np.full(len(start), constants.NO_HIT, dtype=np.int64)
+    hit_level: np.ndarray = np.full(len(start), np.nan)
+    buy: bool = trade_side == TradeSide.BUY
+    # long stops follow the highs and are hit by the lows, short stops the other way round
+    trailed, tested = (high, low) if buy else (low, high)
+    accumulate = np.fmax.accumulate if buy else np.fmin.accumulate
+
+    start = np.asarray(start, dtype=np.int64)
+    stop = np.asarray(stop, dtype=np.int64)
+    rows: np.ndarray = np.flatnonzero(start <= stop)
+    reference_price: np.ndarray = np.array(np.broadcast_to(entry_price, len(start)), dtype=np.float64)
+    distance: np.ndarray = np.array(np.broadcast_to(trailing_stop, len(start)), dtype=np.float64)
+    if rows.size == 0:
+        return hit, hit_level
+
+    # longest windows first, so the first window of a block gives the padded width of the block
+    rows = rows[np.argsort(start[rows] - stop[rows], kind="stable")]
+    block_start: int = 0
+    while block_start < rows.size:
+        width: int = int(stop[rows[block_start]] - start[rows[block_start]]) + 1
+        block_size: int = max(1, TRAILING_STOP_BLOCK_CELLS // width)
+        block: np.ndarray = rows[block_start:block_start + block_size]
+        block_start += block.size
+
+        offset: np.ndarray = np.arange(width)
+        in_window: np.ndarray = offset <= (stop[block] - start[block])[:, None]
+        # the padding repeats the last bar of the window, it is masked out of the hits
+        position: np.ndarray = np.minimum(start[block, None] + offset, stop[block, None])
+        reference: np.ndarray = accumulate(
+            np.concatenate((reference_price[block, None], trailed[position[:, :-1]]), axis=1), axis=1
+        )
+        level: np.ndarray = reference - distance[block, None] if buy else reference + distance[block, None]
+        crossed: np.ndarray = (tested[position] <= level if buy else tested[position] >= level) & in_window
+
+        first: np.ndarray = crossed.argmax(axis=1)
+        block_rows: np.ndarray = np.arange(block.size)
+        found: np.ndarray = crossed[block_rows, first]
+        hit[block[found]] = position[block_rows, first][found]
+        hit_level[block[found]] = level[block_rows, first][found]
+
+    return hit, hit_level
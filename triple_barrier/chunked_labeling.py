@@ -0,0 +1,157 @@
+"""
+Out-of-core labeling of a price history split into partitions (for example monthly files).
+
+The partitions are read one at a time, in time order. The entries of each chunk whose
+time barrier (and the bar after it, where a dynamic exit closes) is inside the chunk are
+labeled with DataSetLabeler and the trades are sent to a sink. The bars from the first
+entry that could not be resolved yet are carried into the next chunk, so every trade is
+labeled exactly as if the whole history was in memory, and the peak memory is bounded by
+the partition size plus time_barrier_periods bars.
+
+"""
+
+import os
+from typing import Callable
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from triple_barrier import constants
+from triple_barrier.trading import DataSetLabeler
+from triple_barrier.trading import TradingParameters
+from triple_barrier.types import TradeSide
+
+
+class ParquetSink:
+    """
+    Sink that writes the trades of every chunk to its own Parquet file in a folder
+    """
+
+    def __init__(self, folder: str) -> None:
+        self.folder: str = folder
+        self.parts: int = 0
+        os.makedirs(folder, exist_ok=True)
+
+    def __call__(self, trades: pd.DataFrame) -> None:
+        trades.to_parquet(os.path.join(self.folder, f"part-{self.parts:05d}.parquet"))
+        self.parts += 1
+
+
+class ChunkedLabeler:
+
+    def __init__(
+        self,
+        stop_loss_width: float,
+        take_profit_width: float,
+        trade_side: TradeSide,
+        pip_decimal_position: int,
+        time_barrier_periods: int,
+        dynamic_exit: bool = False,
+        engine: str = constants.ENGINE_VECTORIZED,
+    ) -> None:
+        """
+        :param dynamic_exit: True to use the exit column of the partitions as dynamic exit
+        :param engine: DataSetLabeler engine used on every chunk
+        """
+
+        self.stop_loss_width: float = stop_loss_width
+        self.take_profit_width: float = take_profit_width
+        self.trade_side: TradeSide = trade_side
+        self.pip_decimal_position: int = pip_decimal_position
+        self.time_barrier_periods: int = time_barrier_periods
+        self.dynamic_exit: bool = dynamic_exit
+        self.engine: str = engine
+
+        self._columns: list[str] = [
+            constants.OPEN, constants.HIGH, constants.LOW, constants.CLOSE, constants.ENTRY
+        ]
+        if dynamic_exit:
+            self._columns.append(constants.EXIT)
+
+    def compute(
+        self,
+        partitions: Iterable[pd.DataFrame | str],
+        sink: Callable[[pd.DataFrame], None],
+        **read_options,
+    ) -> int:
+        """
+        Labels the entries of all the partitions
+
+        :param partitions: DataFrames or paths of Parquet (.parquet) or CSV files, in time order, with
+            the open, high, low, close, entry (and exit) columns and a DatetimeIndex
+        :param sink: called with the trades of every chunk, in entry order
+        :param read_options: options of pd.read_parquet or pd.read_csv for the paths
+        :return: number of trades labeled
+        """
+
+        carry: pd.DataFrame | None = None
+        labeled: int = 0
+
+        for partition in partitions:
+            chunk: pd.DataFrame = self._read(partition, read_options)
+            if carry is not None and len(carry.index) != 0:
+                if len(chunk.index) != 0 and chunk.index[0] <= carry.index[-1]:
+                    raise ValueError(f"Partition starting at {chunk.index[0]} is not after the previous one")
+                chunk = pd.concat([carry, chunk])
+
+            trades, carry = self._label_chunk(chunk, last_chunk=False)
+            if trades is not None:
+                sink(trades)
+                labeled += len(trades.index)
+
+        # after the last partition the carried trades close with the data available
+        if carry is not None and len(carry.index) != 0:
+            trades, _ = self._label_chunk(carry, last_chunk=True)
+            if trades is not None:
+                sink(trades)
+                labeled += len(trades.index)
+
+        return labeled
+
+    def _read(self, partition: pd.DataFrame | str, read_options: dict) -> pd.DataFrame:
+        if isinstance(partition, str):
+            if partition.endswith(".parquet"):
+                partition = pd.read_parquet(partition, **read_options)
+            else:
+                partition = pd.read_csv(partition, **read_options)
+        return partition[self._columns]
+
+    def _label_chunk(self, chunk: pd.DataFrame, last_chunk: bool) -> tuple[pd.DataFrame | None, pd.DataFrame]:
+        """
+        Labels the entries resolved inside the chunk
+
+        :return: trades (None if there are no resolved entries) and bars to carry into the next chunk
+        """
+
+        entry_positions: np.ndarray = np.flatnonzero(chunk[constants.ENTRY].to_numpy() == 1)
+        if last_chunk:
+            resolved: int = len(entry_positions)
+        else:
+            # the time barrier and the bar after it (dynamic exit close) must be in the chunk
+            resolved = int(np.searchsorted(
+                entry_positions, len(chunk.index) - self.time_barrier_periods - 1, side="left"
+            ))
+
+        carry_start: int = int(entry_positions[resolved]) if resolved < len(entry_positions) else len(chunk.index)
+        carry: pd.DataFrame = chunk.iloc[carry_start:]
+        if resolved == 0:
+            return None, carry
+
+        entry_mark: pd.Series = chunk[constants.ENTRY].copy()
+        entry_mark.iloc[carry_start:] = 0
+        trading_setup = TradingParameters(
+            open_price=chunk[constants.OPEN],
+            high_price=chunk[constants.HIGH],
+            low_price=chunk[constants.LOW],
+            close_price=chunk[constants.CLOSE],
+            entry_mark=entry_mark,
+            stop_loss_width=self.stop_loss_width,
+            take_profit_width=self.take_profit_width,
+            trade_side=self.trade_side,
+            pip_decimal_position=self.pip_decimal_position,
+            time_barrier_periods=self.time_barrier_periods,
+            dynamic_exit=chunk[constants.EXIT] if self.dynamic_exit else None,
+        )
+        trades: pd.DataFrame = DataSetLabeler(trading_setup).compute(engine=self.engine)
+        return trades, carry
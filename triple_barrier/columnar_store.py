@@ -0,0 +1,142 @@
+"""
+On-disk columnar layout for price data, read back with memory maps.
+
+A price file (CSV or Parquet) is converted once into a folder with:
+
+- one raw file per column: float64 values in native byte order
+- index.i8: the DatetimeIndex as int64 nanoseconds
+- meta.json: number of bars, column names, file names and dtypes
+
+Loading the folder maps the column files into memory instead of parsing them, so it takes
+milliseconds whatever the history length, and the data is read from the page cache on demand.
+The columns are returned as read-only Series views on the maps.
+
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+META_FILE: str = "meta.json"
+INDEX_FILE: str = "index.i8"
+LAYOUT_VERSION: int = 1
+
+
+class ColumnarPrices:
+
+    def __init__(self, folder: str) -> None:
+        """
+        :param folder: folder written by ColumnarPrices.from_frame or convert_price_file
+        """
+
+        self.folder: str = folder
+        with open(os.path.join(folder, META_FILE)) as meta_file:
+            self.meta: dict = json.load(meta_file)
+
+        if self.meta["version"] != LAYOUT_VERSION:
+            raise ValueError(f"Unsupported columnar layout version {self.meta['version']}")
+
+        self.length: int = self.meta["length"]
+        times: np.ndarray = self._map(self.meta["index"]["file"], np.int64)
+        self.index: pd.DatetimeIndex = pd.DatetimeIndex(
+            times.view("datetime64[ns]"), name=self.meta["index"]["name"], copy=False
+        )
+        if self.meta["index"]["tz"] is not None:
+            self.index = self.index.tz_localize("UTC").tz_convert(self.meta["index"]["tz"])
+
+        self._columns: dict = {
+            name: self._map(column["file"], np.dtype(column["dtype"]))
+            for name, column in self.meta["columns"].items()
+        }
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, folder: str) -> "ColumnarPrices":
+        """
+        Writes the columns of a DataFrame in the columnar layout
+
+        :param frame: prices with a DatetimeIndex, every column must be numeric
+        :param folder: destination folder, created if it does not exist
+        :return: ColumnarPrices mapped on the new folder
+        """
+
+        if not isinstance(frame.index, pd.DatetimeIndex):
+            raise ValueError("The prices must have a DatetimeIndex")
+
+        os.makedirs(folder, exist_ok=True)
+
+        index: pd.DatetimeIndex = frame.index
+        tz: str | None = None
+        if index.tz is not None:
+            tz = str(index.tz)
+            index = index.tz_convert("UTC").tz_localize(None)
+        index.as_unit("ns").asi8.tofile(os.path.join(folder, INDEX_FILE))
+
+        columns: dict = {}
+        for number, name in enumerate(frame.columns):
+            file_name: str = f"column-{number}.f8"
+            frame[name].to_numpy(dtype=np.float64).tofile(os.path.join(folder, file_name))
+            columns[str(name)] = {"file": file_name, "dtype": "float64"}
+
+        meta: dict = {
+            "version": LAYOUT_VERSION,
+            "length": len(frame.index),
+            "index": {"file": INDEX_FILE, "name": frame.index.name, "tz": tz},
+            "columns": columns,
+        }
+        # the header is written last, so a folder without it is an incomplete conversion
+        with open(os.path.join(folder, META_FILE), "w") as meta_file:
+            json.dump(meta, meta_file, indent=2)
+
+        return cls(folder)
+
+    def _map(self, file_name: str, dtype: np.dtype) -> np.ndarray:
+        if self.length == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self.folder, file_name), dtype=dtype, mode="r", shape=(self.length,))
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._columns)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._columns
+
+    def __getitem__(self, column: str) -> pd.Series:
+        """
+        Read-only Series view of a column
+        """
+        return pd.Series(self._columns[column], index=self.index, name=column, copy=False)
+
+    def __getattr__(self, column: str) -> pd.Series:
+        if column.startswith("_") or column not in self.__dict__.get("_columns", {}):
+            raise AttributeError(column)
+        return self[column]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        DataFrame with all the columns, backed by the memory maps
+        """
+        return pd.DataFrame({column: self[column] for column in self._columns}, copy=False)
+
+
+def convert_price_file(source: str, folder: str, **read_options) -> ColumnarPrices:
+    """
+    Converts a CSV or Parquet price file into the columnar layout
+
+    :param source: path of the price file, .parquet for Parquet, CSV otherwise
+    :param folder: destination folder
+    :param read_options: options of pd.read_csv or pd.read_parquet (index_col, names, parse_dates, columns ...)
+    :return: ColumnarPrices mapped on the new folder
+    """
+
+    if source.endswith(".parquet"):
+        frame: pd.DataFrame = pd.read_parquet(source, **read_options)
+    else:
+        frame = pd.read_csv(source, **read_options)
+
+    return ColumnarPrices.from_frame(frame, folder)
@@ -1,6 +1,8 @@
 import pathlib
 from datetime import datetime
 
+import numpy as np
+
 ROOT_FOLDER = str(pathlib.Path(__file__).parent.resolve().parent.resolve())
 
 OPEN = "open"
@@ -10,7 +12,11 @@ CLOSE = "close"
 ENTRY = "entry"
 EXIT = "exit"
 
-INFINITE_DATE = datetime(datetime.now().year + 1000, month=1, day=1)
+# datetime reported for a barrier that is not hit
+INFINITE_DATE = datetime(9999, month=12, day=31)
+
+# position, or int64 nanoseconds time, of a barrier that is not hit
+NO_HIT: int = np.iinfo(np.int64).max
 
 # region barrier
 STOP_LOSS: str = "stop-loss"
@@ -20,3 +26,21 @@ TIME_LIMIT: str = "time-limit"
 OPEN_PRICE: str = "open-price"
 OPEN_TIME: str = "open-time"
 # endregion
+
+# region labeling engines
+ENGINE_APPLY: str = "apply"
+ENGINE_VECTORIZED: str = "vectorized"
+# endregion
+
+# region trade sides
+# labels a long and a short trade on every entry
+TRADE_SIDE_BOTH: str = "both"
+# endregion
+
+# region trades columns
+CLOSE_PRICE: str = "close-price"
+CLOSE_DATETIME: str = "close-datetime"
+CLOSE_TYPE: str = "close-type"
+PROFIT: str = "profit"
+BARS_HELD: str = "bars-held"
+# endregion
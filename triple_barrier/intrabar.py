@@ -0,0 +1,98 @@
+"""
+Resolution of the bars where a trade touches both its take profit and its stop loss, using
+prices of a lower timeframe (for example 1 minute bars for a 5 minutes dataset).
+
+On the labeled timeframe there is no way to know which level was touched first inside such
+a bar, and the labelers give it to the take profit. The resolver looks the bar up in the
+lower timeframe and finds the first fine bar touching either level: when only the stop loss
+is touched there, the stop loss is the first hit. When both levels are touched by the same
+fine bar, or the bar has no fine prices, the take profit keeps the tie.
+
+The fine bars of every coarse bar are found through a positional index built once: coarse
+bar k spans the fine bars [fine_start[k], fine_start[k + 1]), the fine bars at or after its
+time and before the time of the next coarse bar. Only the fine bars of the ambiguous bars
+are read, so the cost grows with the number of ambiguous trades, not with the size of the
+lower timeframe.
+
+"""
+
+import numpy as np
+import pandas as pd
+
+from triple_barrier.types import TradeSide
+
+
+class IntrabarResolver:
+
+    def __init__(
+        self,
+        high_price: pd.Series,
+        low_price: pd.Series,
+        coarse_index: pd.DatetimeIndex,
+    ) -> None:
+        """
+        :param high_price: high prices of the lower timeframe, on a sorted DatetimeIndex
+        :param low_price: low prices of the lower timeframe, on the same index
+        :param coarse_index: index of the dataset being labeled
+        """
+
+        if not isinstance(high_price.index, pd.DatetimeIndex) or not high_price.index.is_monotonic_increasing:
+            raise ValueError("The lower timeframe prices must be on a sorted DatetimeIndex")
+
+        self.high: np.ndarray = np.asarray(high_price, dtype=np.float64)
+        self.low: np.ndarray = np.asarray(low_price, dtype=np.float64)
+        fine_times: np.ndarray = high_price.index.asi8
+        coarse_times: np.ndarray = coarse_index.asi8
+        # the last coarse bar is assumed to last as long as the one before it
+        coarse_end: int = coarse_times[-1] + (coarse_times[-1] - coarse_times[-2] if len(coarse_times) > 1 else 0)
+        # fine bars of coarse bar k: fine_start[k] to fine_start[k + 1] (excluded)
+        self.fine_start: np.ndarray = np.searchsorted(
+            fine_times, np.append(coarse_times, coarse_end), side="left"
+        )
+
+    def stop_loss_first(
+        self,
+        positions: np.ndarray,
+        take_profit: np.ndarray,
+        stop_loss: np.ndarray,
+        trade_side: TradeSide,
+    ) -> np.ndarray:
+        """
+        Finds the bars where the stop loss is touched before the take profit in the lower timeframe
+
+        :param positions: coarse bar where both levels are hit, one per trade
+        :param take_profit: take profit level of every trade
+        :param stop_loss: stop loss level of every trade
+        :param trade_side: side of the trades
+        :return: True for the trades whose stop loss is touched first
+        """
+
+        positions = np.asarray(positions, dtype=np.int64)
+        if len(positions) == 0:
+            return np.zeros(0, dtype=bool)
+
+        start: np.ndarray = self.fine_start[positions]
+        length: np.ndarray = self.fine_start[positions + 1] - start
+
+        # flat positions of the fine bars of every ambiguous trade
+        trade: np.ndarray = np.repeat(np.arange(len(positions)), length)
+        fine_position: np.ndarray = np.arange(len(trade)) - np.repeat(np.cumsum(length) - length, length)
+        fine_position += np.repeat(start, length)
+
+        high: np.ndarray = self.high[fine_position]
+        low: np.ndarray = self.low[fine_position]
+        if trade_side == TradeSide.BUY:
+            take_profit_touch: np.ndarray = high >= take_profit[trade]
+            stop_loss_touch: np.ndarray = low <= stop_loss[trade]
+        else:
+            take_profit_touch = low <= take_profit[trade]
+            stop_loss_touch = high >= stop_loss[trade]
+
+        # first fine bar touching either level, in the order of every trade's fine bars
+        touch: np.ndarray = np.flatnonzero(take_profit_touch | stop_loss_touch)
+        first_touches, first_of_trade = np.unique(trade[touch], return_index=True)
+        first_touch: np.ndarray = touch[first_of_trade]
+
+        stop_loss_first: np.ndarray = np.zeros(len(positions), dtype=bool)
+        stop_loss_first[first_touches] = stop_loss_touch[first_touch] & ~take_profit_touch[first_touch]
+        return stop_loss_first
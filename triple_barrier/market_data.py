@@ -0,0 +1,126 @@
+"""
+Positional view over the price series a trade is labeled on.
+
+The prices are stored as NumPy arrays that share the same DatetimeIndex, kept as int64
+nanoseconds. Datetimes (trade opening, time limit) are resolved to integer positions once,
+with a binary search on the times, and from there the barriers work on plain array slices
+by position instead of slicing the Series by datetime label.
+
+The dynamic exit signals are converted once into the position of the next exit signal
+at or after every bar, so the dynamic barrier hit of any trade is an O(1) lookup.
+
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from triple_barrier import constants
+from triple_barrier.types import to_nanoseconds
+
+
+class MarketData:
+
+    def __init__(
+        self,
+        open_price: pd.Series,
+        high_price: pd.Series | None = None,
+        low_price: pd.Series | None = None,
+        close_price: pd.Series | None = None,
+        dynamic_exit: pd.Series | None = None,
+    ) -> None:
+        """
+        :param open_price: open price series, its index is the index of the market data
+        :param high_price: high price series, aligned to open_price
+        :param low_price: low price series, aligned to open_price
+        :param close_price: close price series, aligned to open_price
+        :param dynamic_exit: dynamic exit signals, aligned to open_price
+        """
+
+        self.index: pd.DatetimeIndex = open_price.index
+        # bar times in int64 nanoseconds
+        self.times: np.ndarray = self.index.asi8
+        self.open: np.ndarray = self._to_array(open_price)
+        self.high: np.ndarray | None = self._to_array(high_price)
+        self.low: np.ndarray | None = self._to_array(low_price)
+        self.close: np.ndarray | None = self._to_array(close_price)
+        self.dynamic_exit: np.ndarray | None = self._to_array(dynamic_exit)
+        self._next_exit: np.ndarray | None = None
+
+    @staticmethod
+    def _to_array(series: pd.Series | None) -> np.ndarray | None:
+        if series is None:
+            return None
+        return series.to_numpy(dtype=np.float64)
+
+    @property
+    def next_exit(self) -> np.ndarray | None:
+        """
+        Position of the next exit signal at or after every bar, constants.NO_HIT when there is none.
+        Built on first use.
+        """
+        if self._next_exit is None and self.dynamic_exit is not None:
+            self._next_exit = next_signal_positions(self.dynamic_exit)
+        return self._next_exit
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def position(self, date_time: datetime | str) -> int:
+        """
+        Position of the first bar at or after date_time
+
+        :param date_time: datetime to locate
+        :return: position in the price arrays, len(self) if date_time is after the last bar
+        """
+        return self.time_position(to_nanoseconds(date_time))
+
+    def last_position(self, date_time: datetime | str | None) -> int:
+        """
+        Position of the last bar at or before date_time
+
+        :param date_time: datetime to locate, None for the last bar
+        :return: position in the price arrays, -1 if date_time is before the first bar
+        """
+        if date_time is None:
+            return len(self.index) - 1
+        return int(np.searchsorted(self.times, to_nanoseconds(date_time), side="right")) - 1
+
+    def time_position(self, time: int) -> int:
+        """
+        Position of the first bar at or after time
+
+        :param time: int64 nanoseconds time to locate
+        :return: position in the price arrays, len(self) if time is after the last bar
+        """
+        return int(np.searchsorted(self.times, time, side="left"))
+
+    def positions(self, date_times: pd.DatetimeIndex | np.ndarray) -> np.ndarray:
+        """
+        Positions of the first bar at or after each datetime
+        """
+        return self.index.searchsorted(date_times, side="left").astype(np.int64)
+
+    def time_limit_position(self, open_position: int | np.ndarray, periods: int) -> int | np.ndarray:
+        """
+        Position of the bar `periods` bars after the opening, limited to the last bar
+        """
+        return np.minimum(open_position + periods, len(self.index) - 1)
+
+    def datetime(self, position: int) -> pd.Timestamp:
+        return self.index[position]
+
+
+def next_signal_positions(signals: np.ndarray) -> np.ndarray:
+    """
+    Backward fill of the signal positions: for every bar, the position of the first
+    signal (value 1) at or after it.
+
+    :param signals: signal array, 1 where the signal is on
+    :return: array of positions, constants.NO_HIT after the last signal
+    """
+    positions: np.ndarray = np.where(
+        signals == 1, np.arange(len(signals), dtype=np.int64), constants.NO_HIT
+    )
+    return np.minimum.accumulate(positions[::-1])[::-1]
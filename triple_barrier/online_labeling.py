@@ -0,0 +1,265 @@
+"""
+Labeler for live bar feeds: the trades are labeled as the bars arrive, without the
+future series.
+
+Trades are registered with open_trade (the same Orders Labeler takes) and every new bar
+is passed to on_bar. The open trades are kept in heaps indexed by barrier level:
+
+- levels crossed when the high reaches them: take profit of long trades, stop loss of short ones
+- levels crossed when the low reaches them: stop loss of long trades, take profit of short ones
+- time limits
+
+so a bar only touches the trades whose take profit or stop loss is crossed or whose time
+limit expires, whatever the number of open trades or the length of the history. A dynamic
+exit signal closes every open trade.
+
+The hits follow the same rules as Labeler: the scan includes the opening bar, ties in the
+same bar are resolved in the order take profit, stop loss, time barrier, dynamic barrier,
+and the dynamic barrier closes on the open of the bar after the exit signal (so the trade
+is reported when that bar arrives).
+
+"""
+
+import heapq
+from collections import defaultdict
+from copy import copy
+from itertools import count
+from typing import Callable
+
+from triple_barrier import constants
+from triple_barrier.orders import BoxBuilder
+from triple_barrier.orders import Orders
+from triple_barrier.orders import OrdersBox
+from triple_barrier.types import ORDER_TYPE_PRIORITY
+from triple_barrier.types import OrderBoxHits
+from triple_barrier.types import OrderHit
+from triple_barrier.types import OrderType
+from triple_barrier.types import TradeSide
+from triple_barrier.types import to_nanoseconds
+
+
+class ClosedTrade:
+    """
+    Event emitted when a trade hits its first barrier
+    """
+
+    __slots__ = ("trade_id", "orders_box", "orders_hit")
+
+    def __init__(self, trade_id: int, orders_box: OrdersBox, orders_hit: OrderBoxHits) -> None:
+        self.trade_id: int = trade_id
+        self.orders_box: OrdersBox = orders_box
+        self.orders_hit: OrderBoxHits = orders_hit
+
+    def __str__(self):
+        return f"Trade {self.trade_id}\n{self.orders_hit}"
+
+
+class _OpenTrade:
+    __slots__ = ("trade_id", "orders_box", "time_limit")
+
+    def __init__(self, trade_id: int, orders_box: OrdersBox, time_limit: int) -> None:
+        self.trade_id: int = trade_id
+        self.orders_box: OrdersBox = orders_box
+        # int64 nanoseconds, constants.NO_HIT when the trade has no time limit
+        self.time_limit: int = time_limit
+
+
+class OnlineLabeler:
+
+    # stale heap entries (of trades already closed) allowed per open trade before compacting the heaps
+    STALE_ENTRIES_FACTOR: int = 4
+
+    def __init__(self, on_close: Callable[[ClosedTrade], None] | None = None) -> None:
+        """
+        :param on_close: optional callback called with every closed trade, in addition to
+            the closed trades returned by on_bar
+        """
+
+        self.on_close: Callable[[ClosedTrade], None] | None = on_close
+
+        self._trade_ids = count()
+        self._last_time: int | None = None
+        # (open time, trade id, orders) of the trades waiting for their opening bar
+        self._pending: list[tuple[int, int, Orders]] = []
+        self._open: dict[int, _OpenTrade] = {}
+        # (level, trade id, order type), hit when high >= level
+        self._high_levels: list[tuple[float, int, OrderType]] = []
+        # (-level, trade id, order type), hit when low <= level
+        self._low_levels: list[tuple[float, int, OrderType]] = []
+        # (time limit, trade id)
+        self._time_limits: list[tuple[int, int]] = []
+        # (trade, exit signal time) of the trades closing on the open of the next bar
+        self._dynamic_closing: list[tuple[_OpenTrade, int]] = []
+
+    @property
+    def open_trades(self) -> int:
+        """
+        Number of trades not closed yet, including the ones waiting for their opening bar
+        """
+        return len(self._pending) + len(self._open) + len(self._dynamic_closing)
+
+    def open_trade(self, orders: Orders) -> int:
+        """
+        Registers a trade. It opens on the first bar at or after orders.open_time, which must be
+        after the last bar received. When orders.open_price is None the trade opens at the open
+        price of that bar.
+
+        :param orders: trade setup, as for Labeler
+        :return: trade id, to match the ClosedTrade events
+        """
+
+        if orders.trailing_stop_width is not None:
+            raise ValueError("Trailing stops are not supported by the online labeler")
+
+        open_time: int = to_nanoseconds(orders.open_time)
+        if self._last_time is not None and open_time <= self._last_time:
+            raise ValueError(f"A trade can not be opened at {orders.open_time}, before the last bar received")
+
+        trade_id: int = next(self._trade_ids)
+        heapq.heappush(self._pending, (open_time, trade_id, orders))
+        return trade_id
+
+    def on_bar(
+        self,
+        timestamp,
+        open_price: float,
+        high_price: float,
+        low_price: float,
+        close_price: float,
+        exit_signal: float | None = None,
+    ) -> list[ClosedTrade]:
+        """
+        Processes a new bar
+
+        :param timestamp: bar datetime, after the previous bar
+        :param exit_signal: dynamic exit signal of the bar, 1 to close all the open trades
+        :return: trades closed by the bar: first the dynamic exits of the previous bar, then the
+            barrier hits of this bar in trade id order
+        """
+
+        time: int = to_nanoseconds(timestamp)
+        if self._last_time is not None and time <= self._last_time:
+            raise ValueError(f"Bar at {timestamp} received after a later bar")
+
+        closed: list[ClosedTrade] = self._close_dynamic(open_price)
+        self._last_time = time
+        self._activate(time, open_price)
+
+        hits: defaultdict[int, list[OrderType]] = defaultdict(list)
+        while self._high_levels and self._high_levels[0][0] <= high_price:
+            _, trade_id, order_type = heapq.heappop(self._high_levels)
+            if trade_id in self._open:
+                hits[trade_id].append(order_type)
+        while self._low_levels and -self._low_levels[0][0] >= low_price:
+            _, trade_id, order_type = heapq.heappop(self._low_levels)
+            if trade_id in self._open:
+                hits[trade_id].append(order_type)
+        while self._time_limits and self._time_limits[0][0] <= time:
+            _, trade_id = heapq.heappop(self._time_limits)
+            if trade_id in self._open:
+                hits[trade_id].append(OrderType.TIME_EXPIRATION)
+
+        for trade_id in sorted(hits):
+            trade: _OpenTrade = self._open.pop(trade_id)
+            order_types: list[OrderType] = hits[trade_id]
+            if OrderType.TIME_EXPIRATION in order_types and trade.time_limit < time:
+                # the time limit falls before this bar, so the bar is outside the trade window
+                order_type: OrderType = OrderType.TIME_EXPIRATION
+            else:
+                order_type = min(order_types, key=ORDER_TYPE_PRIORITY.index)
+            level: float = open_price
+            if order_type == OrderType.TAKE_PROFIT:
+                level = trade.orders_box.take_profit
+            elif order_type == OrderType.STOP_LOSS:
+                level = trade.orders_box.stop_loss
+            hit_time: int = trade.time_limit if order_type == OrderType.TIME_EXPIRATION else time
+            closed.append(self._closed_trade(trade, order_type, level, hit_time))
+
+        if exit_signal == 1:
+            self._dynamic_closing = [(trade, time) for trade in self._open.values()]
+            self._open = {}
+
+        self._compact()
+
+        if self.on_close is not None:
+            for closed_trade in closed:
+                self.on_close(closed_trade)
+
+        return closed
+
+    def _activate(self, time: int, open_price: float) -> None:
+        """
+        Opens the pending trades whose opening bar is the current one
+        """
+        while self._pending and self._pending[0][0] <= time:
+            _, trade_id, orders = heapq.heappop(self._pending)
+            if orders.open_price is None:
+                orders = copy(orders)
+                orders.open_price = open_price
+
+            orders_box: OrdersBox = BoxBuilder().build_multi_barrier_box(orders)
+            time_limit: int = constants.NO_HIT
+            if orders_box.time_limit is not None:
+                time_limit = to_nanoseconds(orders_box.time_limit)
+            self._open[trade_id] = _OpenTrade(trade_id, orders_box, time_limit)
+
+            if orders_box.trade_side == TradeSide.BUY:
+                heapq.heappush(self._high_levels, (orders_box.take_profit, trade_id, OrderType.TAKE_PROFIT))
+                heapq.heappush(self._low_levels, (-orders_box.stop_loss, trade_id, OrderType.STOP_LOSS))
+            else:
+                heapq.heappush(self._low_levels, (-orders_box.take_profit, trade_id, OrderType.TAKE_PROFIT))
+                heapq.heappush(self._high_levels, (orders_box.stop_loss, trade_id, OrderType.STOP_LOSS))
+            if time_limit != constants.NO_HIT:
+                heapq.heappush(self._time_limits, (time_limit, trade_id))
+
+    def _close_dynamic(self, open_price: float) -> list[ClosedTrade]:
+        """
+        Closes, on the open of the current bar, the trades with an exit signal on the previous bar
+        """
+        closed: list[ClosedTrade] = [
+            self._closed_trade(trade, OrderType.DYNAMIC, open_price, signal_time)
+            for trade, signal_time in self._dynamic_closing
+        ]
+        self._dynamic_closing = []
+        return closed
+
+    def _compact(self) -> None:
+        """
+        Drops the heap entries of closed trades when they outnumber the open trades
+        """
+        limit: int = self.STALE_ENTRIES_FACTOR * (len(self._open) + 1)
+        if len(self._high_levels) + len(self._low_levels) + len(self._time_limits) <= 3 * limit:
+            return
+        self._high_levels = [entry for entry in self._high_levels if entry[1] in self._open]
+        self._low_levels = [entry for entry in self._low_levels if entry[1] in self._open]
+        self._time_limits = [entry for entry in self._time_limits if entry[1] in self._open]
+        heapq.heapify(self._high_levels)
+        heapq.heapify(self._low_levels)
+        heapq.heapify(self._time_limits)
+
+    @staticmethod
+    def _closed_trade(trade: _OpenTrade, order_type: OrderType, level: float, hit_time: int) -> ClosedTrade:
+        """
+        Builds the closing event, the barriers not hit first are reported as not hit
+        """
+        orders_box: OrdersBox = trade.orders_box
+        barriers: dict[OrderType, OrderHit] = {
+            OrderType.TAKE_PROFIT: OrderHit(
+                level=orders_box.take_profit, order_type=OrderType.TAKE_PROFIT, hit_time=constants.NO_HIT
+            ),
+            OrderType.STOP_LOSS: OrderHit(
+                level=orders_box.stop_loss, order_type=OrderType.STOP_LOSS, hit_time=constants.NO_HIT
+            ),
+            OrderType.TIME_EXPIRATION: OrderHit(
+                order_type=OrderType.TIME_EXPIRATION, hit_time=trade.time_limit
+            ),
+            OrderType.DYNAMIC: OrderHit(order_type=OrderType.DYNAMIC, hit_time=constants.NO_HIT),
+        }
+        first_hit: OrderHit = barriers[order_type]
+        first_hit.level = level
+        first_hit.hit_time = hit_time
+
+        orders_hit: OrderBoxHits = OrderBoxHits()
+        orders_hit.barriers = list(barriers.values())
+        orders_hit.first_hit = first_hit
+        return ClosedTrade(trade.trade_id, orders_box, orders_hit)
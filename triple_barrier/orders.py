@@ -9,6 +9,7 @@ The central concept are the Orders a multipla barrier is made of:
 - Open: Order to open a trade
 - Take Profit: Closing order on take profit
 - Stop Loss: Closing order on stop loss
+- Trailing Stop: Closing order on a stop loss that follows the price
 - Time Barrier: Closing order after a fix number of periods
 - Dynamic Barrier: Closing order that depends on a condition
 
@@ -36,6 +37,8 @@ class Orders:
         self.take_profit_level: float | None = None
         self.stop_loss_width: float | None = None
         self.stop_loss_level: float | None = None
+        # distance in pips from the best price since the opening, None for no trailing stop
+        self.trailing_stop_width: float | None = None
         self.time_limit: str | None = None
         self.pip_decimal_position: int | None = None
 
@@ -46,6 +49,7 @@ class Orders:
         trade side: {self.trade_side.name}
         stop loss : {self.stop_loss_level if self.stop_loss_level is not None else self.stop_loss_width}
         take profit : {self.take_profit_level if self.take_profit_level is not None else self.take_profit_width}
+        trailing stop : {self.trailing_stop_width}
         time limit : {self.time_limit}
         pip position : {self.pip_decimal_position}
         """
@@ -65,7 +69,8 @@ class OrdersBox:
                  stop_loss: float,
                  take_profit: float,
                  time_limit: datetime,
-                 pip_decimal_position: int
+                 pip_decimal_position: int,
+                 trailing_stop: float | None = None,
                  ):
         self.open_datetime: datetime = open_datetime
         self.open_price: float = open_price
@@ -74,6 +79,8 @@ class OrdersBox:
         self.trade_side: TradeSide = trade_side
         self.time_limit: datetime = time_limit
         self.pip_decimal_position = pip_decimal_position
+        # distance in price units from the best price since the opening, None for no trailing stop
+        self.trailing_stop: float | None = trailing_stop
 
     def __str__(self):
         output: str = f"""
@@ -81,6 +88,7 @@ class OrdersBox:
         Open price: {self.open_price}
         Stop loss: {self.stop_loss}
         Take profit : {self.take_profit}
+        Trailing stop: {self.trailing_stop}
         Trade side: {self.trade_side}
         Time limit: {self.time_limit}
         Pip position: {self.pip_decimal_position}
@@ -106,6 +114,7 @@ class BoxBuilder:
         self._trade_side: TradeSide | None = None
         self._time_limit: datetime | None = None
         self._pip_decimal_position: int | None = None
+        self._trailing_stop: float | None = None
 
     def build_multi_barrier_box(self,
                                 orders: Orders
@@ -132,6 +141,8 @@ class BoxBuilder:
                        orders.stop_loss_width,
                        orders.stop_loss_level,
                        orders.pip_decimal_position)
+        self.trailing_stop(orders.trailing_stop_width,
+                           orders.pip_decimal_position)
         self.time_limit(orders.time_limit)
         self.pip_decimal_position(orders.pip_decimal_position)
         return OrdersBox(self._trade_side,
@@ -140,7 +151,8 @@ class BoxBuilder:
                          self._stop_loss,
                          self._take_profit,
                          self._time_limit,
-                         self._pip_decimal_position)
+                         self._pip_decimal_position,
+                         self._trailing_stop)
 
     # TODO: make these methods private
     def open_date_time(self, open_date_time: str):
@@ -187,6 +199,17 @@ class BoxBuilder:
         else:
             raise ValueError("You need to pass take_level or take_profit_width as parameter")
 
+    def trailing_stop(self,
+                      trailing_stop_width: float = None,
+                      pip_decimal_position: float = None):
+
+        if trailing_stop_width is None:
+            self._trailing_stop = None
+        elif trailing_stop_width <= 0:
+            raise ValueError("trailing_stop_width must be positive")
+        else:
+            self._trailing_stop = trailing_stop_width * (10 ** -pip_decimal_position)
+
     def trade_side(self,
                    trade_side: TradeSide):
         self._trade_side = trade_side
@@ -0,0 +1,217 @@
+"""
+Labels the same entries for every combination of a grid of stop loss widths, take profit
+widths and time barrier periods.
+
+The price path of every entry is read once, for the longest time barrier in the grid, and
+turned into running extremes: the maximum high and the minimum low from the entry bar to
+every bar after it. As the running extremes never go back, the first bar a take profit or
+stop loss level is reached is the number of running extremes that have not reached it, and
+a shorter time barrier only discards the hits after it. So every width costs one comparison
+against the paths, and the combinations of the grid are a broadcast of the hits per width:
+a grid of 10 x 10 x 10 costs about 20 passes over the paths, not 1000 labelings.
+
+The first hit follows the same rules as Labeler and BatchLabeler. Memory usage is about
+two floats per entry and bar of the longest time barrier, plus the results cube.
+
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from triple_barrier import constants
+from triple_barrier.market_data import MarketData
+from triple_barrier.types import ORDER_TYPE_PRIORITY
+from triple_barrier.types import TradeSide
+
+
+@dataclass
+class SweepResults:
+    """
+    Results cube of a parameter sweep. The cube arrays have one axis per entry, stop loss width,
+    take profit width and time barrier periods, in that order. exit_type is the position of the
+    first hit barrier in ORDER_TYPE_PRIORITY.
+    """
+
+    stop_loss_widths: np.ndarray
+    take_profit_widths: np.ndarray
+    time_barrier_periods: np.ndarray
+    entry_position: np.ndarray
+    exit_type: np.ndarray
+    bars_held: np.ndarray
+    exit_level: np.ndarray
+    profit: np.ndarray
+    index: pd.DatetimeIndex | None = None
+
+    def exit_type_values(self) -> np.ndarray:
+        """
+        Translates the exit type codes into OrderType values
+        """
+        values: np.ndarray = np.array([order_type.value for order_type in ORDER_TYPE_PRIORITY], dtype=object)
+        return values[self.exit_type]
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Statistics of every combination of the grid: number of trades per close type, total and mean
+        profit, share of trades with profit and mean bars held.
+        """
+        grid: pd.MultiIndex = pd.MultiIndex.from_product(
+            [self.stop_loss_widths, self.take_profit_widths, self.time_barrier_periods],
+            names=["stop-loss-width", "take-profit-width", "time-barrier-periods"],
+        )
+        trades: int = len(self.entry_position)
+        columns: dict = {"trades": np.full(len(grid), trades)}
+        for code, order_type in enumerate(ORDER_TYPE_PRIORITY):
+            columns[order_type.value] = (self.exit_type == code).sum(axis=0).ravel()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            columns[constants.PROFIT] = self.profit.sum(axis=0).ravel()
+            columns["mean-profit"] = columns[constants.PROFIT] / trades
+            columns["win-rate"] = (self.profit > 0).sum(axis=0).ravel() / trades
+            columns["mean-bars-held"] = self.bars_held.sum(axis=0).ravel() / trades
+        return pd.DataFrame(columns, index=grid)
+
+
+class ParameterSweep:
+
+    def __init__(
+        self,
+        market_data: MarketData,
+        entry_positions: np.ndarray,
+        trade_side: TradeSide,
+        pip_decimal_position: int,
+    ) -> None:
+        """
+        :param market_data: prices (and dynamic exit) of the dataset
+        :param entry_positions: positions of the opening bars
+        :param trade_side: side of the trades
+        :param pip_decimal_position: pip position of the instrument
+        """
+
+        self.market_data: MarketData = market_data
+        self.entry_positions: np.ndarray = np.asarray(entry_positions, dtype=np.int64)
+        self.trade_side: TradeSide = trade_side
+        self.pip_decimal_position: int = pip_decimal_position
+
+    def compute(
+        self,
+        stop_loss_widths,
+        take_profit_widths,
+        time_barrier_periods,
+    ) -> SweepResults:
+        """
+        Labels the entries for every combination of the grid
+
+        :param stop_loss_widths: stop loss widths in pips
+        :param take_profit_widths: take profit widths in pips
+        :param time_barrier_periods: time barrier periods
+        :return: SweepResults with the results cube
+        """
+
+        stop_loss_widths = np.atleast_1d(np.asarray(stop_loss_widths, dtype=np.float64))
+        take_profit_widths = np.atleast_1d(np.asarray(take_profit_widths, dtype=np.float64))
+        time_barrier_periods = np.atleast_1d(np.asarray(time_barrier_periods, dtype=np.int64))
+
+        market_data: MarketData = self.market_data
+        last_position: int = len(market_data) - 1
+        entries: np.ndarray = self.entry_positions
+        side: int = self.trade_side.value
+        pip_factor: float = 10 ** -self.pip_decimal_position
+        open_price: np.ndarray = market_data.open[entries]
+
+        # running extremes from the entry bar, missing prices never hit a level
+        window: np.ndarray = np.minimum(
+            entries[:, None] + np.arange(time_barrier_periods.max() + 1), last_position
+        )
+        high_path: np.ndarray = np.maximum.accumulate(
+            np.where(np.isnan(market_data.high), -np.inf, market_data.high)[window], axis=1
+        )
+        low_path: np.ndarray = np.minimum.accumulate(
+            np.where(np.isnan(market_data.low), np.inf, market_data.low)[window], axis=1
+        )
+
+        take_profit_level: np.ndarray = open_price[:, None] + side * take_profit_widths * pip_factor
+        stop_loss_level: np.ndarray = open_price[:, None] - side * stop_loss_widths * pip_factor
+        if self.trade_side == TradeSide.BUY:
+            take_profit_offset = _first_offsets(high_path, take_profit_level, above=True)
+            stop_loss_offset = _first_offsets(low_path, stop_loss_level, above=False)
+        else:
+            take_profit_offset = _first_offsets(low_path, take_profit_level, above=False)
+            stop_loss_offset = _first_offsets(high_path, stop_loss_level, above=True)
+
+        time_limit_offset: np.ndarray = np.minimum(
+            time_barrier_periods[None, :], last_position - entries[:, None]
+        )
+        time_limit_level: np.ndarray = market_data.open[entries[:, None] + time_limit_offset]
+
+        dynamic_offset: np.ndarray = np.full(len(entries), constants.NO_HIT, dtype=np.int64)
+        dynamic_level: np.ndarray = np.full(len(entries), np.inf)
+        if market_data.next_exit is not None:
+            next_exit: np.ndarray = market_data.next_exit[entries]
+            hit: np.ndarray = next_exit != constants.NO_HIT
+            dynamic_offset[hit] = next_exit[hit] - entries[hit]
+            # dynamic barrier closes on the open of the bar after the exit signal
+            closed: np.ndarray = hit & (next_exit < last_position)
+            dynamic_level[closed] = market_data.open[next_exit[closed] + 1]
+
+        # cube axes: entry, stop loss, take profit, time barrier
+        time_limit_cube: np.ndarray = time_limit_offset[:, None, None, :]
+        # barriers in ORDER_TYPE_PRIORITY order, the sweep has no trailing stop
+        hit_offsets: list[np.ndarray] = [
+            take_profit_offset[:, None, :, None],
+            stop_loss_offset[:, :, None, None],
+            np.full((1, 1, 1, 1), constants.NO_HIT, dtype=np.int64),
+            time_limit_cube,
+            dynamic_offset[:, None, None, None],
+        ]
+        # hits after the time barrier are not hits
+        hit_offsets = [
+            offset if offset is time_limit_cube else np.where(offset <= time_limit_cube, offset, constants.NO_HIT)
+            for offset in hit_offsets
+        ]
+        stacked: np.ndarray = np.stack(np.broadcast_arrays(*hit_offsets))
+        # argmin returns the first minimum, so ties go to the barrier with the highest priority
+        exit_type: np.ndarray = np.argmin(stacked, axis=0).astype(np.int8)
+        bars_held: np.ndarray = np.take_along_axis(stacked, exit_type[None].astype(np.intp), axis=0)[0]
+        exit_level: np.ndarray = np.choose(
+            exit_type,
+            [
+                take_profit_level[:, None, :, None],
+                stop_loss_level[:, :, None, None],
+                np.full((1, 1, 1, 1), np.nan),
+                time_limit_level[:, None, None, :],
+                dynamic_level[:, None, None, None],
+            ],
+        )
+        profit: np.ndarray = np.round(
+            side * (exit_level - open_price[:, None, None, None]) * 10**self.pip_decimal_position, 2
+        )
+
+        return SweepResults(
+            stop_loss_widths=stop_loss_widths,
+            take_profit_widths=take_profit_widths,
+            time_barrier_periods=time_barrier_periods,
+            entry_position=entries,
+            exit_type=exit_type,
+            bars_held=bars_held,
+            exit_level=exit_level,
+            profit=profit,
+            index=market_data.index,
+        )
+
+
+def _first_offsets(path: np.ndarray, levels: np.ndarray, above: bool) -> np.ndarray:
+    """
+    First offset where the running extremes reach each level
+
+    :param path: running maximum (above=True) or minimum (above=False) of every entry, one row per entry
+    :param levels: levels of every entry, one column per width
+    :return: offsets, one column per width, constants.NO_HIT when the level is not reached
+    """
+    offsets: np.ndarray = np.empty(levels.shape, dtype=np.int64)
+    for column in range(levels.shape[1]):
+        level: np.ndarray = levels[:, column, None]
+        # the paths are monotonic, so the bars that did not reach the level come first
+        offsets[:, column] = (path < level).sum(axis=1) if above else (path > level).sum(axis=1)
+    offsets[offsets == path.shape[1]] = constants.NO_HIT
+    return offsets
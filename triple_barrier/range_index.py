@@ -0,0 +1,130 @@
+"""
+Range extreme index (sparse table) over the high and low prices of a dataset.
+
+The index is built once per dataset and answers, for any window of bars:
+
+- the maximum high and the minimum low in O(1)
+- the first bar where the high reaches a level (take profit of a long trade, stop loss of a short one)
+  or the low reaches a level (stop loss of a long trade, take profit of a short one) in O(log n),
+  by binary search over the range extremes instead of a linear scan of the prices
+
+Queries accept scalars or arrays, so the same index can be shared by every TakeProfit and StopLoss
+evaluation, and by thousands of trades and parameter sets labeled in bulk.
+
+Windows are given as positions in the price arrays (see MarketData to resolve datetimes to positions).
+
+Memory usage is about n * log2(n) floats for each price.
+
+"""
+
+import numpy as np
+import pandas as pd
+
+from triple_barrier import constants
+
+
+class RangeExtremeIndex:
+
+    def __init__(
+        self,
+        high_price: pd.Series | np.ndarray,
+        low_price: pd.Series | np.ndarray,
+    ) -> None:
+
+        self.size: int = len(high_price)
+
+        # missing prices never hit a level
+        high: np.ndarray = np.asarray(high_price, dtype=np.float64)
+        low: np.ndarray = np.asarray(low_price, dtype=np.float64)
+        self._max_high: list[np.ndarray] = self._build_table(
+            np.where(np.isnan(high), -np.inf, high), np.maximum
+        )
+        self._min_low: list[np.ndarray] = self._build_table(
+            np.where(np.isnan(low), np.inf, low), np.minimum
+        )
+
+    @staticmethod
+    def _build_table(values: np.ndarray, reduce: np.ufunc) -> list[np.ndarray]:
+        """
+        Level k of the table holds the extreme of the 2**k bars starting at each position
+        """
+        table: list[np.ndarray] = [values]
+        width: int = 1
+        while 2 * width <= len(values):
+            previous: np.ndarray = table[-1]
+            table.append(reduce(previous[:-width], previous[width:]))
+            width *= 2
+        return table
+
+    def max_high(self, start, stop):
+        """
+        Maximum high between start and stop (both inclusive)
+        """
+        return self._range_query(self._max_high, np.maximum, start, stop)
+
+    def min_low(self, start, stop):
+        """
+        Minimum low between start and stop (both inclusive)
+        """
+        return self._range_query(self._min_low, np.minimum, start, stop)
+
+    def first_high_at_or_above(self, start, level, stop=None):
+        """
+        First position between start and stop where high >= level
+
+        :param start: first position of the window (scalar or array)
+        :param level: level to reach (scalar or array)
+        :param stop: last position of the window (inclusive), None for the last bar
+        :return: hit position, constants.NO_HIT when the level is not reached
+        """
+        return self._first_hit(self._max_high, start, level, stop, above=True)
+
+    def first_low_at_or_below(self, start, level, stop=None):
+        """
+        First position between start and stop where low <= level
+
+        :param start: first position of the window (scalar or array)
+        :param level: level to reach (scalar or array)
+        :param stop: last position of the window (inclusive), None for the last bar
+        :return: hit position, constants.NO_HIT when the level is not reached
+        """
+        return self._first_hit(self._min_low, start, level, stop, above=False)
+
+    def _range_query(self, table: list[np.ndarray], reduce: np.ufunc, start, stop):
+        start, stop = np.broadcast_arrays(
+            np.asarray(start, dtype=np.int64), np.asarray(stop, dtype=np.int64)
+        )
+        # two overlapping blocks of the widest level that fits in the window cover it
+        level: np.ndarray = np.floor(np.log2(np.maximum(stop - start + 1, 1))).astype(np.int64)
+        result: np.ndarray = np.empty(start.shape)
+        for k in np.unique(level):
+            mask: np.ndarray = level == k
+            width: int = 1 << int(k)
+            result[mask] = reduce(table[k][start[mask]], table[k][stop[mask] - width + 1])
+        return float(result) if result.ndim == 0 else result
+
+    def _first_hit(self, table: list[np.ndarray], start, level, stop, above: bool):
+        if self.size == 0:
+            return np.full(np.shape(start), constants.NO_HIT)[()]
+        if stop is None:
+            stop = self.size - 1
+        start, level, stop = np.broadcast_arrays(
+            np.asarray(start, dtype=np.int64),
+            np.asarray(level, dtype=np.float64),
+            np.minimum(np.asarray(stop, dtype=np.int64), self.size - 1),
+        )
+        position: np.ndarray = start.copy()
+
+        # skip, from the widest to the narrowest, the blocks inside the window that can not hold a hit
+        for k in range(len(table) - 1, -1, -1):
+            width: int = 1 << k
+            inside: np.ndarray = position + width - 1 <= stop
+            extreme: np.ndarray = table[k][np.where(inside, position, 0)]
+            no_hit: np.ndarray = extreme < level if above else extreme > level
+            position = np.where(inside & no_hit, position + width, position)
+
+        in_window: np.ndarray = position <= stop
+        leaf: np.ndarray = table[0][np.where(in_window, position, 0)]
+        hit: np.ndarray = in_window & ((leaf >= level) if above else (leaf <= level))
+        result: np.ndarray = np.where(hit, position, constants.NO_HIT)
+        return int(result) if result.ndim == 0 else result
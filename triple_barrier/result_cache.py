@@ -0,0 +1,194 @@
+"""
+Content-addressed cache of labeled trades on disk.
+
+The key of a computation is a hash of everything the trades depend on: the engine and every
+field of the TradingParameters, with the price, entry and exit Series hashed from their raw
+values and index. Identical inputs give the same key whatever the objects holding them, and
+any change in the prices or the trade setup gives a new one, so entries never go stale.
+
+Every entry is one file in the cache folder, named after its key, with the trades DataFrame
+and the columnar results (without the dataset index, which is part of the key). The folder is
+bounded in size: when a new entry goes over the limit, the least recently used entries are
+removed. Reading an entry marks it as used (the file modification time is updated), and an
+unreadable entry is removed.
+
+The entries are pickled, so the cache folder must not be writable by untrusted users.
+
+"""
+
+from dataclasses import fields
+import hashlib
+import os
+import pickle
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from triple_barrier.types import TradeResults
+
+CACHE_VERSION: int = 1
+ENTRY_SUFFIX: str = ".pkl"
+
+
+class ResultCache:
+
+    def __init__(self, folder: str, max_bytes: int = 1 << 30) -> None:
+        """
+        :param folder: cache folder, created if it does not exist
+        :param max_bytes: size limit of the cache folder, the least recently used entries are removed above it
+        """
+
+        if max_bytes <= 0:
+            raise ValueError(f"The cache size must be positive, got {max_bytes}")
+
+        self.folder: str = folder
+        self.max_bytes: int = max_bytes
+        os.makedirs(folder, exist_ok=True)
+
+    def key(self, trading_setup, engine: str) -> str:
+        """
+        Hash of a computation inputs
+
+        :param trading_setup: TradingParameters of the computation
+        :param engine: labeling engine
+        :return: hexadecimal key
+        """
+
+        # sha256 runs on the CPU hash instructions, faster than blake2b on most machines
+        digest = hashlib.sha256()
+        # the Series of a dataset share their index, it is hashed once
+        index_digests: dict[int, bytes] = {}
+        _update(digest, CACHE_VERSION, index_digests)
+        _update(digest, engine, index_digests)
+        for field in fields(trading_setup):
+            digest.update(field.name.encode())
+            _update(digest, getattr(trading_setup, field.name), index_digests)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> tuple[pd.DataFrame, TradeResults | dict | None] | None:
+        """
+        Trades and results stored under a key, None when there are none
+        """
+
+        path: str = self._path(key)
+        try:
+            with open(path, "rb") as entry_file:
+                entry: tuple = pickle.load(entry_file)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # unreadable entry, for example written by another version of the library
+            self._remove(path)
+            return None
+
+        os.utime(path)
+        return entry
+
+    def put(self, key: str, trades: pd.DataFrame, results: TradeResults | dict | None) -> None:
+        """
+        Stores the trades and results of a computation, then evicts the least recently used
+        entries above the size limit
+        """
+
+        # written to a temporary file first, so a reader never sees a partial entry
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.folder, suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as entry_file:
+            pickle.dump((trades, results), entry_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, self._path(key))
+
+        self._evict()
+
+    def clear(self) -> None:
+        """
+        Removes all the entries
+        """
+        for path, _, _ in self._entries():
+            self._remove(path)
+
+    @property
+    def size(self) -> int:
+        """
+        Size in bytes of the stored entries
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.folder, f"{key}{ENTRY_SUFFIX}")
+
+    def _entries(self) -> list[tuple[str, int, int]]:
+        """
+        Path, size and last use time of every entry
+        """
+        entries: list[tuple[str, int, int]] = []
+        with os.scandir(self.folder) as scan:
+            for dir_entry in scan:
+                if not dir_entry.name.endswith(ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = dir_entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((dir_entry.path, stat.st_size, stat.st_mtime_ns))
+        return entries
+
+    def _evict(self) -> None:
+        entries: list[tuple[str, int, int]] = sorted(self._entries(), key=lambda entry: entry[2])
+        size: int = sum(entry_size for _, entry_size, _ in entries)
+        for path, entry_size, _ in entries:
+            if size <= self.max_bytes:
+                break
+            self._remove(path)
+            size -= entry_size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _update(digest, value, index_digests: dict[int, bytes]) -> None:
+    """
+    Adds a value to the hash, tagged with its kind so different kinds of values never collide
+
+    :param index_digests: digests of the indexes already hashed, by object id
+    """
+
+    if value is None:
+        digest.update(b"none")
+    elif isinstance(value, pd.DataFrame):
+        digest.update(b"frame")
+        _update(digest, value.index, index_digests)
+        for column in value.columns:
+            _update(digest, str(column), index_digests)
+            _update(digest, value[column].to_numpy(), index_digests)
+    elif isinstance(value, pd.Series):
+        digest.update(b"series")
+        _update(digest, value.index, index_digests)
+        _update(digest, value.to_numpy(), index_digests)
+    elif isinstance(value, pd.Index):
+        if id(value) not in index_digests:
+            index_digest = hashlib.sha256(b"index")
+            values = value
+            if isinstance(value, pd.DatetimeIndex):
+                index_digest.update(str(value.tz).encode())
+                values = value.as_unit("ns").asi8
+            _update(index_digest, np.asarray(values), index_digests)
+            index_digests[id(value)] = index_digest.digest()
+        digest.update(index_digests[id(value)])
+    elif isinstance(value, np.ndarray):
+        digest.update(f"array{value.dtype.str}{value.shape}".encode())
+        if value.dtype.hasobject:
+            digest.update(pd.util.hash_array(value.ravel()).tobytes())
+        else:
+            digest.update(np.ascontiguousarray(value).reshape(-1).view(np.uint8).data)
+    else:
+        digest.update(f"{type(value).__name__}:{value!r}".encode())
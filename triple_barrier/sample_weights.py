@@ -0,0 +1,108 @@
+"""
+Sample weights of overlapping labels (López de Prado, Advances in Financial Machine
+Learning, chapter 4).
+
+Every label spans the bars from its entry to its first barrier hit, both included. The
+concurrency of a bar is the number of labels spanning it, the average uniqueness of a
+label is the mean of 1 / concurrency over its span, and the return attribution of a label
+is the absolute sum of the bar log returns over its span, each one divided by the
+concurrency of the bar, scaled so the weights add up to the number of labels.
+
+All of them come from cumulative sums: the concurrency is the running sum of +1 at every
+span start and -1 after every span end, and the sum over any span is the difference of
+two prefix sums, so the cost is O(N + M) for N bars and M labels instead of a pass over
+the bars of every label.
+
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class SampleWeights:
+    """
+    concurrency has one element per bar, uniqueness and return_attribution one per label
+    """
+
+    concurrency: np.ndarray
+    uniqueness: np.ndarray
+    return_attribution: np.ndarray
+    index: pd.DatetimeIndex | None = None
+
+    @classmethod
+    def from_spans(
+        cls,
+        start: np.ndarray,
+        end: np.ndarray,
+        close_price: np.ndarray,
+        index: pd.DatetimeIndex | None = None,
+    ) -> "SampleWeights":
+        """
+        Weights of the labels spanning the bars [start, end]
+
+        :param start: entry position of every label
+        :param end: position of the first barrier hit of every label
+        :param close_price: close price of every bar, for the return attribution
+        :param index: index of the bars
+        """
+
+        start = np.asarray(start, dtype=np.int64)
+        end = np.asarray(end, dtype=np.int64)
+        close_price = np.asarray(close_price, dtype=np.float64)
+        bars: int = len(close_price)
+        if start.shape != end.shape:
+            raise ValueError(f"Expected one end per span start, got {len(end)} for {len(start)}")
+        if np.any(end < start):
+            raise ValueError("Every label must end at or after its start")
+        if len(start) != 0 and (start.min() < 0 or end.max() >= bars):
+            raise ValueError(f"The spans must be inside the {bars} bars")
+
+        span_changes: np.ndarray = (
+            np.bincount(start, minlength=bars + 1) - np.bincount(end + 1, minlength=bars + 1)
+        )
+        concurrency: np.ndarray = np.cumsum(span_changes[:-1])
+
+        # bars out of every span have no concurrency and do not add to any sum
+        with np.errstate(divide="ignore"):
+            inverse_concurrency: np.ndarray = np.where(concurrency > 0, 1.0 / concurrency, 0.0)
+        span_length: np.ndarray = end - start + 1
+        uniqueness: np.ndarray = _span_sums(inverse_concurrency, start, end) / span_length
+
+        log_return: np.ndarray = np.zeros(bars)
+        log_return[1:] = np.diff(np.log(close_price))
+        attribution: np.ndarray = np.abs(
+            _span_sums(np.nan_to_num(log_return * inverse_concurrency), start, end)
+        )
+        total: float = attribution.sum()
+        if total > 0:
+            attribution *= len(start) / total
+
+        return cls(
+            concurrency=concurrency,
+            uniqueness=uniqueness,
+            return_attribution=attribution,
+            index=index,
+        )
+
+    def average_uniqueness(self) -> float:
+        """
+        Mean uniqueness of the labels, a measure of how much they overlap
+        """
+        return float(self.uniqueness.mean()) if len(self.uniqueness) != 0 else np.nan
+
+    def concurrency_series(self) -> pd.Series:
+        """
+        Concurrency of every bar as a Series on the index
+        """
+        return pd.Series(self.concurrency, index=self.index, name="concurrency")
+
+
+def _span_sums(values: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """
+    Sums of values over every span [start, end], from the prefix sums
+    """
+    prefix: np.ndarray = np.concatenate(([0.0], np.cumsum(values)))
+    return prefix[end + 1] - prefix[start]
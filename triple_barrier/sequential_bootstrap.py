@@ -0,0 +1,140 @@
+"""
+Sequential bootstrap of overlapping labels (López de Prado, Advances in Financial Machine
+Learning, chapter 4).
+
+Labels are drawn one at a time with a probability proportional to their average uniqueness
+given the labels already drawn: the mean, over the bars of the label span, of
+1 / (1 + number of drawn labels spanning the bar).
+
+A draw only changes the uniqueness of the labels sharing a bar with the drawn one, so the
+labels of every bar are kept in a sparse incidence structure (CSR: the labels of bar t are
+labels[bar_start[t]:bar_start[t + 1]]) and every draw updates the sum of 1 / (1 + count) of
+those labels only. The draw probabilities are kept by blocks of labels, so picking a label
+reads the block sums and one block instead of all the labels. The cost of a draw is about
+the number of bars of a span times the concurrency, not the number of labels times the
+number of bars of the dense indicator matrix.
+
+"""
+
+import numpy as np
+
+
+class SequentialBootstrap:
+
+    def __init__(self, start: np.ndarray, end: np.ndarray) -> None:
+        """
+        :param start: entry position of every label
+        :param end: position of the first barrier hit of every label (the span includes both)
+        """
+
+        start = np.asarray(start, dtype=np.int64)
+        end = np.asarray(end, dtype=np.int64)
+        if start.shape != end.shape:
+            raise ValueError(f"Expected one end per span start, got {len(end)} for {len(start)}")
+        if np.any(end < start):
+            raise ValueError("Every label must end at or after its start")
+
+        # bars are counted from the first span start
+        self._first_bar: int = int(start.min()) if len(start) != 0 else 0
+        self.start: np.ndarray = start - self._first_bar
+        self.end: np.ndarray = end - self._first_bar
+        self.span_length: np.ndarray = self.end - self.start + 1
+        bars: int = int(self.end.max()) + 1 if len(start) != 0 else 0
+
+        # incidence bar -> labels, as compressed sparse rows
+        label: np.ndarray = np.repeat(np.arange(len(start)), self.span_length)
+        span_offset: np.ndarray = np.arange(len(label)) - np.repeat(
+            np.cumsum(self.span_length) - self.span_length, self.span_length
+        )
+        bar: np.ndarray = np.repeat(self.start, self.span_length) + span_offset
+        order: np.ndarray = np.argsort(bar, kind="stable")
+        self._labels: np.ndarray = label[order]
+        self._bar_start: np.ndarray = np.concatenate(([0], np.cumsum(np.bincount(bar, minlength=bars))))
+
+        self._block_size: int = max(1, int(np.sqrt(len(start))))
+        self._reset()
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def _reset(self) -> None:
+        labels: int = len(self.start)
+        # drawn labels spanning every bar
+        self._count: np.ndarray = np.zeros(len(self._bar_start) - 1, dtype=np.int64)
+        # sum of 1 / (1 + count) over the span of every label, the span length with no draws
+        self._inverse_sum: np.ndarray = self.span_length.astype(np.float64)
+        self._uniqueness: np.ndarray = np.ones(labels)
+        blocks: int = -(-labels // self._block_size)
+        self._block_sum: np.ndarray = np.zeros(blocks)
+        np.add.at(self._block_sum, np.arange(labels) // self._block_size, self._uniqueness)
+
+    def sample(
+        self,
+        size: int | None = None,
+        random_state: int | np.random.Generator | None = None,
+    ) -> np.ndarray:
+        """
+        Draws a bootstrap sample
+
+        :param size: number of labels to draw, the number of labels when None
+        :param random_state: seed or generator, for reproducible samples
+        :return: positions of the drawn labels, in draw order (with repetitions)
+        """
+
+        if size is not None and size < 0:
+            raise ValueError(f"The sample size can not be negative, got {size}")
+        if len(self) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        rng: np.random.Generator = np.random.default_rng(random_state)
+        size = len(self) if size is None else size
+
+        self._reset()
+        drawn: np.ndarray = np.empty(size, dtype=np.int64)
+        for draw in range(size):
+            drawn[draw] = self._draw(rng.random())
+            self._add(drawn[draw])
+        return drawn
+
+    def draw_probabilities(self) -> np.ndarray:
+        """
+        Probability of every label to be drawn next, given the labels drawn by the last sample
+        """
+        return self._uniqueness / self._uniqueness.sum()
+
+    def _draw(self, uniform: float) -> int:
+        """
+        Label at the uniform quantile of the uniqueness distribution
+        """
+        block_cumsum: np.ndarray = np.cumsum(self._block_sum)
+        target: float = uniform * block_cumsum[-1]
+        block: int = min(int(np.searchsorted(block_cumsum, target, side="right")), len(block_cumsum) - 1)
+
+        first: int = block * self._block_size
+        label_cumsum: np.ndarray = np.cumsum(self._uniqueness[first:first + self._block_size])
+        target -= block_cumsum[block] - self._block_sum[block]
+        offset: int = min(int(np.searchsorted(label_cumsum, target, side="right")), len(label_cumsum) - 1)
+        return first + offset
+
+    def _add(self, label: int) -> None:
+        """
+        Adds a drawn label: updates the counts of its bars and the uniqueness of the labels
+        sharing them
+        """
+        start: int = self.start[label]
+        stop: int = self.end[label] + 1
+        count: np.ndarray = self._count[start:stop]
+        change: np.ndarray = 1.0 / (count + 2) - 1.0 / (count + 1)
+        count += 1
+
+        bar_start: np.ndarray = self._bar_start[start:stop + 1]
+        incidence: slice = slice(bar_start[0], bar_start[-1])
+        affected: np.ndarray = self._labels[incidence]
+        np.add.at(self._inverse_sum, affected, np.repeat(change, np.diff(bar_start)))
+
+        affected = np.unique(affected)
+        self._uniqueness[affected] = self._inverse_sum[affected] / self.span_length[affected]
+        # block sums are recomputed, not updated, so they do not drift
+        for block in np.unique(affected // self._block_size):
+            first: int = block * self._block_size
+            self._block_sum[block] = self._uniqueness[first:first + self._block_size].sum()
@@ -0,0 +1,242 @@
+"""
+Market data stored in shared memory, to label one dataset from many processes.
+
+The open, high, low, close, entry and exit columns and the int64 nanoseconds index are
+copied once into multiprocessing.shared_memory blocks by the creating process. Worker
+processes attach to the blocks by name (SharedMarketData.handle is small and cheap to
+pickle) and build read-only NumPy views on them, so the dataset is stored once no matter
+how many workers run.
+
+The creating process owns the blocks: it must unlink them when all the workers are done
+(the context manager does it on exit).
+
+Before Python 3.13, attaching to a block on POSIX registers it with the resource tracker of the
+process, which unlinks the blocks still registered when it stops. The processes started by the owner
+with multiprocessing (fork or spawn) share its tracker, but any other process runs its own, and would
+free the blocks when it exits. A tracker is told apart by the pipe the processes write to it, which
+the multiprocessing children inherit: attaching from a process with another tracker unregisters the
+blocks from it.
+
+"""
+
+import os
+import sys
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from triple_barrier import constants
+from triple_barrier.market_data import MarketData
+
+INDEX: str = "index"
+
+
+@dataclass(frozen=True)
+class SharedMarketDataHandle:
+    """
+    Names of the shared memory blocks of a SharedMarketData, what a worker needs to attach to it
+    """
+
+    block_names: dict
+    length: int
+    # resource tracker of the owner (see _tracker_id), None when the attached blocks are not tracked
+    tracker_id: tuple[int, int] | None = None
+
+
+class SharedMarketData:
+
+    def __init__(
+        self, blocks: dict, length: int, owner: bool = False, tracker_id: tuple[int, int] | None = None
+    ) -> None:
+        """
+        Use SharedMarketData.create or SharedMarketData.attach instead of building it directly.
+
+        :param blocks: shared memory block of every column (and of the index)
+        :param length: number of bars
+        :param owner: True in the process that created the blocks
+        :param tracker_id: resource tracker of the owner
+        """
+
+        self._blocks: dict = blocks
+        self.length: int = length
+        self.owner: bool = owner
+        self._tracker_id: tuple[int, int] | None = tracker_id
+        self._arrays: dict = {}
+        for name, block in blocks.items():
+            dtype = np.int64 if name == INDEX else np.float64
+            array: np.ndarray = np.ndarray((length,), dtype=dtype, buffer=block.buf)
+            array.setflags(write=False)
+            self._arrays[name] = array
+
+    @classmethod
+    def create(
+        cls,
+        open_price: pd.Series,
+        high_price: pd.Series,
+        low_price: pd.Series,
+        close_price: pd.Series,
+        entry_mark: pd.Series,
+        dynamic_exit: pd.Series | None = None,
+    ) -> "SharedMarketData":
+        """
+        Copies the prices, entries and exits into new shared memory blocks
+
+        :param open_price: open price series, its index is the index of the market data
+        :param high_price: high price series, aligned to open_price
+        :param low_price: low price series, aligned to open_price
+        :param close_price: close price series, aligned to open_price
+        :param entry_mark: entry marks, aligned to open_price
+        :param dynamic_exit: dynamic exit signals, aligned to open_price
+        :return: SharedMarketData that owns the blocks
+        """
+
+        columns: dict = {
+            constants.OPEN: open_price,
+            constants.HIGH: high_price,
+            constants.LOW: low_price,
+            constants.CLOSE: close_price,
+            constants.ENTRY: entry_mark,
+        }
+        if dynamic_exit is not None:
+            columns[constants.EXIT] = dynamic_exit
+
+        arrays: dict = {INDEX: open_price.index.asi8}
+        for name, series in columns.items():
+            arrays[name] = series.to_numpy(dtype=np.float64)
+
+        length: int = len(open_price.index)
+        blocks: dict = {}
+        try:
+            for name, array in arrays.items():
+                # a shared memory block can not be empty
+                block = SharedMemory(create=True, size=max(array.nbytes, 1))
+                blocks[name] = block
+                np.ndarray((length,), dtype=array.dtype, buffer=block.buf)[:] = array
+        except BaseException:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+            raise
+
+        return cls(blocks, length, owner=True, tracker_id=_tracker_id())
+
+    @classmethod
+    def attach(cls, handle: SharedMarketDataHandle) -> "SharedMarketData":
+        """
+        Attaches to the blocks created by another process
+
+        :param handle: handle of the SharedMarketData to attach to
+        :return: SharedMarketData with read-only views on the blocks
+        """
+
+        blocks: dict = {
+            name: _attach_block(block_name, handle.tracker_id) for name, block_name in handle.block_names.items()
+        }
+        return cls(blocks, handle.length, tracker_id=handle.tracker_id)
+
+    @property
+    def handle(self) -> SharedMarketDataHandle:
+        return SharedMarketDataHandle(
+            block_names={name: block.name for name, block in self._blocks.items()},
+            length=self.length,
+            tracker_id=self._tracker_id,
+        )
+
+    @property
+    def times(self) -> np.ndarray:
+        """
+        Bar times in int64 nanoseconds
+        """
+        return self._arrays[INDEX]
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self.times.view("datetime64[ns]"), copy=False)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._arrays
+
+    def array(self, column: str) -> np.ndarray:
+        """
+        Read-only view of a column
+        """
+        return self._arrays[column]
+
+    def series(self, column: str) -> pd.Series:
+        """
+        Read-only view of a column as a Series on the market data index
+        """
+        return pd.Series(self._arrays[column], index=self.index, name=column, copy=False)
+
+    def entry_positions(self) -> np.ndarray:
+        """
+        Positions of the bars with an entry mark
+        """
+        return np.flatnonzero(self._arrays[constants.ENTRY] == 1)
+
+    def market_data(self) -> MarketData:
+        """
+        MarketData over the shared prices, without copying them
+        """
+        return MarketData(
+            open_price=self.series(constants.OPEN),
+            high_price=self.series(constants.HIGH),
+            low_price=self.series(constants.LOW),
+            close_price=self.series(constants.CLOSE),
+            dynamic_exit=self.series(constants.EXIT) if constants.EXIT in self else None,
+        )
+
+    def close(self) -> None:
+        """
+        Releases the views and detaches from the blocks, the blocks stay available to other processes.
+        Views handed out (arrays, series, MarketData) must be released before.
+        """
+        self._arrays = {}
+        for block in self._blocks.values():
+            block.close()
+
+    def unlink(self) -> None:
+        """
+        Frees the blocks, call it once from the owner when no worker uses them anymore
+        """
+        for block in self._blocks.values():
+            block.unlink()
+
+    def __enter__(self) -> "SharedMarketData":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
+
+
+def _tracker_id() -> tuple[int, int] | None:
+    """
+    Device and inode of the pipe to the resource tracker of this process, inherited by the processes
+    it starts with multiprocessing. None when the attached blocks are not tracked: on Windows, and from
+    Python 3.13 on (they are attached untracked)
+    """
+    if os.name != "posix" or sys.version_info >= (3, 13):
+        return None
+    pipe = os.fstat(resource_tracker.getfd())
+    return pipe.st_dev, pipe.st_ino
+
+
+def _attach_block(name: str, owner_tracker_id: tuple[int, int] | None) -> SharedMemory:
+    # only the owner tracks the blocks, so a worker exiting does not free them
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    block = SharedMemory(name=name)
+    # the registration is undone only with another tracker: the owner tracker keeps one
+    # registration per block, undoing it would drop the owner's
+    if _tracker_id() != owner_tracker_id:
+        # the POSIX names are tracked with their leading slash, which SharedMemory.name leaves out
+        resource_tracker.unregister(f"/{block.name}", "shared_memory")
+    return block
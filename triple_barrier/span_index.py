@@ -0,0 +1,61 @@
+"""
+Interval index over the bar spans of labeled trades.
+
+A trade spans the bars from its entry to the bar of its first hit (and the bar after it when a
+dynamic exit closes on its open). Only the bars of its span decide how it is labeled, so after
+a correction of some bars, the trades to label again are the ones whose span intersects them.
+
+The spans are sorted by start, with the running maximum of their ends. For a range of bars
+[first, last], the spans starting after last are skipped with a binary search on the starts,
+and the ones ending before first with a binary search on the running maximum of the ends. Only
+the spans left in between are checked, which are the overlapping ones plus the spans nested in
+a longer one, so a query costs O(log n) plus the number of spans around the range.
+
+Spans are given as positions in the price arrays (see MarketData to resolve datetimes to positions).
+
+"""
+
+import numpy as np
+
+
+class SpanIndex:
+
+    def __init__(self, start: np.ndarray, end: np.ndarray) -> None:
+        """
+        :param start: first bar of every span
+        :param end: last bar of every span (inclusive)
+        """
+
+        start = np.asarray(start, dtype=np.int64)
+        end = np.asarray(end, dtype=np.int64)
+        if start.shape != end.shape:
+            raise ValueError(f"Expected one end per span start, got {len(end)} for {len(start)}")
+
+        self._order: np.ndarray = np.argsort(start, kind="stable")
+        self._start: np.ndarray = start[self._order]
+        self._end: np.ndarray = end[self._order]
+        # non decreasing, so the spans ending before a bar are a prefix
+        self._running_end: np.ndarray = np.maximum.accumulate(self._end) if len(end) != 0 else self._end
+
+    def __len__(self) -> int:
+        return len(self._start)
+
+    def overlapping(self, first: int, last: int) -> np.ndarray:
+        """
+        Spans intersecting a range of bars
+
+        :param first: first bar of the range
+        :param last: last bar of the range (inclusive)
+        :return: positions of the spans, in the order they were given, none when first is after last
+        """
+
+        if first > last:
+            return np.zeros(0, dtype=np.int64)
+        lower: int = int(np.searchsorted(self._running_end, first, side="left"))
+        upper: int = int(np.searchsorted(self._start, last, side="right"))
+        if lower >= upper:
+            return np.zeros(0, dtype=np.int64)
+
+        candidates: np.ndarray = np.arange(lower, upper)
+        overlapping: np.ndarray = candidates[self._end[lower:upper] >= first]
+        return np.sort(self._order[overlapping])
@@ -4,12 +4,17 @@ following parameters
 
 - stop loss
 - take profit
+- trailing stop
 - expiration date or periods
 - dynamic exit
 
 It calculates the trade result starting form a datetime (opening datetime) to finally get
 a hit datetime and hit price based on the parameters described above.
 
+The barriers are only searched between the opening datetime and the time limit, so a hit
+after the time limit is considered as not hit. Both datetimes are resolved to positions in
+the MarketData arrays and the barriers work on the array slices by position.
+
 """
 
 from datetime import datetime
@@ -18,13 +23,18 @@ import pandas as pd
 import numpy as np
 
 from triple_barrier import constants
+from triple_barrier.intrabar import IntrabarResolver
+from triple_barrier.market_data import MarketData
 from triple_barrier.orders import BoxBuilder
 from triple_barrier.orders import Orders
 from triple_barrier.orders import OrdersBox
+from triple_barrier.range_index import RangeExtremeIndex
+from triple_barrier.types import ORDER_TYPE_PRIORITY
 from triple_barrier.types import OrderBoxHits
 from triple_barrier.types import OrderHit
 from triple_barrier.types import OrderType
 from triple_barrier.types import TradeSide
+from triple_barrier.types import to_nanoseconds
 
 
 class Labeler:
@@ -38,13 +48,32 @@ class Labeler:
         # TODO: Move the box_setup to the compute method
         box_setup: Orders,
         dynamic_exit: pd.Series | None = None,
+        range_index: RangeExtremeIndex | None = None,
+        market_data: MarketData | None = None,
+        short_circuit: bool = False,
+        intrabar: IntrabarResolver | None = None,
     ) -> None:
+        """
+        :param short_circuit: when True, each barrier is only searched before the earliest hit
+            found so far and skipped when it can not be hit first. The first hit is the same, but
+            orders_hit.barriers only holds the evaluated barriers and a barrier hit after the first
+            hit is reported as not hit.
+        :param intrabar: lower timeframe prices to resolve a bar hitting both take profit and stop loss
+        """
 
         self.open: pd.Series = open_price
         self.high: pd.Series = high_price
         self.low: pd.Series = low_price
         self.close: pd.Series = close_price
         self.dynamic_exit: pd.Series = dynamic_exit
+        self.range_index: RangeExtremeIndex | None = range_index
+        self.short_circuit: bool = short_circuit
+        self.intrabar: IntrabarResolver | None = intrabar
+        self.market_data: MarketData = (
+            market_data
+            if market_data is not None
+            else MarketData(open_price, high_price, low_price, close_price, dynamic_exit)
+        )
 
         box_builder: BoxBuilder = BoxBuilder()
         self.multi_barrier_box: OrdersBox = box_builder.build_multi_barrier_box(
@@ -55,6 +84,7 @@ class Labeler:
 
         self._take_profit_barrier: TakeProfit | None = None
         self._stop_loss_barrier: StopLoss | None = None
+        self._trailing_stop_barrier: TrailingStop | None = None
         self._time_barrier: TimeBarrier | None = None
         self._dynamic_barrier: DynamicOrder | None = None
 
@@ -70,6 +100,9 @@ class Labeler:
             trade_side=self.multi_barrier_box.trade_side,
             pip_decimal_position=self.multi_barrier_box.pip_decimal_position,
             take_profit=self.multi_barrier_box.take_profit,
+            time_limit=self.multi_barrier_box.time_limit,
+            range_index=self.range_index,
+            market_data=self.market_data,
         )
         self._stop_loss_barrier = StopLoss(
             open_price=self.open,
@@ -80,16 +113,35 @@ class Labeler:
             trade_side=self.multi_barrier_box.trade_side,
             pip_decimal_position=self.multi_barrier_box.pip_decimal_position,
             stop_loss=self.multi_barrier_box.stop_loss,
+            time_limit=self.multi_barrier_box.time_limit,
+            range_index=self.range_index,
+            market_data=self.market_data,
         )
+        if self.multi_barrier_box.trailing_stop is not None:
+            self._trailing_stop_barrier = TrailingStop(
+                open_price=self.open,
+                high_price=self.high,
+                low_price=self.low,
+                close_price=self.close,
+                open_datetime=self.multi_barrier_box.open_datetime,
+                trade_side=self.multi_barrier_box.trade_side,
+                entry_price=self.multi_barrier_box.open_price,
+                trailing_stop=self.multi_barrier_box.trailing_stop,
+                time_limit=self.multi_barrier_box.time_limit,
+                market_data=self.market_data,
+            )
         self._time_barrier = TimeBarrier(
             open_price=self.open,
             time_limit_date=self.multi_barrier_box.time_limit,
             open_datetime=self.multi_barrier_box.open_datetime,
+            market_data=self.market_data,
         )
         self._dynamic_barrier = DynamicOrder(
             open_price=self.open,
             exit_signals=self.dynamic_exit,
             open_datetime=self.multi_barrier_box.open_datetime,
+            time_limit=self.multi_barrier_box.time_limit,
+            market_data=self.market_data,
         )
 
     def compute(self) -> OrderBoxHits:
@@ -104,15 +156,108 @@ class Labeler:
         order_hit: Structure returning all the barriers hists and the first one to occur.
         """
 
+        if self.short_circuit:
+            self._compute_short_circuit()
+            return self.orders_hit
+
         self._compute_take_profit_barrier()
         self._compute_stop_loss_barrier()
+        if self._trailing_stop_barrier is not None:
+            self._compute_trailing_stop_barrier()
         self._compute_time_barrier()
         if self.dynamic_exit is not None:
             self._compute_dynamic_barrier()
         self._select_first_hit()
+        if self.intrabar is not None:
+            self._resolve_intrabar()
 
         return self.orders_hit
 
+    def _compute_short_circuit(self):
+        """
+        Evaluates the barriers from the cheapest to the most expensive, tightening the search
+        window with every hit found. Ties are resolved as in _select_first_hit: take profit,
+        stop loss, time barrier and dynamic barrier.
+        """
+
+        open_position: int = self.market_data.position(self.multi_barrier_box.open_datetime)
+        window_stop: int = self.market_data.last_position(self.multi_barrier_box.time_limit)
+
+        # the time barrier is known from the time limit, no search needed
+        self._time_barrier.compute()
+        evaluated: dict[OrderType, OrderHit] = {OrderType.TIME_EXPIRATION: self._time_barrier.barrier}
+
+        # take profit wins every tie, so it can hit anywhere in the window
+        take_profit_stop: int = window_stop
+        if take_profit_stop >= open_position:
+            self._take_profit_barrier.compute(search_limit=take_profit_stop)
+            evaluated[OrderType.TAKE_PROFIT] = self._take_profit_barrier.barrier
+
+        # stop loss only wins if it is hit strictly before take profit, or in the same bar when
+        # the lower timeframe resolves the tie
+        stop_loss_stop: int = min(
+            window_stop, self._take_profit_barrier.hit_position - (0 if self.intrabar is not None else 1)
+        )
+        if stop_loss_stop >= open_position:
+            self._stop_loss_barrier.compute(search_limit=stop_loss_stop)
+            evaluated[OrderType.STOP_LOSS] = self._stop_loss_barrier.barrier
+
+        # trailing stop only wins if it is hit strictly before take profit and stop loss
+        trailing_stop_position: int = constants.NO_HIT
+        if self._trailing_stop_barrier is not None:
+            trailing_stop_stop: int = min(
+                window_stop,
+                self._take_profit_barrier.hit_position - 1,
+                self._stop_loss_barrier.hit_position - 1,
+            )
+            if trailing_stop_stop >= open_position:
+                self._trailing_stop_barrier.compute(search_limit=trailing_stop_stop)
+                evaluated[OrderType.TRAILING_STOP] = self._trailing_stop_barrier.barrier
+                trailing_stop_position = self._trailing_stop_barrier.hit_position
+
+        # dynamic barrier loses every tie, so it has to be hit strictly before all the others
+        if self.dynamic_exit is not None:
+            dynamic_stop: int = min(
+                window_stop,
+                self._take_profit_barrier.hit_position - 1,
+                self._stop_loss_barrier.hit_position - 1,
+                trailing_stop_position - 1,
+            )
+            if self._time_barrier.barrier.hit_time != constants.NO_HIT:
+                dynamic_stop = min(
+                    dynamic_stop,
+                    self.market_data.time_position(self._time_barrier.barrier.hit_time) - 1,
+                )
+            if dynamic_stop >= open_position:
+                self._dynamic_barrier.compute(search_limit=dynamic_stop)
+                evaluated[OrderType.DYNAMIC] = self._dynamic_barrier.barrier
+
+        # keep the priority order so the first hit selection resolves ties as usual
+        self.orders_hit.barriers = [
+            evaluated[order_type] for order_type in ORDER_TYPE_PRIORITY if order_type in evaluated
+        ]
+        self._select_first_hit()
+        if self.intrabar is not None:
+            self._resolve_intrabar()
+
+    def _resolve_intrabar(self):
+        """
+        Gives the first hit to the stop loss when the take profit won the tie only by priority
+        and the lower timeframe touches the stop loss first
+        """
+        take_profit: TakeProfit = self._take_profit_barrier
+        stop_loss: StopLoss = self._stop_loss_barrier
+        if self.orders_hit.first_hit is not take_profit.barrier or stop_loss.hit_position != take_profit.hit_position:
+            return
+        stop_loss_first: np.ndarray = self.intrabar.stop_loss_first(
+            np.array([take_profit.hit_position]),
+            np.array([take_profit.barrier.level]),
+            np.array([stop_loss.barrier.level]),
+            self.multi_barrier_box.trade_side,
+        )
+        if stop_loss_first[0]:
+            self.orders_hit.first_hit = stop_loss.barrier
+
     def _compute_take_profit_barrier(self):
 
         self._take_profit_barrier.compute()
@@ -123,6 +268,11 @@ class Labeler:
         self._stop_loss_barrier.compute()
         self.orders_hit.barriers.append(self._stop_loss_barrier.barrier)
 
+    def _compute_trailing_stop_barrier(self):
+
+        self._trailing_stop_barrier.compute()
+        self.orders_hit.barriers.append(self._trailing_stop_barrier.barrier)
+
     def _compute_time_barrier(self):
 
         self._time_barrier.compute()
@@ -139,7 +289,7 @@ class Labeler:
             if first_hit is None:
                 first_hit = barrier
             else:
-                if barrier.hit_datetime < first_hit.hit_datetime:
+                if barrier.hit_time < first_hit.hit_time:
                     first_hit = barrier
         self.orders_hit.first_hit = first_hit
 
@@ -156,6 +306,9 @@ class TakeProfit:
         trade_side: TradeSide,
         pip_decimal_position: int,
         take_profit: float | None = None,
+        time_limit: datetime | None = None,
+        range_index: RangeExtremeIndex | None = None,
+        market_data: MarketData | None = None,
     ):
 
         self._open_price: pd.Series = open_price
@@ -163,35 +316,54 @@ class TakeProfit:
         self._low_price: pd.Series = low_price
         self._close_price: pd.Series = close_price
         self._open_datetime: datetime = open_datetime
+        self._time_limit: datetime | None = time_limit
+        self._range_index: RangeExtremeIndex | None = range_index
         self._trade_side: TradeSide = trade_side
         self._pip_decimal_position: int = pip_decimal_position
+        self._market_data: MarketData = (
+            market_data
+            if market_data is not None
+            else MarketData(open_price, high_price, low_price, close_price)
+        )
+
+        # position of the hit in the market data, constants.NO_HIT while not hit
+        self.hit_position: int = constants.NO_HIT
 
         self.barrier: OrderHit = OrderHit(
             order_type=OrderType.TAKE_PROFIT, level=take_profit
         )
 
-    def compute(self):
-        self._compute_next_take_profit_hit()
+    def compute(self, search_limit: int | None = None):
+        """
+        :param search_limit: last position to search, to tighten the time limit
+        """
+        self._compute_next_take_profit_hit(search_limit)
 
-    def _compute_next_take_profit_hit(self):
+    def _compute_next_take_profit_hit(self, search_limit: int | None = None):
 
-        hit_date: datetime | None = constants.INFINITE_DATE
+        hit_time: int = constants.NO_HIT
 
         if self.barrier.level != self._trade_side.value * np.inf:
 
-            high = self._high_price[self._open_datetime:]
-            low = self._low_price[self._open_datetime:]
+            start: int = self._market_data.position(self._open_datetime)
+            stop: int = self._market_data.last_position(self._time_limit)
+            if search_limit is not None:
+                stop = min(stop, search_limit)
 
             if self._trade_side == TradeSide.BUY:
-                mask_level_hit = high >= self.barrier.level
-                if len(high[mask_level_hit] != 0):
-                    hit_date = high[mask_level_hit].index[0]
+                position: int = _first_level_hit(
+                    self._market_data.high, start, stop, self.barrier.level, True, self._range_index
+                )
             else:
-                mask_level_hit = low <= self.barrier.level
-                if len(low[mask_level_hit]) != 0:
-                    hit_date = low[mask_level_hit].index[0]
+                position: int = _first_level_hit(
+                    self._market_data.low, start, stop, self.barrier.level, False, self._range_index
+                )
 
-        self.barrier.hit_datetime = datetime.fromtimestamp(datetime.timestamp(hit_date))
+            if position != constants.NO_HIT:
+                self.hit_position = position
+                hit_time = int(self._market_data.times[position])
+
+        self.barrier.hit_time = hit_time
 
 
 class StopLoss:
@@ -206,6 +378,9 @@ class StopLoss:
         trade_side: TradeSide,
         pip_decimal_position: int,
         stop_loss: float = None,
+        time_limit: datetime | None = None,
+        range_index: RangeExtremeIndex | None = None,
+        market_data: MarketData | None = None,
     ):
 
         self._open_price: pd.Series = open_price
@@ -213,57 +388,152 @@ class StopLoss:
         self._low_price: pd.Series = low_price
         self._close_price: pd.Series = close_price
         self._open_datetime: datetime = open_datetime
+        self._time_limit: datetime | None = time_limit
+        self._range_index: RangeExtremeIndex | None = range_index
         self._trade_side: TradeSide = trade_side
         self._pip_decimal_position: int = pip_decimal_position
+        self._market_data: MarketData = (
+            market_data
+            if market_data is not None
+            else MarketData(open_price, high_price, low_price, close_price)
+        )
+
+        # position of the hit in the market data, constants.NO_HIT while not hit
+        self.hit_position: int = constants.NO_HIT
 
         self.barrier: OrderHit = OrderHit(
             order_type=OrderType.STOP_LOSS, level=stop_loss
         )
 
-    def compute(self):
-        self._compute_next_level_hit()
+    def compute(self, search_limit: int | None = None):
+        """
+        :param search_limit: last position to search, to tighten the time limit
+        """
+        self._compute_next_level_hit(search_limit)
 
-    def _compute_next_level_hit(self):
+    def _compute_next_level_hit(self, search_limit: int | None = None):
 
-        hit_datetime: datetime = constants.INFINITE_DATE
+        hit_time: int = constants.NO_HIT
 
         if self.barrier.level != -self._trade_side.value * np.inf:
-            high = self._high_price[self._open_datetime:]
-            low = self._low_price[self._open_datetime:]
+
+            start: int = self._market_data.position(self._open_datetime)
+            stop: int = self._market_data.last_position(self._time_limit)
+            if search_limit is not None:
+                stop = min(stop, search_limit)
 
             if self._trade_side == TradeSide.BUY:
-                mask_level_hit = low <= self.barrier.level
-                if len(low[mask_level_hit]) != 0:
-                    hit_datetime = high[mask_level_hit].index[0]
+                position: int = _first_level_hit(
+                    self._market_data.low, start, stop, self.barrier.level, False, self._range_index
+                )
             else:
-                mask_level_hit = high >= self.barrier.level
-                if len(high[mask_level_hit] != 0):
-                    hit_datetime = low[mask_level_hit].index[0]
+                position: int = _first_level_hit(
+                    self._market_data.high, start, stop, self.barrier.level, True, self._range_index
+                )
+
+            if position != constants.NO_HIT:
+                self.hit_position = position
+                hit_time = int(self._market_data.times[position])
+
+        self.barrier.hit_time = hit_time
+
 
-        self.barrier.hit_datetime = datetime.fromtimestamp(
-            datetime.timestamp(hit_datetime)
+class TrailingStop:
+    """
+    Stop loss that follows the price: its level is the best price since the opening (the
+    open price and the highs of the previous bars for long trades, the lows for short ones)
+    minus the trailing stop distance for long trades, plus it for short ones. The level of
+    a bar only uses the previous bars, so a bar can not move the stop and hit it.
+    """
+
+    def __init__(
+        self,
+        open_price: pd.Series,
+        high_price: pd.Series,
+        low_price: pd.Series,
+        close_price: pd.Series,
+        open_datetime: datetime,
+        trade_side: TradeSide,
+        entry_price: float,
+        trailing_stop: float,
+        time_limit: datetime | None = None,
+        market_data: MarketData | None = None,
+    ):
+
+        self._open_datetime: datetime = open_datetime
+        self._time_limit: datetime | None = time_limit
+        self._trade_side: TradeSide = trade_side
+        self._entry_price: float = entry_price
+        self._trailing_stop: float = trailing_stop
+        self._market_data: MarketData = (
+            market_data
+            if market_data is not None
+            else MarketData(open_price, high_price, low_price, close_price)
         )
 
+        # position of the hit in the market data, constants.NO_HIT while not hit
+        self.hit_position: int = constants.NO_HIT
+
+        # the level moves with the price, it is the level of the hit bar once hit
+        self.barrier: OrderHit = OrderHit(order_type=OrderType.TRAILING_STOP, level=np.nan)
+
+    def compute(self, search_limit: int | None = None):
+        """
+        :param search_limit: last position to search, to tighten the time limit
+        """
+        self._compute_next_level_hit(search_limit)
+
+    def _compute_next_level_hit(self, search_limit: int | None = None):
+
+        hit_time: int = constants.NO_HIT
+
+        start: int = self._market_data.position(self._open_datetime)
+        stop: int = self._market_data.last_position(self._time_limit)
+        if search_limit is not None:
+            stop = min(stop, search_limit)
+
+        if start <= stop:
+            position, level = _first_trailing_stop_hit(
+                self._market_data.high,
+                self._market_data.low,
+                start,
+                stop,
+                self._entry_price,
+                self._trailing_stop,
+                self._trade_side,
+            )
+            if position != constants.NO_HIT:
+                self.hit_position = position
+                self.barrier.level = level
+                hit_time = int(self._market_data.times[position])
+
+        self.barrier.hit_time = hit_time
+
 
 class TimeBarrier:
     # TODO: deal with no time barrier
     # TODO: deal with time barrier beyond last time series date
 
     def __init__(
-        self, open_price: pd.Series, time_limit_date: datetime, open_datetime: datetime
+        self,
+        open_price: pd.Series,
+        time_limit_date: datetime,
+        open_datetime: datetime,
+        market_data: MarketData | None = None,
     ):
         self.open_price: pd.Series = open_price
         self.open_datetime: datetime = open_datetime
+        self._market_data: MarketData = (
+            market_data if market_data is not None else MarketData(open_price)
+        )
 
-        expiration_datetime: datetime
+        expiration_time: int = to_nanoseconds(time_limit_date)
 
-        if time_limit_date > open_price.index[-1]:
-            expiration_datetime: datetime = constants.INFINITE_DATE
-        else:
-            expiration_datetime = time_limit_date
+        if expiration_time > self._market_data.times[-1]:
+            expiration_time = constants.NO_HIT
 
         self.barrier = OrderHit(
-            order_type=OrderType.TIME_EXPIRATION, hit_datetime=expiration_datetime
+            order_type=OrderType.TIME_EXPIRATION, hit_time=expiration_time
         )
 
     def compute(self):
@@ -272,9 +542,13 @@ class TimeBarrier:
     def _compute_hit_level(self):
         hit_level: float = np.inf
 
-        open_price = self.open_price[self.open_datetime:]
-        if self.barrier.hit_datetime != constants.INFINITE_DATE:
-            hit_level = open_price[self.barrier.hit_datetime:].iloc[0]
+        if self.barrier.hit_time != constants.NO_HIT:
+            # first bar at or after the time limit, never before the opening
+            position: int = max(
+                self._market_data.position(self.open_datetime),
+                self._market_data.time_position(self.barrier.hit_time),
+            )
+            hit_level = self._market_data.open[position]
 
         self.barrier.level = hit_level
 
@@ -286,34 +560,113 @@ class DynamicOrder:
         open_price: pd.Series,
         exit_signals: pd.Series,
         open_datetime: datetime,
+        time_limit: datetime | None = None,
+        market_data: MarketData | None = None,
     ):
         self.open_price = open_price
         self.open_datetime: datetime = open_datetime
+        self.time_limit: datetime | None = time_limit
         self.exit_signals: pd.Series = exit_signals
+        self._market_data: MarketData = (
+            market_data
+            if market_data is not None and market_data.dynamic_exit is not None
+            else MarketData(open_price, dynamic_exit=exit_signals)
+        )
+        # position of the exit signal in the market data, constants.NO_HIT while not hit
+        self.hit_position: int = constants.NO_HIT
 
         self.barrier: OrderHit = OrderHit(order_type=OrderType.DYNAMIC)
 
-    def compute(self):
-        self._compute_hit_datetime()
+    def compute(self, search_limit: int | None = None):
+        """
+        :param search_limit: last position to search, to tighten the time limit
+        """
+        self._compute_hit_datetime(search_limit)
         self._compute_hit_level()
 
-    def _compute_hit_datetime(self):
+    def _compute_hit_datetime(self, search_limit: int | None = None):
+
+        hit_time: int = constants.NO_HIT
 
-        hit_datetime: datetime = constants.INFINITE_DATE
-        trade_exit_signals: pd.Series = self.exit_signals[self.open_datetime:]
-        mask_exit = trade_exit_signals == 1
-        if len(trade_exit_signals[mask_exit]) != 0:
-            hit_datetime = trade_exit_signals[mask_exit].index[0]
+        start: int = self._market_data.position(self.open_datetime)
+        stop: int = self._market_data.last_position(self.time_limit)
+        if search_limit is not None:
+            stop = min(stop, search_limit)
+        self.hit_position = constants.NO_HIT
+        if start <= stop and self._market_data.next_exit[start] <= stop:
+            self.hit_position = int(self._market_data.next_exit[start])
+        if self.hit_position != constants.NO_HIT:
+            hit_time = int(self._market_data.times[self.hit_position])
 
-        self.barrier.hit_datetime = hit_datetime
+        self.barrier.hit_time = hit_time
 
     def _compute_hit_level(self):
         hit_level: float = np.inf
-        if self.barrier.hit_datetime != constants.INFINITE_DATE:
-            open_price: pd.Series = self.open_price[self.open_datetime:]
-            trade_exit_signals: pd.Series = self.exit_signals[self.open_datetime:]
-            mask_exit = trade_exit_signals == 1
-            hit_trigger_date: datetime = open_price[mask_exit].index[0]
-            hit_level = open_price[hit_trigger_date:].iloc[1]
+        if self.barrier.hit_time != constants.NO_HIT:
+            # the trade is closed on the open of the bar after the exit signal
+            hit_level = self._market_data.open[self.hit_position + 1]
 
         self.barrier.level = hit_level
+
+
+def _first_level_hit(
+    values: np.ndarray,
+    start: int,
+    stop: int,
+    level: float,
+    above: bool,
+    range_index: RangeExtremeIndex | None = None,
+) -> int:
+    """
+    Searches the first position between start and stop (inclusive) where values reaches level.
+
+    :param values: price array, high when above is True and low otherwise
+    :param above: True to search the first value >= level, False to search the first value <= level
+    :param range_index: when given, the search is done in the range index instead of scanning values
+    :return: hit position, constants.NO_HIT if the level is not hit
+    """
+
+    if range_index is not None:
+        if above:
+            return range_index.first_high_at_or_above(start, level, stop)
+        return range_index.first_low_at_or_below(start, level, stop)
+
+    window: np.ndarray = values[start:stop + 1]
+    mask_level_hit: np.ndarray = window >= level if above else window <= level
+    if not mask_level_hit.any():
+        return constants.NO_HIT
+    return start + int(mask_level_hit.argmax())
+
+
+def _first_trailing_stop_hit(
+    high: np.ndarray,
+    low: np.ndarray,
+    start: int,
+    stop: int,
+    entry_price: float,
+    trailing_stop: float,
+    trade_side: TradeSide,
+) -> tuple[int, float]:
+    """
+    Searches the first position between start and stop (inclusive) where the trailing stop is hit.
+    The stop levels of the window come from the running extreme of the previous bars, missing
+    prices are skipped.
+
+    :param entry_price: price the trade was opened at, the first reference of the stop
+    :param trailing_stop: distance of the stop to the running extreme, in price units
+    :return: hit position (constants.NO_HIT if the stop is not hit) and the stop level at that position
+    """
+
+    if trade_side == TradeSide.BUY:
+        reference: np.ndarray = np.fmax.accumulate(np.concatenate(([entry_price], high[start:stop])))
+        level: np.ndarray = reference - trailing_stop
+        mask_level_hit: np.ndarray = low[start:stop + 1] <= level
+    else:
+        reference = np.fmin.accumulate(np.concatenate(([entry_price], low[start:stop])))
+        level = reference + trailing_stop
+        mask_level_hit = high[start:stop + 1] >= level
+
+    if not mask_level_hit.any():
+        return constants.NO_HIT, np.nan
+    offset: int = int(mask_level_hit.argmax())
+    return start + offset, float(level[offset])
@@ -4,12 +4,28 @@ a Pandas dataset
 
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from dataclasses import replace
+import numpy as np
 import pandas as pd
 
 from .trade_labeling import TradeSide
 from .orders import Orders
 from .trade_labeling import Labeler
+from .batch_labeling import BatchLabeler
+from .market_data import MarketData
+from .parameter_sweep import ParameterSweep
+from .parameter_sweep import SweepResults
+from .types import OrderType
+from .types import TradeResults
+from .training_labels import TrainingLabels
+from .sample_weights import SampleWeights
+from .sequential_bootstrap import SequentialBootstrap
+from .range_index import RangeExtremeIndex
+from .intrabar import IntrabarResolver
+from .span_index import SpanIndex
+from .result_cache import ResultCache
 import triple_barrier.constants as const
 from triple_barrier.plots import PlotTripleBarrier
 
@@ -23,12 +39,25 @@ class TradingParameters:
     low_price: pd.DataFrame
     close_price: pd.DataFrame
     entry_mark: pd.DataFrame
-    stop_loss_width: float
-    take_profit_width: float
-    trade_side: TradeSide
+    # widths and periods are either fixed, or a Series (or array) with one value per bar
+    # or one value per entry, to scale every trade (for example with the volatility)
+    stop_loss_width: float | pd.Series | np.ndarray
+    take_profit_width: float | pd.Series | np.ndarray
+    trade_side: TradeSide | str
     pip_decimal_position: int
-    time_barrier_periods: int
+    time_barrier_periods: int | pd.Series | np.ndarray
     dynamic_exit: pd.Series | None = None
+    # widths of the short trades when trade_side is const.TRADE_SIDE_BOTH, the widths above when None
+    sell_stop_loss_width: float | pd.Series | np.ndarray | None = None
+    sell_take_profit_width: float | pd.Series | np.ndarray | None = None
+    # distance in pips of the trailing stop to the best price since the opening, None for no trailing stop
+    trailing_stop_width: float | pd.Series | np.ndarray | None = None
+    # lower timeframe prices (high and low columns) to resolve the bars hitting both take profit and stop loss
+    lower_timeframe: pd.DataFrame | None = None
+    # bid and ask prices (open, high, low and close columns) on the dataset index: long trades open on
+    # the ask and close on the bid, short trades the reverse. The prices above are still the reference
+    bid_price: pd.DataFrame | None = None
+    ask_price: pd.DataFrame | None = None
 
 
 class DataSetLabeler:
@@ -45,10 +74,24 @@ class DataSetLabeler:
     LOW = "low"
     CLOSE = "close"
 
-    def __init__(self, trading_setup: TradingParameters):
+    def __init__(self,
+                 trading_setup: TradingParameters,
+                 range_index: RangeExtremeIndex | None = None,
+                 cache: ResultCache | None = None):
+        """
+        :param trading_setup: prices, entries and trade setup to label
+        :param range_index: optional range extreme index built on the same high and low prices,
+            to share it across labelers that use the same dataset with different parameters
+        :param cache: optional on-disk cache of the computed trades, keyed by the trading setup
+            and the engine, so identical computations are read back instead of labeled again
+        """
 
         self.trades: pd.DataFrame | None = None
+        # columnar results of the last vectorized computation, one per side with both trade sides
+        self.results: TradeResults | dict[TradeSide, TradeResults] | None = None
         self._trading_setup = trading_setup
+        self._range_index: RangeExtremeIndex | None = range_index
+        self._cache: ResultCache | None = cache
         ohlc_series: dict = {
             self.OPEN: trading_setup.open_price,
             self.HIGH: trading_setup.high_price,
@@ -62,86 +105,788 @@ class DataSetLabeler:
             ohlc_series[self.EXIT] = trading_setup.dynamic_exit
             self._exit_specified = True
 
-        self._ohlc: pd.DataFrame = pd.DataFrame(ohlc_series)
+        # the columns are not copied, so memory mapped prices stay on disk
+        self._ohlc: pd.DataFrame = pd.DataFrame(ohlc_series, copy=False)
+        self._market_data: MarketData = MarketData(
+            open_price=self._ohlc[self.OPEN],
+            high_price=self._ohlc[self.HIGH],
+            low_price=self._ohlc[self.LOW],
+            close_price=self._ohlc[self.CLOSE],
+            dynamic_exit=self._ohlc[self.EXIT] if self._exit_specified else None,
+        )
+
+        entry_positions: np.ndarray = np.flatnonzero(self._ohlc[self.ENTRY].to_numpy() == 1)
+        self._stop_loss_width = self._bar_values(trading_setup.stop_loss_width, entry_positions, "stop_loss_width")
+        self._take_profit_width = self._bar_values(trading_setup.take_profit_width, entry_positions, "take_profit_width")
+        self._time_barrier_periods = self._bar_values(
+            trading_setup.time_barrier_periods, entry_positions, "time_barrier_periods", periods=True
+        )
+
+        self._both_sides: bool = trading_setup.trade_side == const.TRADE_SIDE_BOTH
+        if not self._both_sides and not isinstance(trading_setup.trade_side, TradeSide):
+            raise ValueError(
+                f"Unknown trade side {trading_setup.trade_side!r}, expected a TradeSide or {const.TRADE_SIDE_BOTH!r}"
+            )
+        if not self._both_sides and (
+            trading_setup.sell_stop_loss_width is not None or trading_setup.sell_take_profit_width is not None
+        ):
+            raise ValueError("The sell widths are only used when both trade sides are labeled")
+        self._sell_stop_loss_width = self._stop_loss_width
+        if trading_setup.sell_stop_loss_width is not None:
+            self._sell_stop_loss_width = self._bar_values(trading_setup.sell_stop_loss_width, entry_positions, "sell_stop_loss_width")
+        self._sell_take_profit_width = self._take_profit_width
+        if trading_setup.sell_take_profit_width is not None:
+            self._sell_take_profit_width = self._bar_values(trading_setup.sell_take_profit_width, entry_positions, "sell_take_profit_width")
+
+        self._trailing_stop_width = None
+        if trading_setup.trailing_stop_width is not None:
+            self._trailing_stop_width = self._bar_values(trading_setup.trailing_stop_width, entry_positions, "trailing_stop_width")
+
+        self._intrabar: IntrabarResolver | None = None
+        if trading_setup.lower_timeframe is not None:
+            missing: list[str] = [
+                column for column in (const.HIGH, const.LOW) if column not in trading_setup.lower_timeframe.columns
+            ]
+            if missing:
+                raise ValueError(f"The lower timeframe prices have no {' and '.join(missing)} column")
+            self._intrabar = IntrabarResolver(
+                trading_setup.lower_timeframe[const.HIGH],
+                trading_setup.lower_timeframe[const.LOW],
+                self._market_data.index,
+            )
+
+        if (trading_setup.bid_price is None) != (trading_setup.ask_price is None):
+            raise ValueError("Both the bid and the ask prices are needed to label on bid and ask")
+        self._bid_ask: bool = trading_setup.bid_price is not None
+        # prices the trades of every side are closed at, and the open price they enter at
+        self._exit_prices: dict[TradeSide, pd.DataFrame] = {}
+        self._exit_market_data: dict[TradeSide, MarketData] = {}
+        self._entry_open: dict[TradeSide, np.ndarray] = {}
+        if self._bid_ask:
+            self._exit_prices = {TradeSide.BUY: trading_setup.bid_price, TradeSide.SELL: trading_setup.ask_price}
+            for quote, prices in zip(("bid", "ask"), self._exit_prices.values()):
+                if not prices.index.equals(self._ohlc.index):
+                    raise ValueError(f"The {quote} prices must be on the dataset index")
+                missing: list[str] = [
+                    column for column in (self.OPEN, self.HIGH, self.LOW, self.CLOSE) if column not in prices.columns
+                ]
+                if missing:
+                    raise ValueError(f"The {quote} prices have no {', '.join(missing)} column")
+            for trade_side, prices in self._exit_prices.items():
+                self._exit_market_data[trade_side] = MarketData(
+                    open_price=prices[self.OPEN],
+                    high_price=prices[self.HIGH],
+                    low_price=prices[self.LOW],
+                    close_price=prices[self.CLOSE],
+                    dynamic_exit=self._ohlc[self.EXIT] if self._exit_specified else None,
+                )
+            self._entry_open = {
+                TradeSide.BUY: self._exit_market_data[TradeSide.SELL].open,
+                TradeSide.SELL: self._exit_market_data[TradeSide.BUY].open,
+            }
 
         self._profit_precision = 2  # TODO move this to a prameter or constant
 
-    def compute(self) -> pd.DataFrame:
+    def _bar_values(self, value, entry_positions: np.ndarray, name: str, periods: bool = False):
+        """
+        Aligns a per-entry trading parameter to the bars of the dataset, and checks its value on
+        every entry: widths must be positive (an infinite width disables the barrier), periods finite
+        non-negative integers
+
+        :param value: scalar, Series on the dataset index, or array with one value per bar or per entry
+        :param name: name of the parameter, for the error messages
+        :param periods: True for time barrier periods, False for widths
+        :return: the scalar, or an array with one value per bar (NaN on the bars without value)
+        """
+        if np.ndim(value) == 0:
+            bar_values = value
+            entry_values: np.ndarray = np.full(len(entry_positions), value, dtype=np.float64)
+        else:
+            if isinstance(value, pd.Series):
+                bar_values = value.reindex(self._ohlc.index).to_numpy(dtype=np.float64)
+            else:
+                bar_values = np.asarray(value, dtype=np.float64)
+                if len(bar_values) == len(entry_positions) and len(bar_values) != len(self._ohlc.index):
+                    values: np.ndarray = bar_values
+                    bar_values = np.full(len(self._ohlc.index), np.nan)
+                    bar_values[entry_positions] = values
+                elif len(bar_values) != len(self._ohlc.index):
+                    raise ValueError(
+                        f"Expected one value per bar ({len(self._ohlc.index)}) or per entry "
+                        f"({len(entry_positions)}), got {len(bar_values)}"
+                    )
+            entry_values = bar_values[entry_positions]
+
+        if periods:
+            invalid: np.ndarray = (
+                ~np.isfinite(entry_values) | (entry_values < 0) | (np.floor(entry_values) != entry_values)
+            )
+            expected: str = "finite non-negative integers"
+        else:
+            # NaN compares False, so it is rejected with the values that are not positive
+            invalid = ~(entry_values > 0)
+            expected = "positive"
+        if invalid.any():
+            invalid_times: pd.DatetimeIndex = self._ohlc.index[entry_positions[invalid]]
+            shown: str = ", ".join(str(time) for time in invalid_times[:5])
+            more: str = f" and {len(invalid_times) - 5} more" if len(invalid_times) > 5 else ""
+            raise ValueError(f"{name} must be {expected} on every entry, invalid on {shown}{more}")
+        return bar_values
+
+    @staticmethod
+    def _at(bar_values, positions: int | np.ndarray):
+        """
+        Value of a trading parameter at the given bars
+        """
+        if np.ndim(bar_values) == 0:
+            return bar_values
+        return bar_values[positions]
+
+    def _side_widths(self, trade_side: TradeSide) -> tuple:
+        """
+        Stop loss and take profit widths of a trade side
+        """
+        if self._both_sides and trade_side == TradeSide.SELL:
+            return self._sell_stop_loss_width, self._sell_take_profit_width
+        return self._stop_loss_width, self._take_profit_width
+
+    def _entry_price(self, trade_side: TradeSide, positions: int | np.ndarray):
+        """
+        Price the trades opened at the given bars enter at: the open price, or with bid and ask
+        prices the ask open for long trades and the bid open for short trades
+        """
+        return self._entry_open.get(trade_side, self._market_data.open)[positions]
+
+    def _side_market_data(self, trade_side: TradeSide) -> MarketData:
+        """
+        Market data the trades of a side are closed on
+        """
+        return self._exit_market_data.get(trade_side, self._market_data)
+
+    def _periods_at(self, positions: int | np.ndarray) -> int | np.ndarray:
+        periods = self._at(self._time_barrier_periods, positions)
+        if np.ndim(periods) == 0:
+            return int(periods)
+        return periods.astype(np.int64)
+
+    def compute(self, engine: str = const.ENGINE_APPLY, workers: int | None = None) -> pd.DataFrame:
         """
         Wraps the apply function to calculate the trades to simplify the user interface.
 
+        Args:
+            engine: const.ENGINE_APPLY to label trade by trade with Labeler, or
+                const.ENGINE_VECTORIZED to label all the trades in bulk with BatchLabeler.
+            workers: number of processes to label the entries in parallel, None or 1 to
+                label them in the current process.
+
+        With a cache, the trades of a computation with the same prices, trading parameters and
+        engine are read from the cache (the number of workers does not change them).
+
+        With trade_side const.TRADE_SIDE_BOTH a long and a short trade are labeled on every
+        entry, and the trade columns are suffixed with the side ("close-price-buy", "close-price-sell" ...).
+
         Returns:
             pd.DataFrame: Dataframe witht the trades calculated
         """
 
+        if engine not in (const.ENGINE_APPLY, const.ENGINE_VECTORIZED):
+            raise ValueError(f"Unknown labeling engine {engine}")
+
+        if workers is not None and workers < 1:
+            raise ValueError(f"The number of workers must be positive, got {workers}")
+
+        self.results = None
+        cache_key: str | None = None
+        if self._cache is not None:
+            cache_key = self._cache.key(self._trading_setup, engine)
+            cached: tuple | None = self._cache.get(cache_key)
+            if cached is not None:
+                self.trades, results = cached
+                self.results = self._with_index(results, self._market_data.index)
+                return self.trades
+
+        if workers is not None and workers > 1:
+            trades = self._compute_parallel(engine, workers)
+        elif engine == const.ENGINE_VECTORIZED:
+            trades = self._compute_vectorized()
+        else:
+            trades = self._compute_apply()
+
+        if self._cache is not None:
+            # the index is hashed in the key, so it is not stored with every entry
+            self._cache.put(cache_key, trades, self._with_index(self.results, None))
+
+        self.trades = trades
+        return trades
+
+    def update(
+        self,
+        trades: pd.DataFrame,
+        engine: str = const.ENGINE_APPLY,
+        workers: int | None = None,
+        previous_end: datetime | None = None,
+    ) -> pd.DataFrame:
+        """
+        Relabels incrementally after new bars are appended to the dataset the trades were labeled on.
+
+        Only the entries that have no trade yet and the trades that were not resolved on the previous
+        bars are labeled: the ones whose time barrier, or the bar after it where a dynamic exit closes,
+        reached the last previous bar, and the ones closed on constants.INFINITE_DATE. The trades of the
+        entries that are no longer marked are dropped. The prices, exits and trading parameters of the
+        previous bars must not have changed.
+
+        :param trades: trades labeled on the previous bars, by any engine
+        :param engine: labeling engine of the new trades, see compute
+        :param workers: number of processes to label the new trades, see compute
+        :param previous_end: last bar of the dataset the trades were labeled on, not after the last bar
+            of the dataset. When None, the latest close of the trades is taken, which may relabel a few
+            more trades
+        :return: trades of every entry of the dataset, in entry order
+        """
+
+        self._check_trade_sides(trades)
+        if previous_end is not None and previous_end > self._market_data.index[-1]:
+            raise ValueError(f"The previous end {previous_end} is after the last bar of the dataset")
+
+        entry_positions: np.ndarray = np.flatnonzero(self._ohlc[self.ENTRY].to_numpy() == 1)
+        close_datetimes: list[pd.Series] = [
+            self._close_datetime(trades, suffix) for suffix in self._trade_suffixes()
+        ]
+        if previous_end is None:
+            previous_end = max((close_datetime.max() for close_datetime in close_datetimes), default=pd.NaT)
+        previous_last_position: int = (
+            -1 if pd.isna(previous_end) else int(self._market_data.index.searchsorted(previous_end, side="right")) - 1
+        )
+
+        closed: np.ndarray = np.ones(len(trades.index), dtype=bool)
+        for close_datetime in close_datetimes:
+            closed &= close_datetime.notna().to_numpy()
+        trade_positions, in_dataset = self._trade_positions(trades)
+
+        # entries whose previous trade is kept
+        resolved: np.ndarray = np.zeros(len(self._ohlc.index), dtype=bool)
+        resolved[trade_positions[in_dataset & closed]] = True
+        # same rule as ChunkedLabeler: the time barrier and the bar after it must be in the previous bars
+        reach: np.ndarray = entry_positions + self._periods_at(entry_positions)
+        resolved[entry_positions[reach >= previous_last_position]] = False
+        entry_resolved: np.ndarray = np.zeros(len(self._ohlc.index), dtype=bool)
+        entry_resolved[entry_positions] = resolved[entry_positions]
+
+        kept: pd.DataFrame = trades[in_dataset & entry_resolved[trade_positions]]
+        pending: np.ndarray = entry_positions[~entry_resolved[entry_positions]]
+
+        self.results = None
+        if len(pending) == 0:
+            self.trades = kept
+            return kept
+
+        new_trades: pd.DataFrame = DataSetLabeler(self._shard_setup(pending)).compute(engine=engine, workers=workers)
+        self.trades = pd.concat([kept, new_trades]).sort_index(kind="stable")
+        return self.trades
+
+    def invalidate(
+        self,
+        trades: pd.DataFrame,
+        bar_range: tuple[datetime, datetime],
+        engine: str = const.ENGINE_APPLY,
+        workers: int | None = None,
+    ) -> pd.DataFrame:
+        """
+        Relabels the trades affected by a correction of some bars, patching them in place.
+
+        A trade only depends on the bars from its entry to its first hit (and the bar after it when
+        a dynamic exit closes on its open). The trades whose span intersects the corrected bars are
+        found with a SpanIndex and labeled again on the prices of this labeler, which must be the
+        corrected ones. The entries must not have changed.
+
+        :param trades: trades labeled before the correction, in entry order, by any engine
+        :param bar_range: first and last corrected bars (inclusive)
+        :param engine: labeling engine of the affected trades, see compute
+        :param workers: number of processes to label the affected trades, see compute
+        :return: the trades, with the affected ones relabeled
+        """
+
+        self._check_trade_sides(trades)
+        first: int = int(self._market_data.index.searchsorted(bar_range[0], side="left"))
+        last: int = int(self._market_data.index.searchsorted(bar_range[1], side="right")) - 1
+        self.results = None
+        self.trades = trades
+        if first > last:
+            return trades
+
+        trade_positions, in_dataset = self._trade_positions(trades)
+        span_end: np.ndarray = trade_positions.copy()
+        for suffix in self._trade_suffixes():
+            close_datetime: pd.Series = self._close_datetime(trades, suffix)
+            # trades without a close span to the last bar
+            close_positions: np.ndarray = np.where(
+                close_datetime.isna(),
+                len(self._ohlc.index) - 1,
+                self._market_data.index.searchsorted(close_datetime.fillna(self._market_data.index[0])),
+            )
+            dynamic_close: np.ndarray = (trades[f"{const.CLOSE_TYPE}{suffix}"] == OrderType.DYNAMIC.value).to_numpy()
+            span_end = np.maximum(span_end, close_positions + dynamic_close)
+        span_end[~in_dataset] = -1
+
+        affected: np.ndarray = SpanIndex(trade_positions, span_end).overlapping(first, last)
+
+        if len(affected) == 0:
+            return trades
+        if np.any(self._ohlc[self.ENTRY].to_numpy()[trade_positions[affected]] != 1):
+            raise ValueError("The entries of the trades are not the entries of the dataset")
+
+        relabeled: pd.DataFrame = DataSetLabeler(self._shard_setup(trade_positions[affected])).compute(
+            engine=engine, workers=workers
+        )
+        for column in relabeled.columns:
+            trades.iloc[affected, trades.columns.get_loc(column)] = relabeled[column].to_numpy()
+        return trades
+
+    def _trade_suffixes(self) -> list[str]:
+        """
+        Suffixes of the trade columns, one per trade side
+        """
+        if self._both_sides:
+            return [f"-{trade_side.name.lower()}" for trade_side in TradeSide]
+        return [""]
+
+    def _check_trade_sides(self, trades: pd.DataFrame) -> None:
+        """
+        Checks that previously labeled trades have the columns of the trade sides of this labeler
+        """
+        missing: list[str] = [
+            f"{column}{suffix}"
+            for suffix in self._trade_suffixes()
+            for column in (const.CLOSE_DATETIME, const.CLOSE_TYPE)
+            if f"{column}{suffix}" not in trades.columns
+        ]
+        if missing:
+            raise ValueError(f"The trades have no {', '.join(missing)} column, they were labeled on other trade sides")
+
+    @staticmethod
+    def _close_datetime(trades: pd.DataFrame, suffix: str) -> pd.Series:
+        """
+        Close datetimes of the trades, NaT for the trades not closed (constants.INFINITE_DATE does
+        not fit in datetime64)
+        """
+        return pd.to_datetime(trades[f"{const.CLOSE_DATETIME}{suffix}"], errors="coerce", cache=False)
+
+    def _trade_positions(self, trades: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Positions of the trade entries in the dataset, and whether the entry is in the dataset
+        """
+        # the index is sorted, a binary search avoids hashing the whole dataset index
+        trade_positions: np.ndarray = np.minimum(
+            self._market_data.index.searchsorted(trades.index), len(self._ohlc.index) - 1
+        )
+        return trade_positions, self._market_data.index[trade_positions] == trades.index
+
+    def labels(self, min_return: float | np.ndarray = 0.0, trade_side: TradeSide | None = None) -> TrainingLabels:
+        """
+        Labels of the computed trades as contiguous arrays for model training: bin, ret, t1,
+        holding bars and barrier that fired.
+
+        :param min_return: returns with an absolute value up to this one are labeled 0, a float
+            or one value per trade
+        :param trade_side: side of the labels when both trade sides are labeled
+        :return: TrainingLabels of the trades
+        """
+
+        if self.trades is None:
+            raise ValueError("The trades must be computed before getting their labels")
+
+        if self._both_sides:
+            if trade_side is None:
+                raise ValueError("The trade side of the labels is needed when both trade sides are labeled")
+            suffix: str = f"-{trade_side.name.lower()}"
+        else:
+            trade_side = self._trading_setup.trade_side
+            suffix = ""
+
+        results: TradeResults | dict | None = self.results
+        if isinstance(results, dict):
+            results = results[trade_side]
+        if results is not None:
+            return TrainingLabels.from_results(
+                results, self._entry_price(trade_side, results.entry_position), trade_side, min_return
+            )
+        return TrainingLabels.from_trades(self.trades, trade_side, min_return, suffix=suffix)
+
+    def sample_weights(self, trade_side: TradeSide | None = None) -> SampleWeights:
+        """
+        Concurrency, average uniqueness and return attribution weights of the computed trades,
+        every trade spanning the bars from its entry to its first barrier hit.
+
+        :param trade_side: side of the trades when both trade sides are labeled
+        :return: SampleWeights of the trades
+        """
+
+        start, end = self._trade_spans(trade_side)
+        return SampleWeights.from_spans(
+            start=start,
+            end=end,
+            close_price=self._market_data.close,
+            index=self._market_data.index,
+        )
+
+    def sequential_bootstrap(
+        self,
+        size: int | None = None,
+        random_state: int | np.random.Generator | None = None,
+        trade_side: TradeSide | None = None,
+    ) -> np.ndarray:
+        """
+        Draws a sequential bootstrap sample of the computed trades, favouring the trades that
+        overlap less with the ones already drawn.
+
+        :param size: number of trades to draw, the number of trades when None
+        :param random_state: seed or generator, for reproducible samples
+        :param trade_side: side of the trades when both trade sides are labeled
+        :return: positions of the drawn trades in the trades DataFrame, in draw order
+        """
+
+        return SequentialBootstrap(*self._trade_spans(trade_side)).sample(size, random_state)
+
+    def _trade_spans(self, trade_side: TradeSide | None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Positions of the entry and the first hit of the computed trades
+        """
+        labels: TrainingLabels = self.labels(trade_side=trade_side)
+        entry_positions: np.ndarray = np.flatnonzero(self._ohlc[self.ENTRY].to_numpy() == 1)
+        return entry_positions, entry_positions + labels.holding_bars
+
+    def sweep(self, stop_loss_widths, take_profit_widths, time_barrier_periods) -> SweepResults:
+        """
+        Labels the entries for every combination of stop loss width, take profit width and
+        time barrier periods, reusing the price path of every entry for the whole grid.
+        The widths and periods of the trading setup are replaced by the grid, so they must be
+        fixed values. Trading setups with options the sweep does not label (both trade sides,
+        trailing stop, lower timeframe, bid and ask prices) raise a ValueError.
+
+        :param stop_loss_widths: stop loss widths in pips
+        :param take_profit_widths: take profit widths in pips
+        :param time_barrier_periods: time barrier periods
+        :return: SweepResults with the results cube and its summary
+        """
+
+        if self._both_sides:
+            raise ValueError("The parameter sweep labels one trade side at a time")
+        if self._trailing_stop_width is not None:
+            raise ValueError("The parameter sweep does not support trailing stops")
+        if self._bid_ask:
+            raise ValueError("The parameter sweep does not support bid and ask prices")
+        if self._intrabar is not None:
+            raise ValueError("The parameter sweep does not support lower timeframe resolution")
+        if any(
+            np.ndim(value) != 0
+            for value in (self._stop_loss_width, self._take_profit_width, self._time_barrier_periods)
+        ):
+            raise ValueError("The parameter sweep does not support per bar or per entry widths and periods")
+
+        entry_positions: np.ndarray = np.flatnonzero(self._ohlc[self.ENTRY].to_numpy() == 1)
+        parameter_sweep = ParameterSweep(
+            market_data=self._market_data,
+            entry_positions=entry_positions,
+            trade_side=self._trading_setup.trade_side,
+            pip_decimal_position=self._trading_setup.pip_decimal_position,
+        )
+        return parameter_sweep.compute(stop_loss_widths, take_profit_widths, time_barrier_periods)
+
+    def _compute_apply(self) -> pd.DataFrame:
+        if self._both_sides:
+            return self._join_sides({side: self._compute_apply_side(side) for side in TradeSide})
+        return self._compute_apply_side(self._trading_setup.trade_side)
+
+    def _compute_apply_side(self, trade_side: TradeSide) -> pd.DataFrame:
         entry_only: pd.Series = self._ohlc[(self._ohlc.entry == 1)].copy(deep=True)
+        stop_loss_width, take_profit_width = self._side_widths(trade_side)
 
-        trades = entry_only.apply(
+        return entry_only.apply(
             self._calculate_exit,
             args=(
-                self._trading_setup.stop_loss_width,
-                self._trading_setup.take_profit_width,
-                self._trading_setup.trade_side,
+                stop_loss_width,
+                take_profit_width,
+                trade_side,
                 self._trading_setup.pip_decimal_position,
-                self._trading_setup.time_barrier_periods,
+                self._time_barrier_periods,
             ),
             axis=1,
         )
-        self.trades = trades
+
+    def _join_sides(self, side_trades: dict[TradeSide, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Joins the trades of both sides, with the trade columns suffixed with the side name
+        """
+        ohlc_columns: list[str] = list(self._ohlc.columns)
+        frames: list[pd.DataFrame] = [side_trades[TradeSide.BUY][ohlc_columns]] + [
+            trades.drop(columns=ohlc_columns).add_suffix(f"-{trade_side.name.lower()}")
+            for trade_side, trades in side_trades.items()
+        ]
+        return pd.concat(frames, axis=1)
+
+    def _compute_parallel(self, engine: str, workers: int) -> pd.DataFrame:
+        """
+        Splits the entries into time contiguous shards and labels every shard in its own process.
+
+        Each process only gets the bars of its shard plus the bars a trade opened in the shard
+        can reach (time_barrier_periods, and one more for the dynamic barrier close), so the
+        trades are the same as the serial ones. They are merged back in entry order.
+        """
+
+        entry_positions: np.ndarray = np.flatnonzero(self._ohlc[self.ENTRY].to_numpy() == 1)
+        shards: list[np.ndarray] = [
+            shard for shard in np.array_split(entry_positions, workers) if len(shard) != 0
+        ]
+        if len(shards) < 2:
+            return self._compute_vectorized() if engine == const.ENGINE_VECTORIZED else self._compute_apply()
+
+        with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            futures: list = [
+                executor.submit(_label_shard, self._shard_setup(shard), engine) for shard in shards
+            ]
+            parts: list[tuple] = [future.result() for future in futures]
+
+        offsets: list[int] = [int(shard[0]) for shard in shards]
+        if engine == const.ENGINE_VECTORIZED and self._both_sides:
+            self.results = {
+                trade_side: TradeResults.concat(
+                    [results[trade_side] for _, results in parts], offsets=offsets, index=self._market_data.index
+                )
+                for trade_side in TradeSide
+            }
+        elif engine == const.ENGINE_VECTORIZED:
+            self.results = TradeResults.concat(
+                [results for _, results in parts], offsets=offsets, index=self._market_data.index
+            )
+
+        return pd.concat([trades for trades, _ in parts])
+
+    def _shard_setup(self, shard: np.ndarray) -> TradingParameters:
+        """
+        Trading parameters restricted to a shard of entries and the bars they can reach
+        """
+
+        start: int = int(shard[0])
+        stop: int = min(
+            int(np.max(shard + self._periods_at(shard))) + 1, len(self._ohlc.index) - 1
+        ) + 1
+        ohlc: pd.DataFrame = self._ohlc.iloc[start:stop]
+
+        # only the entries of the shard are marked, the look-ahead bars are only used to close its trades
+        entry_mark: pd.Series = ohlc[self.ENTRY].copy()
+        entry_mark.iloc[:] = 0
+        entry_mark.iloc[shard - start] = 1
+
+        return replace(
+            self._trading_setup,
+            open_price=ohlc[self.OPEN],
+            high_price=ohlc[self.HIGH],
+            low_price=ohlc[self.LOW],
+            close_price=ohlc[self.CLOSE],
+            entry_mark=entry_mark,
+            dynamic_exit=ohlc[self.EXIT] if self._exit_specified else None,
+            stop_loss_width=self._slice(self._stop_loss_width, start, stop),
+            take_profit_width=self._slice(self._take_profit_width, start, stop),
+            time_barrier_periods=self._slice(self._time_barrier_periods, start, stop),
+            sell_stop_loss_width=self._slice(self._sell_stop_loss_width, start, stop) if self._both_sides else None,
+            sell_take_profit_width=self._slice(self._sell_take_profit_width, start, stop) if self._both_sides else None,
+            trailing_stop_width=self._slice(self._trailing_stop_width, start, stop),
+            lower_timeframe=(
+                None
+                if self._intrabar is None
+                else self._trading_setup.lower_timeframe.iloc[
+                    self._intrabar.fine_start[start]:self._intrabar.fine_start[stop]
+                ]
+            ),
+            bid_price=None if not self._bid_ask else self._trading_setup.bid_price.iloc[start:stop],
+            ask_price=None if not self._bid_ask else self._trading_setup.ask_price.iloc[start:stop],
+        )
+
+    @staticmethod
+    def _with_index(
+        results: TradeResults | dict | None, index: pd.DatetimeIndex | None
+    ) -> TradeResults | dict | None:
+        """
+        Results (of one side, or of both sides in a dict) with another index, the arrays are not copied
+        """
+        if results is None:
+            return None
+        if isinstance(results, dict):
+            return {trade_side: replace(side_results, index=index) for trade_side, side_results in results.items()}
+        return replace(results, index=index)
+
+    @staticmethod
+    def _slice(bar_values, start: int, stop: int):
+        if np.ndim(bar_values) == 0:
+            return bar_values
+        return bar_values[start:stop]
+
+    def _compute_vectorized(self) -> pd.DataFrame:
+        """
+        Labels all the entries at once working on the OHLC arrays, producing the same
+        columns as the apply engine.
+        """
+
+        entry_positions: np.ndarray = np.flatnonzero(self._ohlc[self.ENTRY].to_numpy() == 1)
+        trades: pd.DataFrame = self._ohlc.iloc[entry_positions].copy(deep=True)
+
+        time_limit_positions: np.ndarray = self._market_data.time_limit_position(
+            entry_positions, self._periods_at(entry_positions)
+        )
+
+        if self._both_sides:
+            buy_results, sell_results = self._batch_labeler(TradeSide.BUY).compute_both(
+                entry_positions,
+                *self._barrier_levels(TradeSide.BUY, entry_positions),
+                *self._barrier_levels(TradeSide.SELL, entry_positions),
+                time_limit_positions=time_limit_positions,
+                trailing_stop=self._trailing_stop(entry_positions),
+                sell_labeler=self._batch_labeler(TradeSide.SELL) if self._bid_ask else None,
+                buy_entry_price=self._entry_price(TradeSide.BUY, entry_positions),
+                sell_entry_price=self._entry_price(TradeSide.SELL, entry_positions),
+            )
+            self.results = {TradeSide.BUY: buy_results, TradeSide.SELL: sell_results}
+            return self._join_sides({
+                trade_side: self._add_trade_columns(trades.copy(), results, trade_side)
+                for trade_side, results in self.results.items()
+            })
+
+        trade_side: TradeSide = self._trading_setup.trade_side
+        take_profit, stop_loss = self._barrier_levels(trade_side, entry_positions)
+        self.results = self._batch_labeler(trade_side).compute(
+            entry_positions=entry_positions,
+            take_profit=take_profit,
+            stop_loss=stop_loss,
+            time_limit_positions=time_limit_positions,
+            trade_side=trade_side,
+            trailing_stop=self._trailing_stop(entry_positions),
+            entry_price=self._entry_price(trade_side, entry_positions),
+        )
+        return self._add_trade_columns(trades, self.results, trade_side)
+
+    def _batch_labeler(self, trade_side: TradeSide) -> BatchLabeler:
+        """
+        Batch labeler on the prices the trades of a side are closed at
+        """
+        market_data: MarketData = self._side_market_data(trade_side)
+        return BatchLabeler(
+            open_price=market_data.open,
+            high_price=market_data.high,
+            low_price=market_data.low,
+            close_price=market_data.close,
+            dynamic_exit=market_data.dynamic_exit,
+            # the range index is built on the reference prices
+            range_index=None if self._bid_ask else self._range_index,
+            intrabar=self._intrabar,
+        )
+
+    def _barrier_levels(self, trade_side: TradeSide, entry_positions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Take profit and stop loss levels of the trades opened on the entries
+        """
+        open_price: np.ndarray = self._entry_price(trade_side, entry_positions)
+        pip_factor: float = 10 ** -self._trading_setup.pip_decimal_position
+        stop_loss_width, take_profit_width = self._side_widths(trade_side)
+        take_profit: np.ndarray = (
+            open_price + trade_side.value * self._at(take_profit_width, entry_positions) * pip_factor
+        )
+        stop_loss: np.ndarray = (
+            open_price - trade_side.value * self._at(stop_loss_width, entry_positions) * pip_factor
+        )
+        return take_profit, stop_loss
+
+    def _trailing_stop(self, entry_positions: np.ndarray) -> np.ndarray | None:
+        """
+        Trailing stop distances of the trades opened on the entries, in price units
+        """
+        if self._trailing_stop_width is None:
+            return None
+        pip_factor: float = 10 ** -self._trading_setup.pip_decimal_position
+        return np.broadcast_to(self._at(self._trailing_stop_width, entry_positions), len(entry_positions)) * pip_factor
+
+    def _add_trade_columns(self, trades: pd.DataFrame, results: TradeResults, trade_side: TradeSide) -> pd.DataFrame:
+        """
+        Adds the trade columns of the apply engine to the entries
+        """
+        results.index = self._market_data.index
+
+        # positions are translated to datetimes only here, at the output
+        trades[const.CLOSE_PRICE] = results.exit_level
+        trades[const.CLOSE_DATETIME] = self._market_data.index[results.exit_position]
+        trades[const.CLOSE_TYPE] = results.exit_type_values()
+        entry_price: np.ndarray = self._entry_price(trade_side, results.entry_position)
+        if self._bid_ask:
+            trades[const.OPEN_PRICE] = entry_price
+        trades[const.PROFIT] = np.round(
+            trade_side.value
+            * (results.exit_level - entry_price)
+            * 10**self._trading_setup.pip_decimal_position,
+            self._profit_precision,
+        )
+        trades[const.BARS_HELD] = results.bars_held()
+
         return trades
 
     def _calculate_exit(
         self,
         row: any,
-        stop_loss_width: float,
-        take_profit_width: float,
+        stop_loss_width: float | np.ndarray,
+        take_profit_width: float | np.ndarray,
         trade_side: TradeSide,
         pip_decimal_position: int,
-        time_barrier_periods: int,
+        time_barrier_periods: int | np.ndarray,
     ):
-        try:
-            box_setup = Orders()
-
-            box_setup.open_time = str(row.name)
-            box_setup.open_price = self._ohlc.loc[box_setup.open_time].open
-            box_setup.take_profit_width = take_profit_width
-            box_setup.stop_loss_width = stop_loss_width
-
-            max_period_limit: int = min(
-                time_barrier_periods, len(self._ohlc[box_setup.open_time:].index) - 1
-            )
+        box_setup = Orders()
 
-            box_setup.time_limit = self._ohlc[box_setup.open_time:].index[
-                max_period_limit
-            ]
-            box_setup.trade_side = trade_side
-            box_setup.pip_decimal_position = pip_decimal_position
-
-            dynamic_exit: pd.DataFrame | None = None
-            if self._trading_setup.dynamic_exit is not None:
-                dynamic_exit = self._ohlc[const.EXIT]
-
-            barrier_builder = Labeler(
-                open_price=self._ohlc[const.OPEN],
-                high_price=self._ohlc[const.HIGH],
-                low_price=self._ohlc[const.LOW],
-                close_price=self._ohlc[const.CLOSE],
-                dynamic_exit=dynamic_exit,
-                box_setup=box_setup,
-            )
-            barrier_builder.compute()
+        open_position: int = self._market_data.position(row.name)
+        time_limit_position: int = self._market_data.time_limit_position(
+            open_position, int(self._at(time_barrier_periods, open_position))
+        )
 
-            row["close-price"] = barrier_builder.orders_hit.first_hit.level
-            row["close-datetime"] = barrier_builder.orders_hit.first_hit.hit_datetime
-            row["close-type"] = barrier_builder.orders_hit.first_hit.order_type.value
-            row["profit"] = (
-                trade_side.value
-                * (row["close-price"] - row["open"])
-                * 10**self._trading_setup.pip_decimal_position
-            ).__round__(self._profit_precision)
+        box_setup.open_time = row.name
+        box_setup.open_price = self._entry_price(trade_side, open_position)
+        box_setup.take_profit_width = self._at(take_profit_width, open_position)
+        box_setup.stop_loss_width = self._at(stop_loss_width, open_position)
+        if self._trailing_stop_width is not None:
+            box_setup.trailing_stop_width = self._at(self._trailing_stop_width, open_position)
+        box_setup.time_limit = self._market_data.datetime(time_limit_position)
+        box_setup.trade_side = trade_side
+        box_setup.pip_decimal_position = pip_decimal_position
+
+        dynamic_exit: pd.DataFrame | None = None
+        if self._trading_setup.dynamic_exit is not None:
+            dynamic_exit = self._ohlc[const.EXIT]
+
+        # the trade is closed on the bid (long) or ask (short) prices when they are given
+        prices: pd.DataFrame = self._exit_prices.get(trade_side, self._ohlc)
+        barrier_builder = Labeler(
+            open_price=prices[const.OPEN],
+            high_price=prices[const.HIGH],
+            low_price=prices[const.LOW],
+            close_price=prices[const.CLOSE],
+            dynamic_exit=dynamic_exit,
+            box_setup=box_setup,
+            range_index=None if self._bid_ask else self._range_index,
+            market_data=self._side_market_data(trade_side),
+            short_circuit=True,
+            intrabar=self._intrabar,
+        )
+        barrier_builder.compute()
 
-        except KeyError as e:
-            print("Key error:", e)
+        row[const.CLOSE_PRICE] = barrier_builder.orders_hit.first_hit.level
+        row[const.CLOSE_DATETIME] = barrier_builder.orders_hit.first_hit.hit_datetime
+        row[const.CLOSE_TYPE] = barrier_builder.orders_hit.first_hit.order_type.value
+        if self._bid_ask:
+            row[const.OPEN_PRICE] = box_setup.open_price
+        row[const.PROFIT] = (
+            trade_side.value
+            * (row[const.CLOSE_PRICE] - box_setup.open_price)
+            * 10**self._trading_setup.pip_decimal_position
+        ).__round__(self._profit_precision)
+        row[const.BARS_HELD] = (
+            self._market_data.time_position(barrier_builder.orders_hit.first_hit.hit_time)
+            - open_position
+        )
 
         return row
 
@@ -155,9 +900,11 @@ class DataSetLabeler:
         plot_folder: str = "./",
         periods_before: int = 5,
         periods_after: int = 5,
+        trade_side: TradeSide | None = None,
     ) -> None:
         """
-        Plot a trade for the specific date
+        Plot a trade for the specific date. Trailing stops and bid and ask prices are not drawn,
+        setups with them raise a ValueError.
 
         :param trade_date: datetime of the trade to plot
         :param plot_periods: number of periods to plot
@@ -165,19 +912,32 @@ class DataSetLabeler:
         :param oscilators: list of oscilators to plot in the second panel
         :param save_plot: boolean to save the plot (or plot it to the output if false)
         :param plot_folder: folder to save the plot if save_plot is True, default is "./"
+        :param trade_side: side of the trade to plot when both trade sides are labeled
 
         :return: None
         """
+        if self._trailing_stop_width is not None:
+            raise ValueError("Trades with a trailing stop can not be plotted")
+        if self._bid_ask:
+            raise ValueError("Trades labeled on bid and ask prices can not be plotted")
+        if self._both_sides:
+            if trade_side is None:
+                raise ValueError("The trade side to plot is needed when both trade sides are labeled")
+        else:
+            trade_side = self._trading_setup.trade_side
+
         # setup barrier builder
         box_setup = Orders()
         box_setup.open_time = trade_date
         box_setup.open_price = self._ohlc.loc[box_setup.open_time].open
-        box_setup.take_profit_width = self._trading_setup.take_profit_width
-        box_setup.stop_loss_width = self._trading_setup.stop_loss_width
-        box_setup.time_limit = self._ohlc[box_setup.open_time:].index[
-            self._trading_setup.time_barrier_periods
-        ]
-        box_setup.trade_side = self._trading_setup.trade_side
+        trade_position: int = self._market_data.position(trade_date)
+        stop_loss_width, take_profit_width = self._side_widths(trade_side)
+        box_setup.take_profit_width = self._at(take_profit_width, trade_position)
+        box_setup.stop_loss_width = self._at(stop_loss_width, trade_position)
+        box_setup.time_limit = self._market_data.datetime(
+            self._market_data.time_limit_position(trade_position, self._periods_at(trade_position))
+        )
+        box_setup.trade_side = trade_side
         box_setup.pip_decimal_position = self._trading_setup.pip_decimal_position
 
         # compute barrier builder
@@ -187,12 +947,9 @@ class DataSetLabeler:
             high_price=self._ohlc.high,
             low_price=self._ohlc.low,
             close_price=self._ohlc.close,
-            dynamic_exit=(
-                self._ohlc[self.EXIT]
-                if self._exit_specified in self._ohlc.columns
-                else None
-            ),
+            dynamic_exit=self._ohlc[self.EXIT] if self._exit_specified else None,
             box_setup=box_setup,
+            intrabar=self._intrabar,
         )
 
         barrier_builder.compute()
@@ -214,3 +971,12 @@ class DataSetLabeler:
         )
 
         plot_tb.plot_multi_barrier(barrier_builder)
+
+
+def _label_shard(trading_setup: TradingParameters, engine: str) -> tuple[pd.DataFrame, TradeResults | None]:
+    """
+    Labels one shard of entries, runs in a worker process
+    """
+    dataset_labeler = DataSetLabeler(trading_setup)
+    trades: pd.DataFrame = dataset_labeler.compute(engine=engine)
+    return trades, dataset_labeler.results
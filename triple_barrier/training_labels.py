@@ -0,0 +1,167 @@
+"""
+Labels of the trades in the layout model training pipelines consume: one contiguous NumPy
+array per field, built in bulk from the labeled trades without a pass per row.
+
+- t0: entry time
+- t1: time of the first barrier hit, the end of the label
+- ret: return of the trade on the trade side, (close price / open price - 1) * side
+- bin: sign of the return, 0 when its absolute value is not above the minimum return
+- holding_bars: bars between the entry and the first hit
+- barrier: barrier that fired, as its position in ORDER_TYPE_PRIORITY
+
+Trades without a close price (a dynamic exit on the last bar) have a NaN return and bin 0.
+
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from triple_barrier import constants
+from triple_barrier.types import ORDER_TYPE_PRIORITY
+from triple_barrier.types import TradeResults
+from triple_barrier.types import TradeSide
+
+BARRIER_CATEGORIES: list[str] = [order_type.value for order_type in ORDER_TYPE_PRIORITY]
+
+
+@dataclass
+class TrainingLabels:
+    """
+    Labels of the trades, one element per trade in entry order
+    """
+
+    t0: np.ndarray
+    t1: np.ndarray
+    ret: np.ndarray
+    bin: np.ndarray
+    holding_bars: np.ndarray
+    barrier: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.t0)
+
+    @classmethod
+    def from_results(
+        cls,
+        results: TradeResults,
+        open_price: np.ndarray,
+        trade_side: TradeSide,
+        min_return: float | np.ndarray = 0.0,
+    ) -> "TrainingLabels":
+        """
+        Labels of the vectorized engine results
+
+        :param results: TradeResults with its index
+        :param open_price: open price of every trade
+        :param trade_side: side of the trades
+        :param min_return: returns with an absolute value up to this one are labeled 0, a float
+            or one value per trade
+        """
+        if results.index is None:
+            raise ValueError("An index is needed to translate the hit positions into datetimes")
+
+        times: np.ndarray = results.index.to_numpy(dtype="datetime64[ns]")
+        return cls._build(
+            t0=times[results.entry_position],
+            t1=times[results.exit_position],
+            open_price=np.asarray(open_price, dtype=np.float64),
+            close_price=results.exit_level,
+            holding_bars=results.bars_held(),
+            barrier=results.exit_type.astype(np.int8),
+            trade_side=trade_side,
+            min_return=min_return,
+        )
+
+    @classmethod
+    def from_trades(
+        cls,
+        trades: pd.DataFrame,
+        trade_side: TradeSide,
+        min_return: float | np.ndarray = 0.0,
+        suffix: str = "",
+    ) -> "TrainingLabels":
+        """
+        Labels of the trades DataFrame of DataSetLabeler (any engine)
+
+        :param trades: trades, indexed by entry time
+        :param trade_side: side of the trades
+        :param min_return: returns with an absolute value up to this one are labeled 0, a float
+            or one value per trade
+        :param suffix: suffix of the trade columns ("-buy" or "-sell" when both sides are labeled)
+        """
+        close_type: pd.Categorical = pd.Categorical(
+            trades[f"{constants.CLOSE_TYPE}{suffix}"], categories=BARRIER_CATEGORIES
+        )
+        # trades labeled on bid and ask prices have their own entry price
+        open_price_column: str = f"{constants.OPEN_PRICE}{suffix}"
+        if open_price_column not in trades.columns:
+            open_price_column = constants.OPEN
+        return cls._build(
+            t0=trades.index.to_numpy(dtype="datetime64[ns]"),
+            t1=pd.DatetimeIndex(trades[f"{constants.CLOSE_DATETIME}{suffix}"]).to_numpy(dtype="datetime64[ns]"),
+            open_price=trades[open_price_column].to_numpy(dtype=np.float64),
+            close_price=trades[f"{constants.CLOSE_PRICE}{suffix}"].to_numpy(dtype=np.float64),
+            holding_bars=trades[f"{constants.BARS_HELD}{suffix}"].to_numpy(dtype=np.int64),
+            barrier=close_type.codes.astype(np.int8),
+            trade_side=trade_side,
+            min_return=min_return,
+        )
+
+    @classmethod
+    def _build(
+        cls,
+        t0: np.ndarray,
+        t1: np.ndarray,
+        open_price: np.ndarray,
+        close_price: np.ndarray,
+        holding_bars: np.ndarray,
+        barrier: np.ndarray,
+        trade_side: TradeSide,
+        min_return: float | np.ndarray,
+    ) -> "TrainingLabels":
+        min_return = np.asarray(min_return, dtype=np.float64)
+        if min_return.ndim != 0 and min_return.shape != close_price.shape:
+            raise ValueError(f"Expected one minimum return per trade ({len(close_price)}), got {len(min_return)}")
+        if (min_return < 0).any():
+            raise ValueError("The minimum return can not be negative")
+
+        ret: np.ndarray = trade_side.value * (close_price / open_price - 1)
+        ret[~np.isfinite(ret)] = np.nan
+
+        # NaN returns are not above any minimum return, so they are labeled 0
+        label: np.ndarray = np.sign(np.nan_to_num(ret)).astype(np.int8)
+        label[~(np.abs(ret) > min_return)] = 0
+
+        return cls(
+            t0=t0,
+            t1=t1,
+            ret=ret,
+            bin=label,
+            holding_bars=holding_bars,
+            barrier=barrier,
+        )
+
+    def barrier_values(self) -> np.ndarray:
+        """
+        Translates the barrier codes into OrderType values
+        """
+        return np.array(BARRIER_CATEGORIES, dtype=object)[self.barrier]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        DataFrame indexed by entry time, with the barrier as a categorical close-type column
+        (the arrays are not copied)
+        """
+        return pd.DataFrame(
+            {
+                "t1": self.t1,
+                "ret": self.ret,
+                "bin": self.bin,
+                "holding-bars": self.holding_bars,
+                constants.CLOSE_TYPE: pd.Categorical.from_codes(self.barrier, categories=BARRIER_CATEGORIES),
+            },
+            index=pd.DatetimeIndex(self.t0, name="t0"),
+            copy=False,
+        )
@@ -1,10 +1,18 @@
+from dataclasses import dataclass
+from dataclasses import fields
 from enum import Enum
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+
+from triple_barrier import constants
+
 
 class OrderType(Enum):
     TAKE_PROFIT = "take-profit"
     STOP_LOSS = "stop-loss"
+    TRAILING_STOP = "trailing-stop"
     TIME_EXPIRATION = "time-expiration"
     DYNAMIC = "dynamic"
 
@@ -21,17 +29,60 @@ class TradeSide(Enum):
     SELL = -1
 
 
+# barriers in first hit priority order, the position in this tuple is the exit type code
+ORDER_TYPE_PRIORITY: tuple = (
+    OrderType.TAKE_PROFIT,
+    OrderType.STOP_LOSS,
+    OrderType.TRAILING_STOP,
+    OrderType.TIME_EXPIRATION,
+    OrderType.DYNAMIC,
+)
+
+
+def to_nanoseconds(date_time: datetime | str | None) -> int | None:
+    """
+    Converts a datetime into int64 nanoseconds since epoch.
+
+    :return: nanoseconds, constants.NO_HIT for datetimes out of the nanoseconds range
+        (like constants.INFINITE_DATE), None for None
+    """
+    if date_time is None:
+        return None
+    try:
+        return pd.Timestamp(date_time).value
+    except (pd.errors.OutOfBoundsDatetime, OverflowError):
+        return constants.NO_HIT
+
+
 class OrderHit:
+    __slots__ = ("level", "hit_time", "order_type")
 
     def __init__(self,
                  level: float | None = None,
                  hit_datetime: datetime | None = None,
-                 order_type: OrderType | None = None
+                 order_type: OrderType | None = None,
+                 hit_time: int | None = None,
                  ):
         self.level: float = level
-        self.hit_datetime: datetime = hit_datetime
+        # hit time in int64 nanoseconds, constants.NO_HIT when the barrier is not hit
+        self.hit_time: int | None = hit_time if hit_datetime is None else to_nanoseconds(hit_datetime)
         self.order_type: OrderType = order_type
 
+    @property
+    def hit_datetime(self) -> datetime | None:
+        """
+        Hit time as a Timestamp, constants.INFINITE_DATE when the barrier is not hit
+        """
+        if self.hit_time is None:
+            return None
+        if self.hit_time == constants.NO_HIT:
+            return constants.INFINITE_DATE
+        return pd.Timestamp(self.hit_time)
+
+    @hit_datetime.setter
+    def hit_datetime(self, hit_datetime: datetime | None):
+        self.hit_time = to_nanoseconds(hit_datetime)
+
     def __str__(self):
         output: str = f"""
         Datetime: {self.hit_datetime}
@@ -42,6 +93,8 @@ class OrderHit:
 
 
 class OrderBoxHits:
+    __slots__ = ("barriers", "first_hit")
+
     def __init__(self) -> None:
         self.barriers: list[OrderHit] = []
         self.first_hit: OrderHit = OrderHit()
@@ -57,3 +110,123 @@ class OrderBoxHits:
         barrier_hits: list = [str(hit) for hit in self.barriers]
 
         return output_str + "\nOther hits \n" + "\n".join(barrier_hits)
+
+
+@dataclass
+class TradeResults:
+    """
+    Columnar store of labeled trades: one NumPy array per field and one element per trade.
+
+    Positions are offsets in the market data arrays, constants.NO_HIT when the barrier
+    is not hit. exit_type is the position of the first hit barrier in ORDER_TYPE_PRIORITY.
+    dynamic_position and dynamic_level are None when there is no dynamic exit, and
+    trailing_stop_position and trailing_stop_level when there is no trailing stop.
+    index, when given, translates positions into datetimes.
+    """
+
+    entry_position: np.ndarray
+    exit_position: np.ndarray
+    exit_level: np.ndarray
+    exit_type: np.ndarray
+    take_profit_position: np.ndarray
+    stop_loss_position: np.ndarray
+    time_limit_position: np.ndarray
+    take_profit_level: np.ndarray
+    stop_loss_level: np.ndarray
+    time_limit_level: np.ndarray
+    dynamic_position: np.ndarray | None = None
+    dynamic_level: np.ndarray | None = None
+    trailing_stop_position: np.ndarray | None = None
+    trailing_stop_level: np.ndarray | None = None
+    index: pd.DatetimeIndex | None = None
+
+    def __len__(self) -> int:
+        return len(self.entry_position)
+
+    @classmethod
+    def concat(
+        cls,
+        parts: list["TradeResults"],
+        offsets: list[int],
+        index: pd.DatetimeIndex | None = None,
+    ) -> "TradeResults":
+        """
+        Joins the results of consecutive shards, each one labeled on a slice of the same dataset
+
+        :param parts: results of every shard, in entry order
+        :param offsets: position, in the dataset, of the first bar of each shard slice
+        :param index: index of the whole dataset
+        :return: TradeResults with the positions referred to the whole dataset
+        """
+        columns: dict = {}
+        for field in fields(cls):
+            if field.name == "index":
+                continue
+            values: list = [getattr(part, field.name) for part in parts]
+            if values[0] is None:
+                columns[field.name] = None
+                continue
+            if field.name.endswith("_position"):
+                values = [
+                    np.where(value == constants.NO_HIT, constants.NO_HIT, value + offset)
+                    for value, offset in zip(values, offsets)
+                ]
+            columns[field.name] = np.concatenate(values)
+        return cls(index=index, **columns)
+
+    def bars_held(self) -> np.ndarray:
+        """
+        Number of bars between the entry and the first hit
+        """
+        return self.exit_position - self.entry_position
+
+    def exit_type_values(self) -> np.ndarray:
+        """
+        Translates the exit type codes into OrderType values
+        """
+        values: np.ndarray = np.array([order_type.value for order_type in ORDER_TYPE_PRIORITY], dtype=object)
+        return values[self.exit_type]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        DataFrame with one column per array (the arrays are not copied)
+        """
+        columns: dict = {
+            field.name.replace("_", "-"): getattr(self, field.name)
+            for field in fields(self)
+            if field.name != "index" and getattr(self, field.name) is not None
+        }
+        return pd.DataFrame(columns, copy=False)
+
+    def order_box_hits(self, row: int) -> OrderBoxHits:
+        """
+        Barrier hits of one trade, as Labeler reports them
+
+        :param row: trade number in the results
+        :return: OrderBoxHits built from the row
+        """
+        barriers: list[tuple] = [
+            (OrderType.TAKE_PROFIT, self.take_profit_position, self.take_profit_level),
+            (OrderType.STOP_LOSS, self.stop_loss_position, self.stop_loss_level),
+        ]
+        if self.trailing_stop_position is not None:
+            barriers.append((OrderType.TRAILING_STOP, self.trailing_stop_position, self.trailing_stop_level))
+        barriers.append((OrderType.TIME_EXPIRATION, self.time_limit_position, self.time_limit_level))
+        if self.dynamic_position is not None:
+            barriers.append((OrderType.DYNAMIC, self.dynamic_position, self.dynamic_level))
+
+        orders_hit: OrderBoxHits = OrderBoxHits()
+        orders_hit.barriers = [
+            OrderHit(level=level[row], hit_time=self._hit_time(position[row]), order_type=order_type)
+            for order_type, position, level in barriers
+        ]
+        first_hit_type: OrderType = ORDER_TYPE_PRIORITY[self.exit_type[row]]
+        orders_hit.first_hit = next(hit for hit in orders_hit.barriers if hit.order_type == first_hit_type)
+        return orders_hit
+
+    def _hit_time(self, position: int) -> int:
+        if self.index is None:
+            raise ValueError("An index is needed to translate the hit positions into datetimes")
+        if position == constants.NO_HIT:
+            return constants.NO_HIT
+        return int(self.index.asi8[position])